@@ -211,11 +211,22 @@ export const chatSendMessage = (body: ChatSendMessageBody) =>
         body: JSON.stringify(body),
     });
 
-/** Get chat history for a session */
-export const chatGetHistory = (sessionId: string) =>
-    apiFetch<{ session_id: string; messages: Record<string, unknown>[]; total: number }>(
-        `/chat/history/${sessionId}`,
-    );
+export interface ChatHistoryPage {
+    session_id: string;
+    messages: Record<string, unknown>[];
+    total: number;
+    has_more: boolean;
+    before_cursor: string | null;
+    after_cursor: string | null;
+}
+
+/** Get one page of chat history (newest page by default; page back with `before`, forward with `after`) */
+export const chatGetHistory = (sessionId: string, cursor: { before?: string; after?: string } = {}, limit = 50) => {
+    const params = new URLSearchParams({ limit: String(limit) });
+    if (cursor.before) params.set("before", cursor.before);
+    if (cursor.after) params.set("after", cursor.after);
+    return apiFetch<ChatHistoryPage>(`/chat/history/${sessionId}?${params}`);
+};
 
 // ──────────────────────────────────────────────────
 // Blog
@@ -0,0 +1,28 @@
+"""Add rolling summary columns to chat_sessions
+
+Revision ID: 003_chat_summary
+Revises: 002_chat_sessions
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "003_chat_summary"
+down_revision = "002_chat_sessions"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("chat_sessions", sa.Column("summary", sa.Text, nullable=True))
+    op.add_column(
+        "chat_sessions",
+        sa.Column("summary_message_count", sa.Integer, nullable=False, server_default="0"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("chat_sessions", "summary_message_count")
+    op.drop_column("chat_sessions", "summary")
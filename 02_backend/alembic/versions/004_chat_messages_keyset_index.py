@@ -0,0 +1,51 @@
+"""Composite (session_id, created_at, message_id) index on chat_messages
+
+Keyset-paginated history reads a session's messages in (created_at, message_id)
+order; this index serves both directions with no Sort and no OFFSET scan. It
+also covers every lookup the single-column ix_chat_messages_session_id served,
+so that index is dropped.
+
+Built CONCURRENTLY so long chat tables are not write-locked during deploy.
+
+Revision ID: 004_chat_messages_keyset_index
+Revises: 003_chat_summary
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "004_chat_messages_keyset_index"
+down_revision = "003_chat_summary"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_chat_messages_session_created",
+            "chat_messages",
+            ["session_id", "created_at", "message_id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_chat_messages_session_id",
+            table_name="chat_messages",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_chat_messages_session_id",
+            "chat_messages",
+            ["session_id"],
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_chat_messages_session_created",
+            table_name="chat_messages",
+            postgresql_concurrently=True,
+        )
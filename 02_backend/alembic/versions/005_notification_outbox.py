@@ -0,0 +1,51 @@
+"""Add notification_outbox for transactional WhatsApp / Telegram / LINE delivery
+
+Intake writes its notifications into this table in the same transaction as the
+patients row; services/notification_outbox.py drains it in the background.
+dedupe_key is unique so the same notification is never queued twice. The due
+index is partial (pending / sending only), so delivered rows do not grow it.
+
+Revision ID: 005_notification_outbox
+Revises: 004_chat_messages_keyset_index
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "005_notification_outbox"
+down_revision = "004_chat_messages_keyset_index"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "notification_outbox",
+        sa.Column("id", sa.Integer, primary_key=True, autoincrement=True),
+        sa.Column("dedupe_key", sa.String(150), nullable=False, unique=True),
+        sa.Column("kind", sa.String(20), nullable=False),
+        sa.Column("channel", sa.String(10), nullable=False),
+        sa.Column("recipient", sa.String(100), nullable=False),
+        sa.Column("message", sa.Text, nullable=False),
+        sa.Column("language", sa.String(5), nullable=False, server_default="en"),
+        sa.Column("patient_id", sa.String(25), sa.ForeignKey("patients.patient_id"), nullable=True),
+        sa.Column("status", sa.String(10), nullable=False, server_default="pending"),
+        sa.Column("attempts", sa.Integer, nullable=False, server_default="0"),
+        sa.Column("next_attempt_at", sa.DateTime(timezone=True), nullable=False, server_default=sa.func.now()),
+        sa.Column("last_error", sa.Text, nullable=True),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("sent_at", sa.DateTime(timezone=True), nullable=True),
+    )
+    op.create_index(
+        "ix_notification_outbox_due",
+        "notification_outbox",
+        ["next_attempt_at"],
+        postgresql_where=sa.text("status IN ('pending', 'sending')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_notification_outbox_due", table_name="notification_outbox")
+    op.drop_table("notification_outbox")
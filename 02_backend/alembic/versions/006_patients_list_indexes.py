@@ -0,0 +1,41 @@
+"""Keyset indexes for the patients list
+
+GET /api/medical/patients pages newest-first on (created_at, patient_id), with
+optional equality filters on status, procedure_category and matched_hospital_id.
+Each filter gets a composite (filter, created_at, patient_id) index, so a
+filtered page is one index range scan with no Sort. The unfiltered list and
+date-range queries use (created_at, patient_id).
+
+Built CONCURRENTLY so the patients table is not write-locked during deploy.
+
+Revision ID: 006_patients_list_indexes
+Revises: 005_notification_outbox
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+from alembic import op
+
+revision = "006_patients_list_indexes"
+down_revision = "005_notification_outbox"
+branch_labels = None
+depends_on = None
+
+INDEXES = {
+    "ix_patients_created": ["created_at", "patient_id"],
+    "ix_patients_status_created": ["status", "created_at", "patient_id"],
+    "ix_patients_category_created": ["procedure_category", "created_at", "patient_id"],
+    "ix_patients_hospital_created": ["matched_hospital_id", "created_at", "patient_id"],
+}
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name, columns in INDEXES.items():
+            op.create_index(name, "patients", columns, postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for name in INDEXES:
+            op.drop_index(name, table_name="patients", postgresql_concurrently=True)
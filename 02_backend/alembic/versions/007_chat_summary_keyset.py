@@ -0,0 +1,42 @@
+"""Keyset boundary for the chat rolling summary
+
+Unfolded history used to be loaded with OFFSET summary_message_count over
+(created_at, message_id). Legacy rows sharing a created_at could move across
+that boundary. The last folded message_id is now stored instead, and history
+loads with (created_at, message_id) > that message. Existing sessions are
+backfilled from their count; summary_message_count stays as an informational total.
+
+Revision ID: 007_chat_summary_keyset
+Revises: 006_patients_list_indexes
+Create Date: 2026-10-18
+"""
+from __future__ import annotations
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = "007_chat_summary_keyset"
+down_revision = "006_patients_list_indexes"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column("chat_sessions", sa.Column("summary_through_message_id", sa.String(30), nullable=True))
+    op.execute(
+        """
+        UPDATE chat_sessions AS s
+        SET summary_through_message_id = (
+            SELECT m.message_id FROM chat_messages AS m
+            WHERE m.session_id = s.session_id
+            ORDER BY m.created_at, m.message_id
+            OFFSET s.summary_message_count - 1
+            LIMIT 1
+        )
+        WHERE s.summary_message_count > 0
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("chat_sessions", "summary_through_message_id")
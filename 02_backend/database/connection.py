@@ -7,10 +7,11 @@ from __future__ import annotations
 
 import os
 from pathlib import Path
-from typing import Generator
+from typing import AsyncGenerator, Generator
 
 from dotenv import load_dotenv
 from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.orm import DeclarativeBase, Session, sessionmaker
 
 # Load .env from backend dir (first call wins — safe to call multiple times)
@@ -63,3 +64,36 @@ def get_db() -> Generator[Session, None, None]:
         yield db
     finally:
         db.close()
+
+
+# ---------------------------------------------------------------------------
+# Async engine (asyncpg) — chat pipeline; optional, graceful when not installed
+# ---------------------------------------------------------------------------
+try:
+    import asyncpg  # noqa: F401
+    ASYNC_DB_AVAILABLE = True
+except ImportError:
+    ASYNC_DB_AVAILABLE = False
+
+AsyncSessionLocal: async_sessionmaker[AsyncSession] | None = None
+
+if ASYNC_DB_AVAILABLE:
+    async_engine = create_async_engine(
+        DATABASE_URL.replace("postgresql+psycopg2://", "postgresql+asyncpg://", 1),
+        pool_size=5,
+        max_overflow=10,
+        pool_pre_ping=True,
+        pool_recycle=300,
+        connect_args={"ssl": "require"} if _is_production else {},
+        echo=not _is_production,
+    )
+    # expire_on_commit=False — async sessions cannot lazy-load attributes after commit
+    AsyncSessionLocal = async_sessionmaker(bind=async_engine, expire_on_commit=False, autoflush=False)
+
+
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """FastAPI dependency — yields an async DB session, auto-closes on exit."""
+    if AsyncSessionLocal is None:
+        raise RuntimeError("asyncpg not installed. Run: pip install asyncpg")
+    async with AsyncSessionLocal() as db:
+        yield db
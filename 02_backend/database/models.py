@@ -1,6 +1,6 @@
 """
 AntiGravity Ventures — SQLAlchemy ORM Models
-11 tables: hospitals, patients, travel_requests, campaigns, leads, publish_queue, conversions, chat_sessions, chat_messages, visualizations, users.
+12 tables: hospitals, patients, travel_requests, campaigns, leads, publish_queue, conversions, chat_sessions, chat_messages, visualizations, users, notification_outbox.
 """
 from __future__ import annotations
 
@@ -12,11 +12,13 @@ from sqlalchemy import (
     Date,
     DateTime,
     ForeignKey,
+    Index,
     Integer,
     Numeric,
     String,
     Text,
     func,
+    text,
 )
 from sqlalchemy.dialects.postgresql import ARRAY, JSONB
 from sqlalchemy.orm import relationship
@@ -70,8 +72,73 @@ class Hospital(Base):
 # 2. patients
 # ---------------------------------------------------------------------------
 
+# Sparse alanlar (GET /api/medical/patients?fields=...): to_dict() anahtarı → gereken kolonlar.
+# Liste sorgusu yalnızca istenen alanların kolonlarını SELECT eder; "intake" sözlüğü istenmedikçe kurulmaz.
+PATIENT_FIELD_COLUMNS: dict[str, tuple[str, ...]] = {
+    "patient_id": ("patient_id",),
+    "intake": (
+        "full_name", "phone", "language", "procedure_interest", "urgency",
+        "budget_usd", "notes", "referral_source", "phuket_arrival_date",
+    ),
+    "procedure_category": ("procedure_category",),
+    "status": ("status",),
+    "matched_hospital": ("matched_hospital_id",),
+    "estimated_procedure_cost_usd": ("estimated_procedure_cost_usd",),
+    "commission_rate": ("commission_rate",),
+    "commission_usd": ("commission_usd",),
+    "tags": ("tags",),
+    "created_at": ("created_at",),
+    "updated_at": ("updated_at",),
+}
+
+
+def _float_or_none(value) -> float | None:
+    return float(value) if value else None
+
+
+def _iso_or_none(value) -> str | None:
+    return value.isoformat() if value else None
+
+
+_PATIENT_FIELD_BUILDERS = {
+    "patient_id": lambda p: p.patient_id,
+    "intake": lambda p: {
+        "full_name": p.full_name,
+        "phone": p.phone,
+        "language": p.language,
+        "procedure_interest": p.procedure_interest,
+        "urgency": p.urgency,
+        "budget_usd": _float_or_none(p.budget_usd),
+        "notes": p.notes,
+        "referral_source": p.referral_source,
+        "phuket_arrival_date": _iso_or_none(p.phuket_arrival_date),
+    },
+    "procedure_category": lambda p: p.procedure_category,
+    "status": lambda p: p.status,
+    "matched_hospital": lambda p: p.matched_hospital_id,
+    "estimated_procedure_cost_usd": lambda p: _float_or_none(p.estimated_procedure_cost_usd),
+    "commission_rate": lambda p: _float_or_none(p.commission_rate),
+    "commission_usd": lambda p: _float_or_none(p.commission_usd),
+    "tags": lambda p: p.tags or [],
+    "created_at": lambda p: _iso_or_none(p.created_at),
+    "updated_at": lambda p: _iso_or_none(p.updated_at),
+}
+
+
+def patient_fields_dict(row, fields) -> dict:
+    """Patient nesnesi veya kolon projeksiyonu satırı → to_dict() biçiminde, yalnızca `fields` anahtarları."""
+    return {field: _PATIENT_FIELD_BUILDERS[field](row) for field in fields}
+
+
 class Patient(Base):
     __tablename__ = "patients"
+    # Liste: (created_at, patient_id) keyset sırası; filtreli varyantlar eşitlik kolonu önde — migration 006
+    __table_args__ = (
+        Index("ix_patients_created", "created_at", "patient_id"),
+        Index("ix_patients_status_created", "status", "created_at", "patient_id"),
+        Index("ix_patients_category_created", "procedure_category", "created_at", "patient_id"),
+        Index("ix_patients_hospital_created", "matched_hospital_id", "created_at", "patient_id"),
+    )
 
     patient_id = Column(String(25), primary_key=True)
     full_name = Column(String(100), nullable=False)
@@ -99,29 +166,7 @@ class Patient(Base):
     conversions = relationship("Conversion", back_populates="patient")
 
     def to_dict(self) -> dict:
-        return {
-            "patient_id": self.patient_id,
-            "intake": {
-                "full_name": self.full_name,
-                "phone": self.phone,
-                "language": self.language,
-                "procedure_interest": self.procedure_interest,
-                "urgency": self.urgency,
-                "budget_usd": float(self.budget_usd) if self.budget_usd else None,
-                "notes": self.notes,
-                "referral_source": self.referral_source,
-                "phuket_arrival_date": self.phuket_arrival_date.isoformat() if self.phuket_arrival_date else None,
-            },
-            "procedure_category": self.procedure_category,
-            "status": self.status,
-            "matched_hospital": self.matched_hospital_id,
-            "estimated_procedure_cost_usd": float(self.estimated_procedure_cost_usd) if self.estimated_procedure_cost_usd else None,
-            "commission_rate": float(self.commission_rate) if self.commission_rate else None,
-            "commission_usd": float(self.commission_usd) if self.commission_usd else None,
-            "tags": self.tags or [],
-            "created_at": self.created_at.isoformat() if self.created_at else None,
-            "updated_at": self.updated_at.isoformat() if self.updated_at else None,
-        }
+        return patient_fields_dict(self, PATIENT_FIELD_COLUMNS)
 
 
 # ---------------------------------------------------------------------------
@@ -277,6 +322,12 @@ class ChatSession(Base):
     session_id = Column(String(30), primary_key=True)
     language = Column(String(5), nullable=False, server_default="en")
     user_name = Column(String(100), nullable=True)
+    # Rolling summary (chat_context): (created_at, message_id) sırasında
+    # summary_through_message_id dahil ona kadarki mesajlar özete katlandı — migration 007.
+    # summary_message_count yalnızca bilgi amaçlı toplamdır; yükleme sınırı değildir.
+    summary = Column(Text, nullable=True)
+    summary_message_count = Column(Integer, nullable=False, server_default="0")
+    summary_through_message_id = Column(String(30), nullable=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -297,6 +348,10 @@ class ChatSession(Base):
 
 class ChatMessage(Base):
     __tablename__ = "chat_messages"
+    # Keyset geçmiş sayfalama: (created_at, message_id) sırası — migration 004
+    __table_args__ = (
+        Index("ix_chat_messages_session_created", "session_id", "created_at", "message_id"),
+    )
 
     message_id = Column(String(30), primary_key=True)
     session_id = Column(String(30), ForeignKey("chat_sessions.session_id"), nullable=False)
@@ -373,3 +428,52 @@ class User(Base):
             "created_at": self.created_at.isoformat() if self.created_at else None,
             "updated_at": self.updated_at.isoformat() if self.updated_at else None,
         }
+
+
+# ---------------------------------------------------------------------------
+# 12. notification_outbox (WhatsApp / Telegram / LINE delivery queue)
+# ---------------------------------------------------------------------------
+
+class NotificationOutbox(Base):
+    __tablename__ = "notification_outbox"
+    # Worker'ın "teslim zamanı gelmiş" taraması — kısmi indeks, gönderilmiş satırlar büyütmez (migration 005)
+    __table_args__ = (
+        Index(
+            "ix_notification_outbox_due",
+            "next_attempt_at",
+            postgresql_where=text("status IN ('pending', 'sending')"),
+        ),
+    )
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    dedupe_key = Column(String(150), unique=True, nullable=False)  # patient_id:kind:channel:recipient
+    kind = Column(String(20), nullable=False)  # coordinator | patient
+    channel = Column(String(10), nullable=False)  # whatsapp | telegram | line
+    recipient = Column(String(100), nullable=False)
+    message = Column(Text, nullable=False)
+    language = Column(String(5), nullable=False, server_default="en")
+    patient_id = Column(String(25), ForeignKey("patients.patient_id"), nullable=True)
+    status = Column(String(10), nullable=False, server_default="pending")  # pending | sending | sent | skipped | failed
+    attempts = Column(Integer, nullable=False, server_default="0")
+    next_attempt_at = Column(DateTime(timezone=True), nullable=False, server_default=func.now())
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    sent_at = Column(DateTime(timezone=True), nullable=True)
+
+    # Flush sırası: Patient INSERT'i outbox satırlarından önce (FK aynı transaction'da)
+    patient = relationship("Patient")
+
+    def to_dict(self) -> dict:
+        return {
+            "id": self.id,
+            "dedupe_key": self.dedupe_key,
+            "kind": self.kind,
+            "channel": self.channel,
+            "patient_id": self.patient_id,
+            "status": self.status,
+            "attempts": self.attempts,
+            "next_attempt_at": self.next_attempt_at.isoformat() if self.next_attempt_at else None,
+            "last_error": self.last_error,
+            "created_at": self.created_at.isoformat() if self.created_at else None,
+            "sent_at": self.sent_at.isoformat() if self.sent_at else None,
+        }
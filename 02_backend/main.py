@@ -23,7 +23,7 @@ logging.basicConfig(
     datefmt="%H:%M:%S",
 )
 
-from fastapi import Depends, FastAPI, Request
+from fastapi import Depends, FastAPI, HTTPException, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
@@ -68,9 +68,45 @@ try:
     from master_orchestrator import AgentRouter  # noqa: E402
 except ImportError:
     class AgentRouter:
+        MAX_BATCH_SIZE = 500
+
         def route(self, payload: dict) -> dict:
             return {"status": "ok", "message": "Orchestrator not available", "payload": payload}
 
+        async def aroute(self, payload: dict) -> dict:
+            return self.route(payload)
+
+        def route_many(self, payloads: list[dict], max_batch_size: int | None = None) -> list[dict]:
+            return [self.route(p) for p in payloads]
+
+        def cache_stats(self) -> dict:
+            return {"enabled": False}
+
+        def session_log_stats(self) -> dict:
+            return {"enabled": False}
+
+        def agent_stats(self) -> dict:
+            return {"built": [], "agents": {}}
+
+        def keyword_stats(self) -> dict:
+            return {"enabled": False}
+
+        def reload_keywords(self) -> dict:
+            return {"enabled": False}
+
+
+# Agent paketine (04_ai_agents/skills dahil) bağlı servisler — yoksa backend yine açılır
+try:
+    from agents.tool_cache import tool_cache as chat_tool_cache  # noqa: E402
+except ImportError:
+    chat_tool_cache = None
+
+try:
+    from services.notification_outbox import outbox_worker  # noqa: E402
+except ImportError:
+    outbox_worker = None
+    logger.warning("Notification outbox unavailable — intake notifications stay queued")
+
 
 from routers.medical import router as medical_router  # noqa: E402
 from routers.travel import router as travel_router  # noqa: E402
@@ -81,6 +117,7 @@ from routers.meshy import router as meshy_router  # noqa: E402
 from routers.auth import router as auth_router  # noqa: E402
 from routers.notification import router as notification_router  # noqa: E402
 from auth import require_admin  # noqa: E402
+from services.chat_session_cache import session_cache as chat_session_cache  # noqa: E402
 
 # ---------------------------------------------------------------------------
 # Rate limiting
@@ -147,7 +184,13 @@ async def lifespan(app: FastAPI):
             session.close()
     except Exception as e:
         logger.warning(f"Database init skipped: {e}")
+
+    # Intake bildirimleri notification_outbox'tan arka planda gönderilir (NOTIFY_OUTBOX_WORKER=0 → bu process göndermez)
+    if outbox_worker is not None and os.getenv("NOTIFY_OUTBOX_WORKER", "1") != "0":
+        outbox_worker.start()
     yield
+    if outbox_worker is not None:
+        await outbox_worker.stop()
 
 
 app = FastAPI(
@@ -233,6 +276,10 @@ class InboundRequest(BaseModel):
     metadata: dict | None = None
 
 
+class BatchInboundRequest(BaseModel):
+    messages: list[InboundRequest]
+
+
 @app.get("/health")
 def health() -> dict:
     return {"status": "ok", "version": "2.0.0", "environment": _env}
@@ -244,6 +291,28 @@ def classify(req: InboundRequest) -> dict:
     return orchestrator.route({"message": req.message, "language": req.language})
 
 
+@app.post("/api/classify/async")
+async def classify_async(req: InboundRequest) -> dict:
+    """/api/classify'ın async varyantı — threadpool'u bloklamaz, sektör başına eşzamanlılık sınırı uygular."""
+    return await orchestrator.aroute({"message": req.message, "language": req.language})
+
+
+@app.post("/api/classify/batch")
+def classify_batch(req: BatchInboundRequest) -> dict:
+    """Toplu sınıflandırma — sonuçlar gönderilen mesaj sırasıyla döner."""
+    if not req.messages:
+        return {"total": 0, "results": []}
+    if len(req.messages) > orchestrator.MAX_BATCH_SIZE:
+        raise HTTPException(
+            status_code=413,
+            detail=f"Batch too large: {len(req.messages)} messages (max {orchestrator.MAX_BATCH_SIZE})",
+        )
+    results = orchestrator.route_many(
+        [{"message": m.message, "language": m.language} for m in req.messages]
+    )
+    return {"total": len(results), "results": results}
+
+
 @app.post("/api/admin/seed")
 def run_seed(_admin=Depends(require_admin)) -> dict:
     """One-time DB seeder — requires admin JWT."""
@@ -258,6 +327,64 @@ def run_seed(_admin=Depends(require_admin)) -> dict:
         session.close()
 
 
+@app.get("/api/admin/classify/cache")
+def classify_cache_stats(_admin=Depends(require_admin)) -> dict:
+    """Sınıflandırma önbelleği isabet/kaçırma sayaçları — requires admin JWT."""
+    return orchestrator.cache_stats()
+
+
+@app.get("/api/admin/classify/keywords")
+def classify_keyword_stats(_admin=Depends(require_admin)) -> dict:
+    """Aktif anahtar kelime sözlüğü sürümü (data/keywords.json) — requires admin JWT."""
+    return orchestrator.keyword_stats()
+
+
+@app.post("/api/admin/classify/keywords/reload")
+def reload_classify_keywords(_admin=Depends(require_admin)) -> dict:
+    """
+    Anahtar kelime sözlüklerini redeploy olmadan yeniden yükler — requires admin JWT.
+    Devam eden sınıflandırmalar beklemez; hatalı dosyada mevcut sözlükler korunur.
+    """
+    try:
+        return orchestrator.reload_keywords()
+    except (OSError, ValueError) as e:
+        raise HTTPException(status_code=422, detail=f"Keyword file rejected: {e}")
+
+
+@app.get("/api/admin/session-log")
+def session_log_stats(_admin=Depends(require_admin)) -> dict:
+    """Oturum log kuyruğu durumu (yazılan / düşürülen kayıtlar) — requires admin JWT."""
+    return orchestrator.session_log_stats()
+
+
+@app.get("/api/admin/chat/session-cache")
+def chat_session_cache_stats(_admin=Depends(require_admin)) -> dict:
+    """Sohbet oturum önbelleği: isabet oranı ve atlanan DB okumaları — requires admin JWT."""
+    return chat_session_cache.stats()
+
+
+@app.get("/api/admin/chat/tool-cache")
+def chat_tool_cache_stats(_admin=Depends(require_admin)) -> dict:
+    """Chat tool sonuç önbelleği: tool başına isabet oranı ve atlanan DB sorguları — requires admin JWT."""
+    if chat_tool_cache is None:
+        return {"enabled": False}
+    return chat_tool_cache.stats()
+
+
+@app.get("/api/admin/notifications/outbox")
+def notification_outbox_stats(_admin=Depends(require_admin)) -> dict:
+    """Bildirim outbox'ı: kuyruk derinliği, gönderilen / yeniden denenen / başarısız — requires admin JWT."""
+    if outbox_worker is None:
+        return {"enabled": False}
+    return outbox_worker.stats()
+
+
+@app.get("/api/admin/agents")
+def agent_stats(_admin=Depends(require_admin)) -> dict:
+    """Lazy agent registry: hangi agent'lar kuruldu, import/init süreleri — requires admin JWT."""
+    return orchestrator.agent_stats()
+
+
 @app.get("/api/sectors")
 def sectors() -> dict:
     return {
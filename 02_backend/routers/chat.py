@@ -1,23 +1,37 @@
 """
 AntiGravity Ventures — Chat Sector: FastAPI Router
 /api/chat/* endpoints — AI Medical Secretary chatbot
-DB-persisted sessions & messages.
+DB-persisted sessions & messages; single-worker deploys can serve active sessions from
+a write-through in-process cache (services/chat_session_cache.py, off by default). /api/chat/ws keeps one session per
+WebSocket connection (streamed tokens, heartbeat, reconnect with a message cursor).
 """
 from __future__ import annotations
 
+import asyncio
+import json
 import logging
+import os
 import sys
+import threading
+import time
 import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import replace
 from datetime import datetime
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Any, Iterator, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from pydantic import BaseModel, Field
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, WebSocket, WebSocketDisconnect
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from sqlalchemy import Select, select, tuple_, update
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from database.connection import get_db
+from database.connection import ASYNC_DB_AVAILABLE, SessionLocal, get_async_db, get_db
 from database.models import ChatSession, ChatMessage
+from services.chat_session_cache import CachedSession, session_cache as _session_cache
 
 # Rate limiting (graceful — works even without slowapi)
 try:
@@ -30,27 +44,32 @@ except ImportError:
 
 logger = logging.getLogger("thaiturk.chat")
 
+# /message: AsyncAnthropic + asyncpg pipeline (no worker thread held during the model call).
+# CHAT_ASYNC_PIPELINE=0 falls back to the sync route; also used when asyncpg is missing.
+_ASYNC_PIPELINE = ASYNC_DB_AVAILABLE and os.getenv("CHAT_ASYNC_PIPELINE", "1") != "0"
+
 # Agent path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "04_ai_agents"))
 
-try:
+from agents.chat_context import ConversationWindow, WindowPlan  # noqa: E402
+from agents.registry import get_agent  # noqa: E402
+
+if TYPE_CHECKING:
     from agents.chat_agent import MedicalSecretaryAgent
-except ImportError:
-    MedicalSecretaryAgent = None  # type: ignore[assignment,misc]
 
 router = APIRouter(prefix="/api/chat", tags=["Chat"])
 
-# Singleton agent instance
-_agent: MedicalSecretaryAgent | None = None
+# Token bütçeli geçmiş penceresi (CHAT_CONTEXT_TOKEN_BUDGET); taşan eski turlar
+# ChatSession.summary'ye katlanır.
+_window = ConversationWindow()
 
 
 def _get_agent() -> MedicalSecretaryAgent:
-    global _agent
-    if _agent is None:
-        if MedicalSecretaryAgent is None:
-            raise HTTPException(status_code=503, detail="Chat agent not available")
-        _agent = MedicalSecretaryAgent()
-    return _agent
+    """Paylaşılan MedicalSecretaryAgent — ilk kullanımda kurulur."""
+    agent = get_agent("chat")
+    if agent is None:
+        raise HTTPException(status_code=503, detail="Chat agent not available")
+    return agent
 
 
 # ---------------------------------------------------------------------------
@@ -85,26 +104,29 @@ class SendMessageResponse(BaseModel):
 
 class HistoryResponse(BaseModel):
     session_id: str
-    messages: list[dict]
-    total: int
+    messages: list[dict]                    # eskiden yeniye
+    total: int                              # bu sayfadaki mesaj sayısı
+    has_more: bool = Field(False, description="More messages exist in the paging direction")
+    before_cursor: Optional[str] = Field(None, description="Pass as ?before= for the older page")
+    after_cursor: Optional[str] = Field(None, description="Pass as ?after= for the newer page")
 
 
 # ---------------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------------
 
-@router.post("/session", response_model=StartSessionResponse)
-def start_session(body: StartSessionBody, request: Request, db: Session = Depends(get_db)) -> dict:
-    """Start a new chat session and get a greeting."""
-    agent = _get_agent()
+def _create_session(
+    db: Session, agent: MedicalSecretaryAgent, language: str, user_name: Optional[str],
+) -> tuple[str, str, str]:
+    """ChatSession + karşılama mesajı commit edilir ve önbelleğe eklenir → (session_id, greeting, greeting message_id)."""
     session_id = f"chat-{uuid.uuid4().hex[:12]}"
-    greeting = agent.get_greeting(body.language)
+    greeting = agent.get_greeting(language)
 
     # Persist session to DB
     db_session = ChatSession(
         session_id=session_id,
-        language=body.language,
-        user_name=body.user_name,
+        language=language,
+        user_name=user_name,
     )
     db.add(db_session)
 
@@ -117,7 +139,23 @@ def start_session(body: StartSessionBody, request: Request, db: Session = Depend
     )
     db.add(greeting_msg)
     db.commit()
+    _session_cache.put_if_absent(CachedSession(
+        session_id=session_id,
+        language=language,
+        user_name=user_name,
+        summary=None,
+        summary_message_count=0,
+        summary_through=None,
+        messages=({"role": "assistant", "content": greeting},),
+        message_ids=(greeting_msg.message_id,),
+    ))
+    return session_id, greeting, greeting_msg.message_id
+
 
+@router.post("/session", response_model=StartSessionResponse)
+def start_session(body: StartSessionBody, request: Request, db: Session = Depends(get_db)) -> dict:
+    """Start a new chat session and get a greeting."""
+    session_id, greeting, _ = _create_session(db, _get_agent(), body.language, body.user_name)
     return {
         "session_id": session_id,
         "greeting": greeting,
@@ -125,64 +163,212 @@ def start_session(body: StartSessionBody, request: Request, db: Session = Depend
     }
 
 
-@router.post("/message", response_model=SendMessageResponse)
-@(limiter.limit("20/minute") if _has_limiter else lambda f: f)
-def send_message(body: SendMessageBody, request: Request, db: Session = Depends(get_db)) -> dict:
-    """Send a message and get an AI response."""
-    agent = _get_agent()
+def _cached_session(db_session: ChatSession, rows: list[ChatMessage]) -> CachedSession:
+    return CachedSession(
+        session_id=db_session.session_id,
+        language=db_session.language,
+        user_name=db_session.user_name,
+        summary=db_session.summary,
+        summary_message_count=db_session.summary_message_count or 0,
+        summary_through=db_session.summary_through_message_id,
+        messages=tuple({"role": m.role, "content": m.content} for m in rows),
+        message_ids=tuple(m.message_id for m in rows),
+    )
+
 
-    db_session = db.query(ChatSession).filter(ChatSession.session_id == body.session_id).first()
-    if not db_session:
-        raise HTTPException(status_code=404, detail="Session not found. Start a new session first.")
+def _unfolded_query(db_session: ChatSession) -> Select:
+    """
+    Özete katlanmamış mesajlar: (created_at, message_id) > son katlanan mesaj.
+    Keyset sınırı — aynı created_at'i paylaşan eski satırlar OFFSET'teki gibi kaymaz.
+    """
+    stmt = select(ChatMessage).where(ChatMessage.session_id == db_session.session_id)
+    through = db_session.summary_through_message_id
+    if through:
+        through_at = select(ChatMessage.created_at).where(ChatMessage.message_id == through).scalar_subquery()
+        stmt = stmt.where(tuple_(ChatMessage.created_at, ChatMessage.message_id) > tuple_(through_at, through))
+    return stmt.order_by(ChatMessage.created_at, ChatMessage.message_id)
 
-    language = body.language or db_session.language
 
-    # Persist user message
-    user_msg_id = f"msg-{uuid.uuid4().hex[:10]}"
+def _load_session(db: Session, session_id: str) -> CachedSession | None:
+    """Önbellek ıskası: oturum + özete katlanmamış mesajlar DB'den."""
+    db_session = db.get(ChatSession, session_id)
+    if db_session is None:
+        return None
+    rows = db.execute(_unfolded_query(db_session)).scalars().all()
+    return _cached_session(db_session, rows)
+
+
+async def _aload_session(db: AsyncSession, session_id: str) -> CachedSession | None:
+    db_session = await db.get(ChatSession, session_id)
+    if db_session is None:
+        return None
+    rows = (await db.execute(_unfolded_query(db_session))).scalars().all()
+    return _cached_session(db_session, rows)
+
+
+def _new_turn(body: SendMessageBody, session: CachedSession) -> tuple[ChatMessage, dict, WindowPlan]:
+    """Kullanıcı mesajı satırı + geçmişin token bütçesine göre (fold, keep) planı."""
+    user_turn = {"role": "user", "content": body.message}
     user_msg = ChatMessage(
-        message_id=user_msg_id,
+        message_id=f"msg-{uuid.uuid4().hex[:10]}",
         session_id=body.session_id,
         role="user",
         content=body.message,
     )
-    db.add(user_msg)
-    db.flush()
-
-    # Build messages for Claude (last 100 messages for context window)
-    recent_messages = (
-        db.query(ChatMessage)
-        .filter(ChatMessage.session_id == body.session_id)
-        .order_by(ChatMessage.created_at)
-        .limit(100)
-        .all()
+    return user_msg, user_turn, _window.split([*session.messages, user_turn])
+
+
+def _advance_summary(session: CachedSession, summary: str, folded: int, user_message_id: str):
+    """
+    Özet UPDATE'i — sınır, katlanan son mesajın id'si. Özet başarısızsa çağrılmaz,
+    sınır ilerlemez ve katlama sonraki turda yeniden denenir.
+    """
+    through = (*session.message_ids, user_message_id)[folded - 1]
+    total = session.summary_message_count + folded
+    logger.info(f"Chat {session.session_id}: folded {folded} messages into summary (through {through}, total {total})")
+    return (
+        update(ChatSession)
+        .where(ChatSession.session_id == session.session_id)
+        .values(summary=summary, summary_message_count=total, summary_through_message_id=through)
     )
-    claude_messages = [
-        {"role": m.role, "content": m.content}
-        for m in recent_messages
-    ]
 
-    # Call the agent
+
+def _turn_context(plan: WindowPlan, folded: int) -> list[dict]:
+    """Model'e giden geçmiş — özetleme başarısızsa katlanacak turlar pencerede kalır (bütçe aşılır, bağlam kaybolmaz)."""
+    if plan.fold and not folded:
+        return [*plan.fold, *plan.keep]
+    return plan.keep
+
+
+def _cache_turn(
+    session: CachedSession, loaded: bool, user_turn: dict, user_message_id: str, folded: int, summary: str | None,
+) -> None:
+    """Write-through — yalnızca commit başarılı olduktan sonra çağrılır."""
+    if loaded:
+        _session_cache.put_if_absent(session)
+    _session_cache.append(session.session_id, [user_turn], [user_message_id], folded, summary)
+
+
+def _prepare_turn(
+    body: SendMessageBody,
+    db: Session,
+    agent: MedicalSecretaryAgent,
+) -> tuple[CachedSession, str, list[dict], str]:
+    """
+    Oturumu doğrular, kullanıcı mesajını (ve gerekirse güncellenen özeti) commit eder
+    ve Claude için token bütçeli geçmişi döndürür → (oturum, dil, mesajlar, user message_id).
+
+    Oturum önbellekteyse DB'den hiçbir şey okunmaz; yalnızca INSERT + COMMIT.
+    """
+    session = _session_cache.get(body.session_id)
+    loaded = session is None
+    if loaded:
+        session = _load_session(db, body.session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Session not found. Start a new session first.")
+
+    user_msg, user_turn, plan = _new_turn(body, session)
+    db.add(user_msg)
+    folded, summary = 0, session.summary
+    if plan.fold:
+        new_summary = agent.summarize(session.summary, plan.fold)
+        if new_summary:
+            folded, summary = len(plan.fold), new_summary
+            db.execute(_advance_summary(session, summary, folded, user_msg.message_id))
+    db.commit()  # user message + summary stored before the model call
+    _cache_turn(session, loaded, user_turn, user_msg.message_id, folded, summary)
+    context = _turn_context(plan, folded)
+    return replace(session, summary=summary), body.language or session.language, context, user_msg.message_id
+
+
+def _persist_reply(db: Session, session_id: str, content: str) -> str:
+    """Assistant yanıtını commit eder ve önbelleğe ekler → message_id."""
+    message_id = f"msg-{uuid.uuid4().hex[:10]}"
+    db.add(ChatMessage(message_id=message_id, session_id=session_id, role="assistant", content=content))
+    db.commit()
+    _session_cache.append(session_id, [{"role": "assistant", "content": content}], [message_id])
+    return message_id
+
+
+def send_message(body: SendMessageBody, request: Request, db: Session = Depends(get_db)) -> dict:
+    """Send a message and get an AI response."""
+    agent = _get_agent()
     try:
-        result = agent.chat(
-            messages=claude_messages,
-            language=language,
-            user_name=db_session.user_name,
-        )
+        agent.client  # 503 before anything is stored: missing SDK / API key
     except RuntimeError as e:
         logger.error(f"Agent error: {e}")
-        db.rollback()
         raise HTTPException(status_code=503, detail=str(e))
+    session, language, claude_messages, _ = _prepare_turn(body, db, agent)
+
+    # Call the agent
+    result = agent.chat(
+        messages=claude_messages,
+        language=language,
+        user_name=session.user_name,
+        summary=session.summary,
+    )
 
     # Persist assistant response
+    assistant_msg_id = _persist_reply(db, body.session_id, result["response"])
+
+    return {
+        "session_id": body.session_id,
+        "message_id": assistant_msg_id,
+        "response": result["response"],
+        "tool_results": result.get("tool_results", []),
+        "tokens_used": result.get("tokens", {}),
+        "timestamp": datetime.utcnow().isoformat(),
+    }
+
+
+async def send_message_async(
+    body: SendMessageBody,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+) -> dict:
+    """Send a message and get an AI response (async pipeline)."""
+    agent = _get_agent()
+    try:
+        agent.async_client  # 503 before anything is stored: missing SDK / API key
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+
+    session = _session_cache.get(body.session_id)
+    loaded = session is None
+    if loaded:
+        session = await _aload_session(db, body.session_id)
+        if session is None:
+            raise HTTPException(status_code=404, detail="Session not found. Start a new session first.")
+    language = body.language or session.language
+
+    user_msg, user_turn, plan = _new_turn(body, session)
+    db.add(user_msg)
+    folded, summary = 0, session.summary
+    if plan.fold:
+        new_summary = await agent.asummarize(session.summary, plan.fold)
+        if new_summary:
+            folded, summary = len(plan.fold), new_summary
+            await db.execute(_advance_summary(session, summary, folded, user_msg.message_id))
+    # Commit now — the pooled connection is released while the model call is in flight
+    await db.commit()
+    _cache_turn(session, loaded, user_turn, user_msg.message_id, folded, summary)
+
+    result = await agent.achat(
+        messages=_turn_context(plan, folded),
+        language=language,
+        user_name=session.user_name,
+        summary=summary,
+    )
+
     assistant_msg_id = f"msg-{uuid.uuid4().hex[:10]}"
-    assistant_msg = ChatMessage(
+    db.add(ChatMessage(
         message_id=assistant_msg_id,
         session_id=body.session_id,
         role="assistant",
         content=result["response"],
-    )
-    db.add(assistant_msg)
-    db.commit()
+    ))
+    await db.commit()
+    _session_cache.append(body.session_id, [{"role": "assistant", "content": result["response"]}], [assistant_msg_id])
 
     return {
         "session_id": body.session_id,
@@ -194,22 +380,536 @@ def send_message(body: SendMessageBody, request: Request, db: Session = Depends(
     }
 
 
+_send_message_route = send_message_async if _ASYNC_PIPELINE else send_message
+if _has_limiter:
+    _send_message_route = limiter.limit("20/minute")(_send_message_route)
+router.post("/message", response_model=SendMessageResponse)(_send_message_route)
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+@router.post("/message/stream")
+@(limiter.limit("20/minute") if _has_limiter else lambda f: f)
+def send_message_stream(body: SendMessageBody, request: Request, db: Session = Depends(get_db)) -> StreamingResponse:
+    """
+    Send a message and stream the AI response as Server-Sent Events.
+
+    Events: token {text} · tool_call {tool, input} · tool_result {tool, output, latency_ms, status} ·
+    error {message} · done {session_id, message_id, response, tool_results, tokens_used, timestamp}.
+    The assistant message is persisted before "done" is sent; "done.response" is authoritative.
+    """
+    agent = _get_agent()
+    try:
+        agent.client  # fail fast (503) before the stream starts: missing SDK / API key
+    except RuntimeError as e:
+        raise HTTPException(status_code=503, detail=str(e))
+    session, language, claude_messages, _ = _prepare_turn(body, db, agent)  # user message committed
+    user_name, summary = session.user_name, session.summary
+
+    def event_stream() -> Iterator[str]:
+        for event in agent.chat_stream(
+            messages=claude_messages, language=language, user_name=user_name, summary=summary,
+        ):
+            kind = event.pop("type")
+            if kind != "done":
+                yield _sse(kind, event)
+                continue
+
+            # Request-scoped session may already be closed — persist with a fresh one
+            with SessionLocal() as write_db:
+                assistant_msg_id = _persist_reply(write_db, body.session_id, event["response"])
+            yield _sse("done", {
+                "session_id": body.session_id,
+                "message_id": assistant_msg_id,
+                "response": event["response"],
+                "tool_results": event.get("tool_results", []),
+                "tokens_used": event.get("tokens", {}),
+                "timestamp": datetime.utcnow().isoformat(),
+            })
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+# ---------------------------------------------------------------------------
+# History — keyset pagination + NDJSON export
+# ---------------------------------------------------------------------------
+
+HISTORY_PAGE_DEFAULT = 50
+HISTORY_PAGE_MAX = 200
+EXPORT_BATCH_SIZE = 500
+
+HistoryCursor = tuple[datetime, str]   # (created_at, message_id)
+
+
+def _history_page_query(
+    session_id: str, limit: int, cursor: HistoryCursor | None = None, forward: bool = False,
+) -> Select:
+    """
+    Keyset sayfası, (created_at, message_id) sırasında — ix_chat_messages_session_created
+    üzerinde Index Scan; OFFSET yok, maliyet sayfanın derinliğinden bağımsız.
+
+    forward=True : cursor'dan sonraki mesajlar, eskiden yeniye
+    forward=False: cursor'dan önceki mesajlar (cursor yoksa en yeniler), yeniden eskiye
+    """
+    key = tuple_(ChatMessage.created_at, ChatMessage.message_id)
+    stmt = select(ChatMessage).where(ChatMessage.session_id == session_id)
+    if forward:
+        if cursor is not None:
+            stmt = stmt.where(key > tuple_(*cursor))
+        return stmt.order_by(ChatMessage.created_at, ChatMessage.message_id).limit(limit)
+    if cursor is not None:
+        stmt = stmt.where(key < tuple_(*cursor))
+    return stmt.order_by(ChatMessage.created_at.desc(), ChatMessage.message_id.desc()).limit(limit)
+
+
+def _history_cursor(db: Session, session_id: str, message_id: str) -> HistoryCursor:
+    """İstemcinin verdiği message_id → keyset anahtarı; başka oturumun mesajı kabul edilmez."""
+    row = db.execute(
+        select(ChatMessage.created_at, ChatMessage.message_id)
+        .where(ChatMessage.message_id == message_id, ChatMessage.session_id == session_id)
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=400, detail=f"Unknown history cursor: {message_id}")
+    return row.created_at, row.message_id
+
+
 @router.get("/history/{session_id}", response_model=HistoryResponse)
-def get_history(session_id: str, db: Session = Depends(get_db)) -> dict:
-    """Get chat history for a session."""
-    db_session = db.query(ChatSession).filter(ChatSession.session_id == session_id).first()
-    if not db_session:
+def get_history(
+    session_id: str,
+    limit: int = Query(HISTORY_PAGE_DEFAULT, ge=1, le=HISTORY_PAGE_MAX),
+    before: Optional[str] = Query(None, description="Message ID — return messages older than it"),
+    after: Optional[str] = Query(None, description="Message ID — return messages newer than it"),
+    db: Session = Depends(get_db),
+) -> dict:
+    """
+    Get one page of chat history, oldest first within the page.
+
+    No cursor → the newest `limit` messages. Page back with `before=before_cursor`,
+    forward (or poll for new messages) with `after=after_cursor`.
+    """
+    if before and after:
+        raise HTTPException(status_code=400, detail="Use either 'before' or 'after', not both")
+    if db.get(ChatSession, session_id) is None:
         raise HTTPException(status_code=404, detail="Session not found")
 
-    messages = (
-        db.query(ChatMessage)
-        .filter(ChatMessage.session_id == session_id)
-        .order_by(ChatMessage.created_at)
-        .all()
-    )
+    anchor = before or after
+    cursor = _history_cursor(db, session_id, anchor) if anchor else None
+    forward = after is not None
+    rows = list(db.execute(_history_page_query(session_id, limit + 1, cursor, forward)).scalars())
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if not forward:
+        rows.reverse()
 
     return {
         "session_id": session_id,
-        "messages": [m.to_dict() for m in messages],
-        "total": len(messages),
+        "messages": [m.to_dict() for m in rows],
+        "total": len(rows),
+        "has_more": has_more,
+        "before_cursor": rows[0].message_id if rows else before,
+        "after_cursor": rows[-1].message_id if rows else after,
     }
+
+
+@router.get("/history/{session_id}/export")
+def export_history(session_id: str, db: Session = Depends(get_db)) -> StreamingResponse:
+    """
+    Stream the full history as NDJSON (one message per line, oldest first).
+
+    Read in EXPORT_BATCH_SIZE keyset batches — memory stays flat for any thread length.
+    """
+    if db.get(ChatSession, session_id) is None:
+        raise HTTPException(status_code=404, detail="Session not found")
+
+    def ndjson() -> Iterator[str]:
+        # Request-scoped session may already be closed while streaming — read with a fresh one
+        cursor: HistoryCursor | None = None
+        with SessionLocal() as read_db:
+            while True:
+                batch = list(read_db.execute(
+                    _history_page_query(session_id, EXPORT_BATCH_SIZE, cursor, forward=True)
+                ).scalars())
+                for m in batch:
+                    yield json.dumps(m.to_dict(), ensure_ascii=False) + "\n"
+                if len(batch) < EXPORT_BATCH_SIZE:
+                    return
+                cursor = (batch[-1].created_at, batch[-1].message_id)
+
+    return StreamingResponse(
+        ndjson(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": f'attachment; filename="chat-{session_id}.ndjson"'},
+    )
+
+
+# ---------------------------------------------------------------------------
+# WebSocket — /api/chat/ws
+# ---------------------------------------------------------------------------
+
+WS_HEARTBEAT_SECONDS = float(os.getenv("CHAT_WS_HEARTBEAT", "20"))
+WS_MAX_MISSED_PINGS = 2
+WS_SEND_QUEUE = int(os.getenv("CHAT_WS_SEND_QUEUE", "64"))
+WS_PRODUCER_POLL_SECONDS = 1.0   # dolu kuyrukta bekleyen üretici bu aralıkla iptali kontrol eder
+WS_TURNS_PER_MINUTE = 20   # HTTP /message limiti ile aynı, istemci (IP) başına — yeniden bağlanmak sıfırlamaz
+
+WS_CLOSE_SESSION_NOT_FOUND = 4404
+WS_CLOSE_BAD_CURSOR = 4400
+WS_CLOSE_BAD_FRAME = 4400
+WS_CLOSE_HEARTBEAT_TIMEOUT = 4408
+
+# chat_stream() senkron bir generator — her aktif tur akış boyunca bir thread tutar.
+# Starlette'in threadpool'u (40) HTTP route'larıyla paylaşılmasın diye ayrı havuz.
+_WS_STREAM_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("CHAT_WS_STREAM_WORKERS", "64")), thread_name_prefix="chat-ws",
+)
+
+# session_id → sürmekte olan tur; yeniden bağlanan istemci bitmesini bekleyip yanıtı alır
+_ws_turns: dict[str, asyncio.Task] = {}
+
+# istemci anahtarı (slowapi ile aynı: uzak IP) → son 60 s'deki tur zamanları; yalnızca event loop'tan erişilir
+_ws_recent_turns: dict[str, deque[float]] = {}
+
+_END = object()
+
+
+class _ChatSocket:
+    """Tek bağlantının gönderim tarafı: frame'ler sıralı gider, kopunca send() sessizce düşer."""
+
+    def __init__(self, websocket: WebSocket) -> None:
+        self.websocket = websocket
+        self.connected = True
+        self._lock = asyncio.Lock()
+
+    async def send(self, frame: dict) -> None:
+        if not self.connected:
+            return
+        try:
+            async with self._lock:
+                await self.websocket.send_text(json.dumps(frame, ensure_ascii=False, default=str))
+        except (WebSocketDisconnect, RuntimeError, OSError):
+            self.connected = False
+
+    async def close(self, code: int, reason: str = "") -> None:
+        if self.connected:
+            self.connected = False
+            try:
+                await self.websocket.close(code=code, reason=reason)
+            except (RuntimeError, OSError):
+                pass
+
+
+def _ws_client_key(websocket: WebSocket) -> str:
+    """HTTP /message limitinin anahtarı — slowapi yoksa aynı kural (istemci IP'si)."""
+    if _has_limiter:
+        return get_remote_address(websocket)
+    return websocket.client.host if websocket.client else "127.0.0.1"
+
+
+def _ws_turn_allowed(client_key: str) -> bool:
+    """Kayan 60 s penceresinde WS_TURNS_PER_MINUTE; izin verilirse tur sayılır."""
+    now = time.monotonic()
+    if len(_ws_recent_turns) > 1024:
+        # Bir dakikadır tur göndermeyen istemcileri at — sözlük bağlantı sayısıyla büyümez
+        for key in [k for k, turns in _ws_recent_turns.items() if not turns or now - turns[-1] > 60]:
+            del _ws_recent_turns[key]
+    turns = _ws_recent_turns.setdefault(client_key, deque())
+    while turns and now - turns[0] > 60:
+        turns.popleft()
+    if len(turns) >= WS_TURNS_PER_MINUTE:
+        return False
+    turns.append(now)
+    return True
+
+
+async def _ws_receive_text(websocket: WebSocket) -> Optional[str]:
+    """Sonraki text frame; binary frame → None. receive_text() binary'de KeyError fırlatır."""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    return message.get("text")
+
+
+def _ws_start_session(agent: MedicalSecretaryAgent, language: str, user_name: Optional[str]) -> tuple[str, str, str]:
+    with SessionLocal() as db:
+        return _create_session(db, agent, language, user_name)
+
+
+def _ws_resume_session(session_id: str) -> CachedSession | None:
+    """Oturum önbellekte değilse DB'den yüklenip eklenir — önbellek açıksa bağlantı boyunca turlar DB okumaz."""
+    session = _session_cache.get(session_id)
+    if session is None:
+        with SessionLocal() as db:
+            session = _load_session(db, session_id)
+        if session is not None:
+            _session_cache.put_if_absent(session)
+    return session
+
+
+def _ws_replay_batch(session_id: str, cursor: str) -> list[dict]:
+    with SessionLocal() as db:
+        key = _history_cursor(db, session_id, cursor)
+        rows = db.execute(_history_page_query(session_id, EXPORT_BATCH_SIZE, key, forward=True)).scalars()
+        return [m.to_dict() for m in rows]
+
+
+async def _ws_replay(conn: _ChatSocket, session_id: str, cursor: str) -> str:
+    """cursor'dan sonra kaydedilmiş mesajları "message" frame'leri olarak gönderir → son gönderilen id."""
+    while True:
+        batch = await asyncio.to_thread(_ws_replay_batch, session_id, cursor)
+        for message in batch:
+            await conn.send({"type": "message", **message})
+        if batch:
+            cursor = batch[-1]["message_id"]
+        if len(batch) < EXPORT_BATCH_SIZE:
+            return cursor
+
+
+def _ws_prepare_turn(body: SendMessageBody, agent: MedicalSecretaryAgent) -> tuple[CachedSession, str, list[dict], str]:
+    with SessionLocal() as db:
+        return _prepare_turn(body, db, agent)
+
+
+def _ws_persist_reply(session_id: str, content: str) -> str:
+    with SessionLocal() as db:
+        return _persist_reply(db, session_id, content)
+
+
+async def _ws_turn(conn: _ChatSocket, agent: MedicalSecretaryAgent, body: SendMessageBody) -> None:
+    """
+    Tek tur: kullanıcı mesajı commit → chat_stream (ayrı thread) → sınırlı kuyruk → socket.
+
+    Backpressure: kuyruk (CHAT_WS_SEND_QUEUE) doluysa üretici thread bekler, model akışı
+    da okunmaz; yavaş istemcide biriken token'lar tek "token" frame'inde birleştirilir.
+    Bağlantı koparsa tur yine tamamlanır ve yanıt kaydedilir — istemci cursor ile geri alır.
+    """
+    try:
+        session, language, claude_messages, user_message_id = await asyncio.to_thread(
+            _ws_prepare_turn, body, agent,
+        )
+    except HTTPException as e:
+        await conn.send({"type": "error", "message": e.detail})
+        return
+    except Exception as e:
+        logger.error(f"Chat WS turn failed for {body.session_id}: {type(e).__name__}: {e}")
+        await conn.send({"type": "error", "message": "Assistant unavailable, please retry"})
+        return
+    await conn.send({"type": "ack", "message_id": user_message_id})
+
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=WS_SEND_QUEUE)
+    stopped = threading.Event()   # tüketici iptal edildi / loop durdu → üretici bırakır
+
+    def put(item: Any) -> bool:
+        """Kuyruğa ekler (dolu kuyrukta bekler); tüketici gittiyse False — thread sonsuza dek bloklanmaz."""
+        try:
+            future = asyncio.run_coroutine_threadsafe(queue.put(item), loop)
+        except RuntimeError:   # loop kapandı
+            return False
+        while True:
+            try:
+                future.result(timeout=WS_PRODUCER_POLL_SECONDS)
+                return True
+            except FutureTimeoutError:
+                if stopped.is_set() or not loop.is_running():
+                    future.cancel()
+                    return False
+
+    def produce() -> None:
+        stream = agent.chat_stream(
+            messages=claude_messages, language=language,
+            user_name=session.user_name, summary=session.summary,
+        )
+        try:
+            for event in stream:
+                if not put(event):
+                    logger.warning(f"Chat WS turn abandoned for {body.session_id} — consumer gone")
+                    return
+        finally:
+            stream.close()
+            put(_END)
+
+    producer = loop.run_in_executor(_WS_STREAM_POOL, produce)
+    try:
+        await _ws_consume(conn, body, queue)
+    finally:
+        stopped.set()
+    try:
+        await producer
+    except Exception as e:
+        logger.error(f"Chat WS turn failed for {body.session_id}: {e}")
+        await conn.send({"type": "error", "message": "Assistant unavailable, please retry"})
+
+
+async def _ws_consume(conn: _ChatSocket, body: SendMessageBody, queue: asyncio.Queue) -> None:
+    """Üretici kuyruğunu _END'e kadar socket'e aktarır; ardışık token'lar tek frame'de birleşir."""
+    pending: Any = None
+    while True:
+        event, pending = (pending if pending is not None else await queue.get()), None
+        if event is _END:
+            break
+        kind = event.pop("type")
+        if kind == "token":
+            parts = [event["text"]]
+            while not queue.empty():
+                nxt = queue.get_nowait()
+                if nxt is _END or nxt["type"] != "token":
+                    pending = nxt
+                    break
+                parts.append(nxt["text"])
+            await conn.send({"type": "token", "text": "".join(parts)})
+        elif kind == "done":
+            message_id = await asyncio.to_thread(_ws_persist_reply, body.session_id, event["response"])
+            await conn.send({
+                "type": "done",
+                "session_id": body.session_id,
+                "message_id": message_id,
+                "response": event["response"],
+                "tool_results": event.get("tool_results", []),
+                "tokens_used": event.get("tokens", {}),
+                "timestamp": datetime.utcnow().isoformat(),
+            })
+        else:
+            await conn.send({"type": kind, **event})
+
+
+def _track_turn(session_id: str, task: asyncio.Task) -> None:
+    _ws_turns[session_id] = task
+
+    def _untrack(done: asyncio.Task) -> None:
+        if _ws_turns.get(session_id) is done:
+            del _ws_turns[session_id]
+        if not done.cancelled() and done.exception() is not None:
+            logger.error(f"Chat WS turn crashed for {session_id}: {done.exception()}")
+
+    task.add_done_callback(_untrack)
+
+
+@router.websocket("/ws")
+async def chat_socket(
+    websocket: WebSocket,
+    session_id: Optional[str] = None,
+    cursor: Optional[str] = None,
+    language: Optional[str] = None,
+    user_name: Optional[str] = None,
+) -> None:
+    """
+    Long-lived chat session over one WebSocket. JSON frames, one per message.
+
+    Connect:   /api/chat/ws?language=ru[&user_name=..]           → new session
+               /api/chat/ws?session_id=..[&cursor=<message_id>]  → resume; every stored message
+               after `cursor` is replayed as "message" frames (a reply still being generated
+               is awaited and replayed too), so the client keeps the last message_id it saw.
+    Client →   message {text, language?} · ping · pong
+    Server →   session {session_id, language, greeting?, resumed, cursor} · message {..history row} ·
+               ack {message_id} · token {text} · tool_call · tool_result · done {message_id, response, ..} ·
+               error {message} · ping · pong
+    Heartbeat: server pings after CHAT_WS_HEARTBEAT s of client silence; closes with 4408 after
+               WS_MAX_MISSED_PINGS unanswered pings. 4404 unknown session, 4400 unknown cursor
+               or binary frame.
+    One turn at a time per session; WS_TURNS_PER_MINUTE turns per client IP across connections.
+    """
+    await websocket.accept()
+    conn = _ChatSocket(websocket)
+    agent = get_agent("chat")
+    if agent is None:
+        await conn.send({"type": "error", "message": "Chat agent not available"})
+        await conn.close(1011)
+        return
+    try:
+        agent.client
+    except RuntimeError as e:
+        await conn.send({"type": "error", "message": str(e)})
+        await conn.close(1011)
+        return
+
+    if session_id is None:
+        language = language or "en"
+        session_id, greeting, greeting_id = await asyncio.to_thread(_ws_start_session, agent, language, user_name)
+        await conn.send({
+            "type": "session", "session_id": session_id, "language": language,
+            "greeting": greeting, "resumed": False, "cursor": greeting_id,
+        })
+    else:
+        session = await asyncio.to_thread(_ws_resume_session, session_id)
+        if session is None:
+            await conn.send({"type": "error", "message": "Session not found. Start a new session first."})
+            await conn.close(WS_CLOSE_SESSION_NOT_FOUND)
+            return
+        language = language or session.language
+        await conn.send({
+            "type": "session", "session_id": session_id, "language": language,
+            "resumed": True, "cursor": cursor,
+        })
+        if cursor:
+            try:
+                cursor = await _ws_replay(conn, session_id, cursor)
+                in_flight = _ws_turns.get(session_id)
+                if in_flight is not None:
+                    await asyncio.wait({in_flight})   # reply of the turn the client dropped off
+                    await _ws_replay(conn, session_id, cursor)
+            except HTTPException as e:
+                await conn.send({"type": "error", "message": e.detail})
+                await conn.close(WS_CLOSE_BAD_CURSOR)
+                return
+    logger.info(f"Chat WS connected: {session_id}")
+
+    missed_pings = 0
+    client_key = _ws_client_key(websocket)
+    try:
+        while conn.connected:
+            try:
+                raw = await asyncio.wait_for(_ws_receive_text(websocket), WS_HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                if missed_pings >= WS_MAX_MISSED_PINGS:
+                    await conn.close(WS_CLOSE_HEARTBEAT_TIMEOUT, "heartbeat timeout")
+                    break
+                missed_pings += 1
+                await conn.send({"type": "ping"})
+                continue
+            missed_pings = 0
+            if raw is None:
+                await conn.close(WS_CLOSE_BAD_FRAME, "binary frames are not supported")
+                break
+
+            try:
+                frame = json.loads(raw)
+                kind = frame.get("type")
+            except (ValueError, AttributeError):
+                await conn.send({"type": "error", "message": "Frames must be JSON objects"})
+                continue
+            if kind == "ping":
+                await conn.send({"type": "pong"})
+                continue
+            if kind == "pong":
+                continue
+            if kind != "message":
+                await conn.send({"type": "error", "message": f"Unknown frame type: {kind}"})
+                continue
+
+            in_flight = _ws_turns.get(session_id)
+            if in_flight is not None and not in_flight.done():
+                await conn.send({"type": "error", "message": "A reply is still in progress"})
+                continue
+            try:
+                body = SendMessageBody(
+                    session_id=session_id, message=frame.get("text", ""), language=frame.get("language"),
+                )
+            except ValidationError as e:
+                await conn.send({"type": "error", "message": e.errors()[0]["msg"]})
+                continue
+            if not _ws_turn_allowed(client_key):
+                await conn.send({"type": "error", "message": "Too many messages, slow down"})
+                continue
+            language = body.language = body.language or language
+            _track_turn(session_id, asyncio.create_task(_ws_turn(conn, agent, body)))
+    except WebSocketDisconnect:
+        pass
+    finally:
+        conn.connected = False
+        logger.info(f"Chat WS disconnected: {session_id}")
@@ -8,7 +8,7 @@ from __future__ import annotations
 
 import sys
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
 from sqlalchemy.orm import Session
@@ -17,7 +17,10 @@ from database.connection import get_db
 
 # Agent path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "04_ai_agents"))
-from agents.marketing_agent import MarketingAgent  # noqa: E402
+from agents.registry import get_agent  # noqa: E402
+
+if TYPE_CHECKING:
+    from agents.marketing_agent import MarketingAgent
 
 # Pydantic models
 sys.path.insert(0, str(Path(__file__).parent.parent))
@@ -35,7 +38,14 @@ from models.marketing import (  # noqa: E402
 )
 
 router = APIRouter(prefix="/api/marketing", tags=["Marketing"])
-agent = MarketingAgent()
+
+
+def _get_agent() -> MarketingAgent:
+    """Orchestrator ile paylaşılan MarketingAgent — ilk kullanımda kurulur."""
+    agent = get_agent("marketing")
+    if agent is None:
+        raise HTTPException(status_code=503, detail="Marketing agent not available")
+    return agent
 
 
 # ---------------------------------------------------------------------------
@@ -45,7 +55,7 @@ agent = MarketingAgent()
 @router.post("/seo/analyze")
 def seo_analyze(body: SEOAnalyzeRequest) -> dict:
     """Keyword analizi + SEO skoru."""
-    return agent.generate_seo_package({
+    return _get_agent().generate_seo_package({
         "procedure": body.procedure,
         "region": body.region.value,
         "lang": body.lang,
@@ -55,7 +65,7 @@ def seo_analyze(body: SEOAnalyzeRequest) -> dict:
 @router.post("/seo/meta")
 def seo_meta(body: MetaTagRequest) -> dict:
     """Meta tag uretimi."""
-    return agent.handle({
+    return _get_agent().handle({
         "action": "seo_meta",
         "title": body.title,
         "description": body.description,
@@ -71,7 +81,7 @@ def seo_meta(body: MetaTagRequest) -> dict:
 @router.post("/content/blog")
 def content_blog(body: ContentRequest) -> dict:
     """Blog yazisi uretimi."""
-    return agent.handle({
+    return _get_agent().handle({
         "action": "content_blog",
         "procedure": body.procedure,
         "region": body.region.value,
@@ -83,7 +93,7 @@ def content_blog(body: ContentRequest) -> dict:
 @router.post("/content/ad-copy")
 def content_ad_copy(body: ContentRequest) -> dict:
     """Reklam metni uretimi."""
-    return agent.handle({
+    return _get_agent().handle({
         "action": "content_ad",
         "procedure": body.procedure,
         "platform": body.platform.value if body.platform else "google",
@@ -95,7 +105,7 @@ def content_ad_copy(body: ContentRequest) -> dict:
 @router.post("/content/social")
 def content_social(body: ContentRequest) -> dict:
     """Sosyal medya postu uretimi."""
-    return agent.handle({
+    return _get_agent().handle({
         "action": "content_social",
         "procedure": body.procedure,
         "platform": body.platform.value if body.platform else "instagram",
@@ -114,7 +124,7 @@ def campaign_plan(body: CampaignPlanRequest, db: Session = Depends(get_db)) -> d
     from database.models import Campaign
     import uuid
 
-    result = agent.plan_campaign({
+    result = _get_agent().plan_campaign({
         "procedure": body.procedure,
         "regions": [r.value for r in body.regions],
         "budget_usd": body.budget_usd,
@@ -146,7 +156,7 @@ def campaign_plan(body: CampaignPlanRequest, db: Session = Depends(get_db)) -> d
 @router.post("/campaign/budget")
 def campaign_budget(body: BudgetSplitRequest) -> dict:
     """Butce dagilimi hesaplama."""
-    return agent.handle({
+    return _get_agent().handle({
         "action": "campaign_budget",
         "total_budget": body.total_budget,
         "regions": [r.value for r in body.regions],
@@ -161,7 +171,7 @@ def campaign_roi(
     region: str = "turkey",
 ) -> dict:
     """ROI tahmini."""
-    return agent.handle({
+    return _get_agent().handle({
         "action": "campaign_roi",
         "procedure": procedure,
         "budget_usd": budget_usd,
@@ -176,7 +186,7 @@ def campaign_roi(
 @router.post("/analytics/report")
 def analytics_report(body: AnalyticsReportRequest) -> dict:
     """Performans raporu."""
-    return agent.get_analytics({
+    return _get_agent().get_analytics({
         "campaign_id": body.campaign_id,
         "period": body.period,
     })
@@ -185,7 +195,7 @@ def analytics_report(body: AnalyticsReportRequest) -> dict:
 @router.get("/analytics/funnel")
 def analytics_funnel(period: str = "last_30d") -> dict:
     """Funnel metrikleri."""
-    return agent.handle({
+    return _get_agent().handle({
         "action": "analytics_funnel",
         "period": period,
     })
@@ -198,7 +208,7 @@ def analytics_funnel(period: str = "last_30d") -> dict:
 @router.post("/leads/segment")
 def leads_segment(body: LeadSegmentRequest) -> dict:
     """Lead segmentasyonu."""
-    return agent.optimize_funnel({
+    return _get_agent().optimize_funnel({
         "criteria": body.criteria,
         "region": body.region.value if body.region else None,
     })
@@ -207,7 +217,7 @@ def leads_segment(body: LeadSegmentRequest) -> dict:
 @router.post("/leads/score")
 def leads_score(body: LeadScoreRequest) -> dict:
     """Lead skorlama."""
-    return agent.handle({
+    return _get_agent().handle({
         "action": "lead_score",
         "source": body.source,
         "procedure_interest": body.procedure_interest,
@@ -225,7 +235,7 @@ def leads_score(body: LeadScoreRequest) -> dict:
 @router.post("/publish/schedule")
 def publish_schedule(body: PublishRequest, db: Session = Depends(get_db)) -> dict:
     """Icerik zamanlama."""
-    return agent.handle({
+    return _get_agent().handle({
         "action": "publish_schedule",
         "content": body.content,
         "platform": body.platform.value,
@@ -236,7 +246,7 @@ def publish_schedule(body: PublishRequest, db: Session = Depends(get_db)) -> dic
 @router.post("/publish/now")
 def publish_now(body: PublishRequest, db: Session = Depends(get_db)) -> dict:
     """Anlik yayinlama."""
-    return agent.handle({
+    return _get_agent().handle({
         "action": "publish_now",
         "content": body.content,
         "platform": body.platform.value,
@@ -246,7 +256,7 @@ def publish_now(body: PublishRequest, db: Session = Depends(get_db)) -> dict:
 @router.get("/publish/queue")
 def publish_queue(db: Session = Depends(get_db)) -> dict:
     """Yayin kuyrugu."""
-    return agent.handle({"action": "publish_queue"}, db=db)
+    return _get_agent().handle({"action": "publish_queue"}, db=db)
 
 
 # ---------------------------------------------------------------------------
@@ -256,10 +266,10 @@ def publish_queue(db: Session = Depends(get_db)) -> dict:
 @router.get("/regions")
 def list_regions() -> dict:
     """Desteklenen bolgeler & locale bilgisi."""
-    return agent.handle({"action": "regions"})
+    return _get_agent().handle({"action": "regions"})
 
 
 @router.get("/platforms")
 def list_platforms() -> dict:
     """Platform listesi & format kurallari."""
-    return agent.handle({"action": "platforms"})
+    return _get_agent().handle({"action": "platforms"})
@@ -4,16 +4,32 @@ AntiGravity Ventures — Medical Sector: FastAPI Router
 """
 from __future__ import annotations
 
+import codecs
+import csv
+import json
+import logging
+import os
 import sys
+from datetime import datetime
 from pathlib import Path
+from typing import TYPE_CHECKING, Any, AsyncIterator, Callable, Iterator
 
-from fastapi import APIRouter, Depends, HTTPException, Request
-from pydantic import BaseModel, Field, field_validator
+import anyio.from_thread
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from pydantic import BaseModel, Field, ValidationError, field_validator
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from typing import Optional, Literal
 
 from auth import get_current_user
-from database.connection import get_db
+from database.connection import SessionLocal, get_db
+from database.models import PATIENT_FIELD_COLUMNS
+
+# Outbox worker (graceful — bildirim bağımlılıkları yoksa satırlar kuyrukta bekler)
+try:
+    from services.notification_outbox import outbox_worker
+except ImportError:
+    outbox_worker = None
 
 # Rate limiting (graceful)
 try:
@@ -26,10 +42,26 @@ except ImportError:
 
 # Agent path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "04_ai_agents"))
-from agents.medical_agent import MedicalAgent  # noqa: E402
+from agents.intake_transport import IntakeError, IntakeTransport, set_intake_transport  # noqa: E402
+from agents.registry import get_agent  # noqa: E402
+
+if TYPE_CHECKING:
+    from agents.medical_agent import MedicalAgent
 
 router = APIRouter(prefix="/api/medical", tags=["Medical"])
-agent = MedicalAgent()
+
+
+def _wake_outbox() -> None:
+    if outbox_worker is not None:
+        outbox_worker.wake()
+
+
+def _get_agent() -> MedicalAgent:
+    """Orchestrator ile paylaşılan MedicalAgent — ilk kullanımda kurulur."""
+    agent = get_agent("medical")
+    if agent is None:
+        raise HTTPException(status_code=503, detail="Medical agent not available")
+    return agent
 
 
 # ---------------------------------------------------------------------------
@@ -63,6 +95,184 @@ class StatusUpdateBody(BaseModel):
     new_status: str
 
 
+# ---------------------------------------------------------------------------
+# In-process intake (chat agent → submit_patient_inquiry)
+# ---------------------------------------------------------------------------
+
+class InProcessIntakeTransport(IntakeTransport):
+    """
+    POST /api/medical/intake ile aynı doğrulama ve işleme — HTTP loopback olmadan.
+    Çağıran thread'de çalışır; kendi DB oturumunu açıp kapatır.
+    """
+
+    name = "inprocess"
+
+    def __init__(self, session_factory: Callable[[], Session] = SessionLocal) -> None:
+        self.session_factory = session_factory
+
+    def submit(self, payload: dict[str, Any]) -> dict:
+        try:
+            body = IntakeBody(**payload)
+        except ValidationError as e:
+            raise IntakeError(f"Invalid intake ({e.error_count()} field errors)") from e
+        db = self.session_factory()
+        try:
+            result = _get_agent().process_intake(body.model_dump(), db=db)
+            _wake_outbox()
+            return result
+        except Exception as e:
+            db.rollback()
+            raise IntakeError(f"{type(e).__name__}: {e}") from e
+        finally:
+            db.close()
+
+
+# Varsayılan: chat intake'i process içinde. CHAT_INTAKE_TRANSPORT=http → INTAKE_API_URL
+# (yoksa localhost:PORT) üzerinden HTTP, ör. chat ve medical ayrı servislerde çalışıyorsa.
+if os.getenv("CHAT_INTAKE_TRANSPORT", "inprocess") != "http":
+    set_intake_transport(InProcessIntakeTransport())
+
+
+# ---------------------------------------------------------------------------
+# Bulk intake — streaming CSV / JSONL upload
+# ---------------------------------------------------------------------------
+# Gövde parça parça okunur (tüm dosya hiçbir zaman bellekte değil); satırlar IntakeBody ile
+# doğrulanır, BULK_CHUNK_SIZE'lık parçalar halinde tek hastane snapshot'ına karşı
+# sınıflandırılıp multi-row INSERT + parça başına tek commit ile yazılır.
+
+BULK_CHUNK_SIZE = int(os.getenv("MEDICAL_BULK_CHUNK_SIZE", "500"))
+BULK_MAX_ROWS = int(os.getenv("MEDICAL_BULK_MAX_ROWS", "10000"))
+BULK_MAX_LINE_CHARS = 64 * 1024
+
+_BULK_CONTENT_TYPES = {
+    "text/csv": "csv",
+    "application/csv": "csv",
+    "application/x-ndjson": "jsonl",
+    "application/jsonl": "jsonl",
+    "application/json-lines": "jsonl",
+}
+
+
+class _BulkInputError(ValueError):
+    """Yükleme okunamaz hale geldi — kalan satırlar işlenmez, rapor yine döner."""
+
+
+async def _next_chunk(stream: AsyncIterator[bytes]) -> Optional[bytes]:
+    try:
+        return await stream.__anext__()
+    except StopAsyncIteration:
+        return None
+
+
+def _body_lines(stream: AsyncIterator[bytes]) -> Iterator[str]:
+    """Worker thread'inde: istek gövdesinden satırlar (sonları korunur — csv çok satırlı alanlar için)."""
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    pending = ""
+    while (chunk := anyio.from_thread.run(_next_chunk, stream)) is not None:
+        pending += decoder.decode(chunk)
+        *lines, pending = pending.split("\n")
+        for line in lines:
+            yield line + "\n"
+        if len(pending) > BULK_MAX_LINE_CHARS:
+            raise _BulkInputError(f"Line longer than {BULK_MAX_LINE_CHARS} characters")
+    pending += decoder.decode(b"", final=True)
+    if pending:
+        yield pending
+
+
+def _bulk_records(lines: Iterator[str], fmt: str) -> Iterator[tuple[int, Any]]:
+    """(satır no, kayıt) — JSONL'de dosya satırı, CSV'de başlıktan sonraki veri satırı. Bozuk kayıt → Exception."""
+    if fmt == "jsonl":
+        for number, line in enumerate(lines, 1):
+            if not line.strip():
+                continue
+            try:
+                yield number, json.loads(line)
+            except json.JSONDecodeError as e:
+                yield number, ValueError(f"Invalid JSON: {e.msg}")
+        return
+
+    reader = csv.reader(lines)
+    header = [name.strip().lower() for name in next(reader, [])]
+    for number, values in enumerate(reader, 1):
+        if not any(v.strip() for v in values):
+            continue
+        if len(values) > len(header):
+            yield number, ValueError(f"{len(values)} columns, header has {len(header)}")
+            continue
+        # Boş hücre = alan yok (opsiyonel alanlar varsayılana düşer)
+        yield number, {k: v.strip() for k, v in zip(header, values) if v.strip()}
+
+
+def _validation_summary(error: ValidationError) -> str:
+    return "; ".join(f"{'.'.join(map(str, e['loc'])) or 'row'}: {e['msg']}" for e in error.errors())
+
+
+def _run_bulk_intake(agent: MedicalAgent, lines: Iterator[str], fmt: str, db: Session, notify: bool = True) -> dict:
+    """Worker thread'inde çalışır: doğrula → parça parça process_intake_batch → satır raporu."""
+    index = agent.hospital_snapshot(db=db)
+    report: dict[str, Any] = {
+        "format": fmt, "notify": notify, "rows": 0, "created": 0, "failed": 0, "chunks": 0, "aborted": None,
+    }
+    results: list[dict] = []
+    pending: list[tuple[int, dict]] = []
+
+    def flush() -> None:
+        outcomes = agent.process_intake_batch([body for _, body in pending], db=db, index=index, notify=notify)
+        if notify:
+            _wake_outbox()   # parçanın bildirimleri commit edildi — worker beklemeden göndersin
+        for (number, _), outcome in zip(pending, outcomes):
+            if "error" in outcome:
+                results.append({"row": number, "status": "failed", "error": outcome["error"]})
+            else:
+                results.append({"row": number, "status": "created", **outcome})
+        report["chunks"] += 1
+        pending.clear()
+
+    try:
+        for number, record in _bulk_records(lines, fmt):
+            if report["rows"] >= BULK_MAX_ROWS:
+                raise _BulkInputError(f"More than {BULK_MAX_ROWS} rows — split the file")
+            report["rows"] += 1
+            try:
+                if isinstance(record, Exception):
+                    raise record
+                if not isinstance(record, dict):
+                    raise ValueError("Row must be a JSON object")
+                body = IntakeBody(**record)
+            except ValidationError as e:
+                results.append({"row": number, "status": "invalid", "error": _validation_summary(e)})
+                continue
+            except (ValueError, TypeError) as e:
+                results.append({"row": number, "status": "invalid", "error": str(e)})
+                continue
+            pending.append((number, body.model_dump()))
+            if len(pending) >= BULK_CHUNK_SIZE:
+                flush()
+    except (_BulkInputError, csv.Error) as e:
+        report["aborted"] = f"{type(e).__name__}: {e}"
+    if pending:
+        flush()
+
+    results.sort(key=lambda r: r["row"])
+    report["created"] = sum(1 for r in results if r["status"] == "created")
+    report["failed"] = len(results) - report["created"]
+    report["results"] = results
+    logging.getLogger("thaiturk.medical").info(
+        f"Bulk intake ({fmt}): {report['created']}/{report['rows']} created in {report['chunks']} chunks"
+        + (f", aborted: {report['aborted']}" if report["aborted"] else "")
+    )
+    return report
+
+
+# ---------------------------------------------------------------------------
+# Patient list — keyset pagination
+# ---------------------------------------------------------------------------
+
+PATIENTS_PAGE_DEFAULT = 50
+PATIENTS_PAGE_MAX = 500
+
+
 # ---------------------------------------------------------------------------
 # Endpoints
 # ---------------------------------------------------------------------------
@@ -74,8 +284,10 @@ def submit_intake(body: IntakeBody, request: Request, db: Session = Depends(get_
     Yeni hasta başvurusu.
     Prosedür sınıflandırması, hastane eşleştirmesi ve komisyon hesaplaması yapar.
     """
+    agent = _get_agent()
     try:
         result = agent.process_intake(body.model_dump(), db=db)
+        _wake_outbox()
         return result
     except Exception as e:
         import os, logging
@@ -85,10 +297,34 @@ def submit_intake(body: IntakeBody, request: Request, db: Session = Depends(get_
         raise HTTPException(status_code=500, detail=detail)
 
 
+@router.post("/intake/bulk")
+@(limiter.limit("5/minute") if _has_limiter else lambda f: f)
+async def submit_intake_bulk(
+    request: Request,
+    fmt: Optional[Literal["csv", "jsonl"]] = Query(None, alias="format"),
+    notify: bool = Query(True, description="Queue coordinator/patient notifications for each created patient"),
+    db: Session = Depends(get_db),
+    _user=Depends(get_current_user),
+) -> dict:
+    """
+    Toplu hasta başvurusu — CSV (başlık satırı = IntakeBody alanları) veya JSONL gövdesi.
+    Format: ?format=csv|jsonl ya da Content-Type (text/csv, application/x-ndjson).
+    Her satır için rapor: created (patient_id, kategori, hastane) / invalid / failed.
+    Bildirimler tekil intake'teki gibi outbox'a yazılır (hasta başına koordinatör + hasta
+    mesajı); eski kayıtların içe aktarımı gibi durumlarda ?notify=false ile kapatılır.
+    """
+    content_type = request.headers.get("content-type", "").split(";")[0].strip().lower()
+    fmt = fmt or _BULK_CONTENT_TYPES.get(content_type)
+    if fmt is None:
+        raise HTTPException(status_code=415, detail="Send text/csv or application/x-ndjson (or ?format=csv|jsonl)")
+    agent = _get_agent()
+    return await run_in_threadpool(_run_bulk_intake, agent, _body_lines(request.stream()), fmt, db, notify)
+
+
 @router.get("/patient/{patient_id}")
 def get_patient(patient_id: str, db: Session = Depends(get_db)) -> dict:
     """Hasta kaydını getirir."""
-    record = agent.get_patient(patient_id, db=db)
+    record = _get_agent().get_patient(patient_id, db=db)
     if not record:
         raise HTTPException(status_code=404, detail=f"Patient {patient_id} not found")
     return record
@@ -97,26 +333,67 @@ def get_patient(patient_id: str, db: Session = Depends(get_db)) -> dict:
 @router.patch("/patient/status")
 def update_patient_status(body: StatusUpdateBody, db: Session = Depends(get_db), _user=Depends(get_current_user)) -> dict:
     """Hasta durumunu günceller (requires authentication)."""
-    return agent.update_status(body.patient_id, body.new_status, db=db)
+    return _get_agent().update_status(body.patient_id, body.new_status, db=db)
 
 
 @router.get("/patients")
-def list_patients(status: Optional[str] = None, db: Session = Depends(get_db)) -> dict:
-    """Hasta listesi (isteğe bağlı status filtresi)."""
-    patients = agent.list_patients(status_filter=status, db=db)
-    return {"total": len(patients), "patients": patients}
+def list_patients(
+    status: Optional[str] = None,
+    category: Optional[str] = Query(None, description="procedure_category, e.g. aesthetic"),
+    hospital_id: Optional[str] = Query(None, description="matched_hospital_id"),
+    created_from: Optional[datetime] = Query(None, description="Inclusive lower bound on created_at"),
+    created_to: Optional[datetime] = Query(None, description="Exclusive upper bound on created_at"),
+    cursor: Optional[str] = Query(None, description="Patient ID — return patients created before it (next_cursor)"),
+    limit: int = Query(PATIENTS_PAGE_DEFAULT, ge=1, le=PATIENTS_PAGE_MAX),
+    fields: Optional[str] = Query(None, description="Comma-separated subset of record keys; patient_id always included"),
+    db: Session = Depends(get_db),
+) -> dict:
+    """
+    Hasta listesi, en yeniden eskiye — keyset sayfalı.
+    Sonraki sayfa: cursor=next_cursor (has_more=false olana kadar).
+    """
+    selected = None
+    if fields:
+        selected = ["patient_id"] + [f for f in dict.fromkeys(f.strip() for f in fields.split(",")) if f and f != "patient_id"]
+        unknown = [f for f in selected if f not in PATIENT_FIELD_COLUMNS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(PATIENT_FIELD_COLUMNS)})",
+            )
+
+    agent = _get_agent()
+    anchor = None
+    if cursor:
+        anchor = agent.patient_cursor(cursor, db=db)
+        if anchor is None:
+            raise HTTPException(status_code=400, detail=f"Unknown patients cursor: {cursor}")
+
+    patients = agent.list_patients(
+        status_filter=status, db=db, category=category, hospital_id=hospital_id,
+        created_from=created_from, created_to=created_to,
+        cursor=anchor, limit=limit + 1, fields=selected,
+    )
+    has_more = len(patients) > limit
+    patients = patients[:limit]
+    return {
+        "total": len(patients),
+        "patients": patients,
+        "has_more": has_more,
+        "next_cursor": patients[-1]["patient_id"] if has_more else None,
+    }
 
 
 @router.get("/commission/summary")
 def commission_summary(db: Session = Depends(get_db)) -> dict:
     """Komisyon pipeline özetini döndürür."""
-    return agent.get_commission_summary(db=db)
+    return _get_agent().get_commission_summary(db=db)
 
 
 @router.get("/hospitals")
 def list_hospitals(db: Session = Depends(get_db)) -> dict:
     """Partner hastane listesi."""
-    hospitals = agent.get_hospitals(db=db)
+    hospitals = _get_agent().get_hospitals(db=db)
     return {"total": len(hospitals), "hospitals": hospitals}
 
 
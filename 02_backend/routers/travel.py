@@ -8,7 +8,7 @@ import sys
 import uuid
 from datetime import datetime
 from pathlib import Path
-from typing import Optional, Literal
+from typing import TYPE_CHECKING, Optional, Literal
 
 from fastapi import APIRouter, Depends, HTTPException, Request
 from pydantic import BaseModel, Field, model_validator
@@ -22,10 +22,20 @@ logger = logging.getLogger("thaiturk.travel")
 
 # Agent path
 sys.path.insert(0, str(Path(__file__).parent.parent.parent / "04_ai_agents"))
-from agents.travel_agent import TravelAgent  # noqa: E402
+from agents.registry import get_agent  # noqa: E402
+
+if TYPE_CHECKING:
+    from agents.travel_agent import TravelAgent
 
 router = APIRouter(prefix="/api/travel", tags=["Travel"])
-agent = TravelAgent()
+
+
+def _get_agent() -> TravelAgent:
+    """Orchestrator ile paylaşılan TravelAgent — ilk kullanımda kurulur."""
+    agent = get_agent("travel")
+    if agent is None:
+        raise HTTPException(status_code=503, detail="Travel agent not available")
+    return agent
 
 
 # ---------------------------------------------------------------------------
@@ -96,7 +106,7 @@ def travel_options(body: TravelRequestBody, request: Request, db: Session = Depe
 
     # Route through TravelAgent
     try:
-        result = agent.process_request({
+        result = _get_agent().process_request({
             "request_id": request_id,
             "full_name": body.full_name,
             "phone": body.phone,
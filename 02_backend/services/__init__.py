@@ -0,0 +1 @@
+# AntiGravity ThaiTurk — Service package
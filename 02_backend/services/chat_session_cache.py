@@ -0,0 +1,148 @@
+"""
+AntiGravity Ventures — Chat Session Cache
+Aktif sohbetlerin (oturum + özetlenmemiş mesajlar) process içi LRU/TTL önbelleği.
+
+Write-through: DB commit'i başarılı olduktan sonra aynı değişiklik önbelleğe de
+uygulanır; önbellek hiçbir zaman DB'de olmayan bir şey içermez. Bir sohbet turu
+önbellekte isabet ederse ChatSession ve geçmiş SELECT'leri atlanır (DB_READS_PER_HIT).
+
+Process başınadır ve process'ler arası geçersizleme yoktur: birden fazla worker ile
+aynı oturum farklı process'lere düşer, bir process'in kaydı diğerinin yazdığı turları
+görmez. Bu yüzden varsayılan olarak kapalıdır (CHAT_SESSION_CACHE_SIZE=0); yalnızca
+tek process'li deploy'lar (örn. railway.json'daki tek uvicorn) açıkça etkinleştirir.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, replace
+from typing import Any, Optional
+
+DEFAULT_MAX_SESSIONS = int(os.getenv("CHAT_SESSION_CACHE_SIZE", "0"))
+DEFAULT_TTL_SECONDS = float(os.getenv("CHAT_SESSION_CACHE_TTL", "1800"))
+
+# İsabet başına atlanan okuma: ChatSession lookup + özetlenmemiş geçmiş sorgusu
+DB_READS_PER_HIT = 2
+
+
+@dataclass(frozen=True)
+class CachedSession:
+    """Bir sohbet turunun ihtiyaç duyduğu oturum durumu (değiştirilemez anlık görüntü)."""
+    session_id: str
+    language: str
+    user_name: Optional[str]
+    summary: Optional[str]
+    summary_message_count: int
+    summary_through: Optional[str]         # özete katlanan son mesajın id'si (keyset sınırı)
+    messages: tuple[dict[str, Any], ...]   # özetlenmemiş mesajlar, eskiden yeniye
+    message_ids: tuple[str, ...]           # messages ile aynı sırada ChatMessage.message_id
+
+
+class ChatSessionCache:
+    """Thread-safe LRU + TTL; her kayıt son erişimden `ttl_seconds` sonra düşer."""
+
+    def __init__(self, max_sessions: int = DEFAULT_MAX_SESSIONS, ttl_seconds: float = DEFAULT_TTL_SECONDS) -> None:
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[str, tuple[float, CachedSession]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_sessions > 0
+
+    def get(self, session_id: str) -> CachedSession | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, session = entry
+            if expires_at <= now:
+                del self._entries[session_id]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries[session_id] = (now + self.ttl_seconds, session)
+            self._entries.move_to_end(session_id)
+            self.hits += 1
+            return session
+
+    def put_if_absent(self, session: CachedSession) -> None:
+        """DB'den yüklenen durumu ekler; eşzamanlı bir tur önce eklediyse onunkini korur."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if session.session_id in self._entries:
+                return
+            self._entries[session.session_id] = (time.monotonic() + self.ttl_seconds, session)
+            while len(self._entries) > self.max_sessions:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def append(
+        self,
+        session_id: str,
+        messages: list[dict[str, Any]],
+        message_ids: list[str],
+        folded: int = 0,
+        summary: Optional[str] = None,
+    ) -> None:
+        """
+        Commit edilmiş mesajları (ve id'lerini) ekler; `folded` > 0 ise en eski `folded`
+        mesaj özete katlanmıştır ve listeden düşer, sonuncusu yeni keyset sınırı olur.
+        Kayıt yoksa (çıkarılmış) hiçbir şey yapmaz.
+        """
+        with self._lock:
+            entry = self._entries.get(session_id)
+            if entry is None:
+                return
+            expires_at, session = entry
+            ids = (*session.message_ids, *message_ids)
+            updated = replace(
+                session,
+                messages=(*session.messages, *messages)[folded:],
+                message_ids=ids[folded:],
+            )
+            if folded:
+                updated = replace(
+                    updated,
+                    summary=summary,
+                    summary_message_count=session.summary_message_count + folded,
+                    summary_through=ids[folded - 1],
+                )
+            self._entries[session_id] = (expires_at, updated)
+
+    def invalidate(self, session_id: str) -> None:
+        with self._lock:
+            if self._entries.pop(session_id, None) is not None:
+                self.invalidations += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "size": len(self._entries),
+                "max_sessions": self.max_sessions,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "db_reads_saved": self.hits * DB_READS_PER_HIT,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
+# Process geneli tek örnek — chat router'ı ve admin endpoint'i paylaşır
+session_cache = ChatSessionCache()
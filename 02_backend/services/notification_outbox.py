@@ -0,0 +1,301 @@
+"""
+AntiGravity Ventures — Notification Outbox Worker
+notification_outbox tablosunu arka planda boşaltır: MedicalAgent.process_intake bildirimleri
+Patient satırıyla aynı transaction'da kuyruğa yazar, teslimatı bu worker yapar — intake
+süresi WhatsApp / Telegram / LINE API gecikmesinden bağımsızdır.
+
+Döngü (uygulamanın event loop'unda tek asyncio task):
+  1. claim  — teslim zamanı gelmiş en fazla NOTIFY_OUTBOX_BATCH satır; Postgres'te
+              FOR UPDATE SKIP LOCKED → birden çok process aynı satırı almaz. Satır
+              "sending" olur, attempts artar, next_attempt_at = şimdi + kira süresi.
+  2. send   — NotificationService.send; kanal başına eşzamanlılık sınırı (semaphore).
+              Kanal slotu alınınca satırın kirası yenilenir: batch'in tamamı tek kirayla
+              gönderilemeyebilir (50 satır / telegram=4 × 10 s HTTP timeout ≈ 130 s). Kanal
+              kuyruğunda beklerken kirası dolup başka process'e geçen satır gönderilmez.
+  3. record — satır başına, gönderimin hemen ardından: sent / skipped (kanal yapılandırılmamış)
+              / failed (kalıcı 4xx ya da deneme hakkı bitti) / pending + üstel geri
+              çekilme (5xx, 429, ağ hatası). Kira tek bir gönderimi kapsaması yeterli.
+
+Process gönderim sırasında ölürse satır "sending" kalır; kira dolunca yeniden alınır.
+Teslimat en az bir kez garantilidir — sağlayıcı API'leri idempotency anahtarı kabul
+etmediğinden gönderim ile kayıt arasındaki bir çökme tek bir tekrar gönderim üretebilir.
+Aynı bildirimin iki kez kuyruğa alınmasını dedupe_key (unique) engeller.
+"""
+from __future__ import annotations
+
+import asyncio
+import logging
+import os
+import random
+import sys
+import threading
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Optional
+
+from sqlalchemy import func, select, update
+from sqlalchemy.orm import Session
+
+from database.connection import SessionLocal
+from database.models import NotificationOutbox
+
+_skills_path = Path(__file__).parent.parent.parent / "04_ai_agents" / "skills"
+if str(_skills_path) not in sys.path:
+    sys.path.insert(0, str(_skills_path))
+
+from notification import NotificationService  # noqa: E402
+
+logger = logging.getLogger("thaiturk.notification_outbox")
+
+BATCH_SIZE = int(os.getenv("NOTIFY_OUTBOX_BATCH", "50"))
+POLL_SECONDS = float(os.getenv("NOTIFY_OUTBOX_POLL", "1.0"))
+LEASE_SECONDS = float(os.getenv("NOTIFY_OUTBOX_LEASE", "60"))
+MAX_ATTEMPTS = int(os.getenv("NOTIFY_MAX_ATTEMPTS", "6"))
+BACKOFF_BASE_SECONDS = float(os.getenv("NOTIFY_BACKOFF_BASE", "5"))
+BACKOFF_MAX_SECONDS = float(os.getenv("NOTIFY_BACKOFF_MAX", "900"))
+SHUTDOWN_GRACE_SECONDS = float(os.getenv("NOTIFY_SHUTDOWN_GRACE", "10"))
+
+# Kanal başına eşzamanlı gönderim (sağlayıcı hız sınırları: Telegram bot ~30 mesaj/sn)
+CHANNEL_CONCURRENCY: dict[str, int] = {
+    "whatsapp": int(os.getenv("NOTIFY_CONCURRENCY_WHATSAPP", "8")),
+    "telegram": int(os.getenv("NOTIFY_CONCURRENCY_TELEGRAM", "4")),
+    "line": int(os.getenv("NOTIFY_CONCURRENCY_LINE", "8")),
+}
+DEFAULT_CHANNEL_CONCURRENCY = 2
+
+DUE_STATUSES = ("pending", "sending")
+# Tekrar denemenin anlamsız olduğu sonuçlar → skipped
+_SKIP_REASONS = {"not_configured", "unknown_channel"}
+
+
+@dataclass(frozen=True)
+class OutboxItem:
+    """Claim edilmiş satırın gönderim için gereken kopyası (ORM nesnesi thread'ler arası taşınmaz)."""
+    id: int
+    dedupe_key: str
+    channel: str
+    recipient: str
+    message: str
+    language: str
+    attempts: int
+
+
+def backoff_seconds(attempts: int) -> float:
+    """attempts. başarısız denemeden sonraki bekleme: base · 2^(n-1), tavanlı, ±20% jitter."""
+    delay = min(BACKOFF_MAX_SECONDS, BACKOFF_BASE_SECONDS * 2 ** max(attempts - 1, 0))
+    return delay * random.uniform(0.8, 1.2)
+
+
+def classify_result(result: dict) -> tuple[str, Optional[str]]:
+    """NotificationService sonucu → (sent | skipped | retry | failed, hata)."""
+    if result.get("sent"):
+        return "sent", None
+    if result.get("reason") in _SKIP_REASONS:
+        return "skipped", result["reason"]
+    status_code = result.get("status_code")
+    error = f"{status_code or ''} {result.get('error') or result.get('reason') or 'send failed'}".strip()
+    # 4xx (429 hariç) → istek hatalı, tekrar denemek aynı sonucu verir
+    if status_code and 400 <= status_code < 500 and status_code != 429:
+        return "failed", error
+    return "retry", error
+
+
+class OutboxWorker:
+    """Tek asyncio task; start() lifespan'de, stop() kapanışta — uçuştaki gönderimler tamamlanır."""
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session] = SessionLocal,
+        notifier: Optional[NotificationService] = None,
+        batch_size: int = BATCH_SIZE,
+        poll_seconds: float = POLL_SECONDS,
+    ) -> None:
+        self.session_factory = session_factory
+        self.notifier = notifier or NotificationService()
+        self.batch_size = batch_size
+        self.poll_seconds = poll_seconds
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Event] = None
+        self._stopping = False
+        self._semaphores: dict[str, asyncio.Semaphore] = {}
+        self._lock = threading.Lock()
+        self.counters = {
+            "claimed": 0, "sent": 0, "skipped": 0, "retried": 0, "failed": 0, "lease_lost": 0, "errors": 0,
+        }
+
+    @property
+    def running(self) -> bool:
+        return self._task is not None and not self._task.done()
+
+    # ------------------------------------------------------------------
+    # Lifecycle
+    # ------------------------------------------------------------------
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._wakeup = asyncio.Event()
+        self._stopping = False
+        self._task = self._loop.create_task(self._run(), name="notification-outbox")
+        logger.info(f"Notification outbox worker started (batch={self.batch_size}, poll={self.poll_seconds}s)")
+
+    async def stop(self) -> None:
+        if not self.running:
+            return
+        self._stopping = True
+        self._wakeup.set()
+        try:
+            await asyncio.wait_for(self._task, timeout=SHUTDOWN_GRACE_SECONDS)
+        except asyncio.TimeoutError:
+            # Kalan "sending" satırlar kira dolunca bir sonraki process tarafından yeniden alınır
+            logger.warning("Notification outbox worker did not drain in time — in-flight rows retry after lease")
+        self._task = None
+
+    def wake(self) -> None:
+        """Yeni satır yazıldı — bir sonraki poll'u beklemeden boşalt. Herhangi bir thread'den çağrılabilir."""
+        if self._loop is not None and self._wakeup is not None and not self._loop.is_closed():
+            self._loop.call_soon_threadsafe(self._wakeup.set)
+
+    # ------------------------------------------------------------------
+    # Loop
+    # ------------------------------------------------------------------
+
+    async def _run(self) -> None:
+        while not self._stopping:
+            idle = self.poll_seconds
+            # Claim'den önce — döngü sırasında gelen wake() bir sonraki beklemeyi kısaltır, kaybolmaz
+            self._wakeup.clear()
+            try:
+                claimed = await asyncio.to_thread(self._claim)
+                if claimed:
+                    await asyncio.gather(*(self._process(item) for item in claimed))
+                    if len(claimed) == self.batch_size:
+                        continue   # kuyruk dolu — beklemeden devam
+            except Exception as e:
+                self._count("errors")
+                logger.error(f"Notification outbox cycle failed: {type(e).__name__}: {e}")
+                idle = max(self.poll_seconds, BACKOFF_BASE_SECONDS)   # DB erişilemiyorsa log seli yok
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), timeout=idle)
+            except asyncio.TimeoutError:
+                pass
+
+    def _claim(self) -> list[OutboxItem]:
+        now = datetime.now(timezone.utc)
+        with self.session_factory() as db:
+            stmt = (
+                select(NotificationOutbox)
+                .where(NotificationOutbox.status.in_(DUE_STATUSES), NotificationOutbox.next_attempt_at <= now)
+                .order_by(NotificationOutbox.next_attempt_at)
+                .limit(self.batch_size)
+            )
+            if db.get_bind().dialect.name == "postgresql":
+                stmt = stmt.with_for_update(skip_locked=True)
+            items = []
+            for row in db.scalars(stmt):
+                row.status = "sending"
+                row.attempts += 1
+                row.next_attempt_at = now + timedelta(seconds=LEASE_SECONDS)
+                items.append(OutboxItem(
+                    row.id, row.dedupe_key, row.channel, row.recipient, row.message, row.language, row.attempts,
+                ))
+            db.commit()
+        self._count("claimed", len(items))
+        return items
+
+    def _renew_lease(self, item: OutboxItem) -> bool:
+        """Gönderim başlarken satırın kirasını yeniler; satır artık bu claim'e ait değilse False."""
+        with self.session_factory() as db:
+            renewed = db.execute(
+                update(NotificationOutbox)
+                .where(NotificationOutbox.id == item.id, NotificationOutbox.status == "sending",
+                       NotificationOutbox.attempts == item.attempts)
+                .values(next_attempt_at=datetime.now(timezone.utc) + timedelta(seconds=LEASE_SECONDS))
+            ).rowcount
+            db.commit()
+        return bool(renewed)
+
+    async def _process(self, item: OutboxItem) -> None:
+        # Sonuç gönderimden hemen sonra yazılır — batch'in geri kalanını beklerken kira dolmaz
+        result = await self._deliver(item)
+        if result is not None:
+            await asyncio.to_thread(self._record, [(item, result)])
+
+    async def _deliver(self, item: OutboxItem) -> Optional[dict]:
+        """Gönderim sonucu; kira kaybedildiyse None (satır başka process'te, gönderilmez ve kaydedilmez)."""
+        semaphore = self._semaphores.get(item.channel)
+        if semaphore is None:
+            limit = CHANNEL_CONCURRENCY.get(item.channel, DEFAULT_CHANNEL_CONCURRENCY)
+            semaphore = self._semaphores[item.channel] = asyncio.Semaphore(limit)
+        async with semaphore:
+            if not await asyncio.to_thread(self._renew_lease, item):
+                self._count("lease_lost")
+                logger.warning(f"Notification {item.dedupe_key} lease expired before send — skipped")
+                return None
+            try:
+                return await self.notifier.send(item.channel, item.recipient, item.message, item.language)
+            except Exception as e:
+                return {"sent": False, "channel": item.channel, "error": f"{type(e).__name__}: {e}"}
+
+    def _record(self, outcomes: list[tuple[OutboxItem, dict]]) -> None:
+        now = datetime.now(timezone.utc)
+        with self.session_factory() as db:
+            for item, result in outcomes:
+                outcome, error = classify_result(result)
+                if outcome == "retry" and item.attempts >= MAX_ATTEMPTS:
+                    outcome = "failed"
+                values: dict = {"last_error": error}
+                if outcome == "sent":
+                    values.update(status="sent", sent_at=now)
+                elif outcome == "retry":
+                    values.update(status="pending", next_attempt_at=now + timedelta(seconds=backoff_seconds(item.attempts)))
+                else:
+                    values.update(status=outcome)
+                # Yalnızca hâlâ bu claim'e aitse — kira gönderim başında yenilendi, gönderim kiradan kısa
+                db.execute(
+                    update(NotificationOutbox)
+                    .where(NotificationOutbox.id == item.id, NotificationOutbox.status == "sending",
+                           NotificationOutbox.attempts == item.attempts)
+                    .values(**values)
+                )
+                self._count({"retry": "retried"}.get(outcome, outcome))
+                if outcome == "failed":
+                    logger.warning(f"Notification {item.dedupe_key} failed after {item.attempts} attempts: {error}")
+            db.commit()
+
+    # ------------------------------------------------------------------
+    # Stats
+    # ------------------------------------------------------------------
+
+    def _count(self, key: str, n: int = 1) -> None:
+        with self._lock:
+            self.counters[key] += n
+
+    def stats(self) -> dict:
+        """Worker sayaçları + tablodaki durum dağılımı (kuyruk derinliği)."""
+        with self._lock:
+            counters = dict(self.counters)
+        with self.session_factory() as db:
+            by_status = dict(db.execute(
+                select(NotificationOutbox.status, func.count()).group_by(NotificationOutbox.status)
+            ).all())
+            oldest_due = db.scalar(
+                select(func.min(NotificationOutbox.next_attempt_at))
+                .where(NotificationOutbox.status.in_(DUE_STATUSES))
+            )
+        return {
+            "running": self.running,
+            "batch_size": self.batch_size,
+            "channel_concurrency": CHANNEL_CONCURRENCY,
+            "max_attempts": MAX_ATTEMPTS,
+            "lease_seconds": LEASE_SECONDS,
+            **counters,
+            "queue": by_status,
+            "oldest_due_at": oldest_due.isoformat() if oldest_due else None,
+        }
+
+
+outbox_worker = OutboxWorker()
@@ -0,0 +1,47 @@
+"""
+/api/chat/history keyset sorgularının Postgres planı — benchmarks/chat_history_plan.py ile
+aynı veri ve sorgular (uzun bir thread + çok sayıda kısa oturum, ROLLBACK ile geri alınır).
+
+DATABASE_URL bir Postgres'i göstermiyorsa ya da bağlanılamıyorsa atlanır:
+    cd 02_backend && alembic upgrade head
+    DATABASE_URL=postgresql://localhost/thaiturk python -m pytest tests
+"""
+from __future__ import annotations
+
+import os
+import sys
+from pathlib import Path
+
+import pytest
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "04_ai_agents"))
+
+
+@pytest.fixture(scope="module")
+def plans() -> dict:
+    if not os.getenv("DATABASE_URL", "").startswith(("postgres://", "postgresql")):
+        pytest.skip("DATABASE_URL does not point at Postgres")
+    # engine DATABASE_URL'den import anında kurulur — yalnızca Postgres varken import edilir
+    from benchmarks.chat_history_plan import INDEX_NAME, run
+    from database.connection import engine
+
+    try:
+        with engine.connect() as connection:
+            installed = connection.scalar(
+                text("SELECT 1 FROM pg_indexes WHERE indexname = :name"), {"name": INDEX_NAME}
+            )
+    except OperationalError as e:
+        pytest.skip(f"Postgres unreachable: {e.orig}")
+    assert installed, f"{INDEX_NAME} missing — run `alembic upgrade head` (migration 004)"
+    return run(sessions=2000, per_session=20, long_messages=50000)
+
+
+@pytest.mark.parametrize("query", ["newest_page", "before_cursor", "after_cursor", "export_batch"])
+def test_history_page_uses_composite_index(plans: dict, query: str) -> None:
+    plan = plans[query]
+    assert plan["index"], f"{query} does not use {INDEX_NAME}: {plan['nodes']}"
+    assert "Seq Scan" not in plan["nodes"], f"{query}: {plan['nodes']}"
+    assert "Sort" not in plan["nodes"], f"{query}: {plan['nodes']}"
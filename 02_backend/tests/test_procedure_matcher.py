@@ -0,0 +1,77 @@
+"""
+MedicalAgent._classify_procedure regresyonu (agents/procedure_matcher.py) — kelime sınırı,
+çekim ekleri, en uzun eşleşme ve başka kelimelerin içinde geçen kısa kökler.
+Eski substring taramasının hataları ve yanlış pozitifler (OTHER beklenen örnekler) dahil.
+
+    cd 02_backend && python -m pytest -q tests
+"""
+from __future__ import annotations
+
+import sys
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "04_ai_agents"))
+
+from agents.procedure_matcher import matcher_for  # noqa: E402
+
+OTHER = "other"
+
+# (metin, kategori, dil)
+PROCEDURE_CASES: list[tuple[str, str, str]] = [
+    ("I'm interested in a hair transplant with the FUE technique", "hair", "en"),
+    ("Hair transplant and dental veneers, which clinic do you suggest?", "hair", "en"),
+    ("Price for dental implants, full mouth", "dental", "en"),
+    ("Looking for a nose job (rhinoplasty)", "aesthetic", "en"),
+    ("Breast augmentation with silicone implants", "aesthetic", "en"),
+    ("Chemotherapy options for breast cancer", "oncology", "en"),
+    ("Laser eye surgery for short-sightedness", "ophthalmology", "en"),
+    ("Gastric sleeve for weight loss", "bariatric", "en"),
+    ("IVF treatment with egg freezing", "ivf", "en"),
+    ("Full health check-up package for two", "checkup", "en"),
+    ("Tummy tuck after pregnancy", "aesthetic", "en"),
+    ("How much is an eyebrow transplant?", "hair", "en"),
+    ("Is the plastic surgeon certified?", "aesthetic", "en"),
+    ("My wife needs a wheelchair at the airport", OTHER, "en"),
+    ("The flight lands at 10, is the transfer included?", OTHER, "en"),
+    ("Saç ekimi için fiyat alabilir miyim?", "hair", "tr"),
+    ("Saçlarım dökülüyor, saç ekimi düşünüyorum", "hair", "tr"),
+    ("Dişlerime zirkon kaplama yaptırmak istiyorum", "dental", "tr"),
+    ("Dişlerimi yaptırmak istiyorum", "dental", "tr"),
+    ("Burun estetiği (rinoplasti) yaptırmak istiyorum", "aesthetic", "tr"),
+    ("Tüp bebek tedavisi hakkında bilgi", "ivf", "tr"),
+    ("Göz lazer ameliyatı fiyatı nedir?", "ophthalmology", "tr"),
+    ("Meme kanseri tedavisi için hastane arıyoruz", "oncology", "tr"),
+    ("Obezite ameliyatı (tüp mide) düşünüyorum", "bariatric", "tr"),
+    ("İmplant tedavisi kaç gün sürer?", "dental", "tr"),
+    ("Türkiye dışından geliyoruz, havalimanı transferi lazım", OTHER, "tr"),
+    ("Хочу сделать ринопластику носа", "aesthetic", "ru"),
+    ("Сколько стоит перенос даты поездки?", OTHER, "ru"),
+    ("Пересадка волос методом FUE", "hair", "ru"),
+    ("Импланты зубов под ключ", "dental", "ru"),
+    ("Нужна имплантация зубов", "dental", "ru"),
+    ("Лечение рака груди в Стамбуле", "oncology", "ru"),
+    ("Увеличение груди, какие импланты используете?", "aesthetic", "ru"),
+    ("Процедура ЭКО в Турции", "ivf", "ru"),
+    ("Билеты эконом-класса до Стамбула", OTHER, "ru"),
+    ("Лазерная коррекция зрения", "ophthalmology", "ru"),
+    ("Пришлите документы о браке", OTHER, "ru"),
+    ("Насколько безопасность клиники проверена?", OTHER, "ru"),
+    ("土耳其LASIK激光眼科手术", "ophthalmology", "zh"),
+    # Latin kısa kökler başka kelimelerin içinde eşleşmez, çoğul eki serbest
+    ("Do you sell skinny jeans at the airport?", OTHER, "en"),
+    ("My hairline photo is attached, which hotel is closest?", OTHER, "en"),
+    ("Can you check my eyes before the flight?", "ophthalmology", "en"),
+    ("Dark spots on my skin after the sun", "dermatology", "en"),
+]
+
+
+def classify(text: str) -> str:
+    hit = matcher_for().match(text)
+    return hit[0] if hit else OTHER
+
+
+@pytest.mark.parametrize(("text", "expected", "language"), PROCEDURE_CASES)
+def test_classify_procedure(text: str, expected: str, language: str) -> None:
+    assert classify(text) == expected
@@ -4,12 +4,20 @@ Claude API-powered conversational AI with tool-use for medical tourism.
 """
 from __future__ import annotations
 
+import asyncio
+import functools
 import json
 import logging
 import os
+import time
 import uuid
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 from datetime import datetime, date
-from typing import Any
+from typing import Any, Iterator
+
+from agents.chat_context import SUMMARY_SYSTEM_PROMPT, summary_request
+from agents.intake_transport import get_intake_transport
+from agents.tool_cache import tool_cache, watch_hospitals
 
 logger = logging.getLogger("thaiturk.chat_agent")
 
@@ -21,17 +29,20 @@ except ImportError:
 
 # ---------------------------------------------------------------------------
 # System Prompt (all business data injected)
+#
+# İki parça: istekten bağımsız statik önek (kimlik, iş verisi, kurallar) ve
+# küçük oturum soneki (dil, tarih, kullanıcı adı). Önek byte-byte sabit kalır ki
+# TOOLS ile birlikte prompt cache'ten okunabilsin — değişken hiçbir şey öneke
+# girmemeli, yoksa her istek cache'i kaçırır.
 # ---------------------------------------------------------------------------
 
-SYSTEM_PROMPT_TEMPLATE = """You are the AI Medical Secretary for AntiGravity Medical, a premium medical tourism platform coordinating treatments between Phuket (Thailand) and Turkey.
+SYSTEM_PROMPT_STATIC = """You are the AI Medical Secretary for AntiGravity Medical, a premium medical tourism platform coordinating treatments between Phuket (Thailand) and Turkey.
 
 ## Your Identity
 - Name: AntiGravity Medical Assistant
 - Role: Medical Tourism Secretary & Coordinator
 - Tone: Professional, warm, trustworthy. Never casual or overly enthusiastic.
-- Always respond in the user's language: {language}
-- Current date: {current_date}
-{user_name_line}
+- Always respond in the user's language (see Session Context below)
 
 ## Core Business Data
 
@@ -106,6 +117,26 @@ Turkey, Russia, UAE, Europe, Asia — 6 languages: RU, TR, EN, TH, AR, ZH
 - Always end with a follow-up question or clear call to action
 """
 
+SYSTEM_PROMPT_SESSION_TEMPLATE = """## Session Context
+- User's language: {language}
+- Current date: {current_date}
+"""
+
+# Cache breakpoint'leri: TOOLS'un sonu ve statik system bloğu. Cache sırası
+# tools → system → messages olduğundan ikinci breakpoint ikisini birden kapsar.
+_CACHE_CONTROL = {"type": "ephemeral"}
+SYSTEM_PROMPT_STATIC_BLOCK: dict[str, Any] = {
+    "type": "text",
+    "text": SYSTEM_PROMPT_STATIC,
+    "cache_control": _CACHE_CONTROL,
+}
+
+
+@functools.lru_cache(maxsize=64)
+def _session_context(language: str, current_date: str) -> str:
+    """Oturum soneki — (dil, tarih) başına bir kez format edilir."""
+    return SYSTEM_PROMPT_SESSION_TEMPLATE.format(language=language, current_date=current_date)
+
 # ---------------------------------------------------------------------------
 # Tool Definitions (Claude tool-use schema)
 # ---------------------------------------------------------------------------
@@ -187,6 +218,9 @@ TOOLS: list[dict[str, Any]] = [
     },
 ]
 
+# Son tool'a cache breakpoint eklenmiş kopya — API çağrılarında bu kullanılır.
+CACHED_TOOLS: list[dict[str, Any]] = [*TOOLS[:-1], {**TOOLS[-1], "cache_control": _CACHE_CONTROL}]
+
 # ---------------------------------------------------------------------------
 # Static Data for Tool Execution
 # ---------------------------------------------------------------------------
@@ -245,6 +279,8 @@ def _search_hospitals_from_db(args: dict[str, Any]) -> str:
         from database.connection import SessionLocal
         from database.models import Hospital
 
+        watch_hospitals(Hospital)  # hospitals commit → cached searches dropped
+        generation = tool_cache.generation("search_hospitals")
         db = SessionLocal()
         try:
             query = db.query(Hospital).filter(Hospital.active == True)
@@ -255,8 +291,10 @@ def _search_hospitals_from_db(args: dict[str, Any]) -> str:
                 query = query.filter(Hospital.country.ilike(args["country"]))
             results = query.all()
             if not results:
-                return json.dumps({"found": 0, "message": "No hospitals match the criteria. We can still help."})
-            return json.dumps({
+                return tool_cache.put("search_hospitals", args, json.dumps(
+                    {"found": 0, "message": "No hospitals match the criteria. We can still help."}
+                ), generation)
+            return tool_cache.put("search_hospitals", args, json.dumps({
                 "found": len(results),
                 "hospitals": [
                     {"name": h.name, "city": h.city, "country": h.country,
@@ -266,7 +304,7 @@ def _search_hospitals_from_db(args: dict[str, Any]) -> str:
                      "languages": h.languages or []}
                     for h in results
                 ],
-            })
+            }), generation)
         finally:
             db.close()
     except Exception as e:
@@ -296,37 +334,26 @@ def _search_hospitals_from_db(args: dict[str, Any]) -> str:
 
 
 def _submit_patient_inquiry_to_backend(args: dict[str, Any]) -> str:
-    """Submit patient inquiry to the real medical intake API."""
+    """Submit patient inquiry through the registered intake transport (in-process inside the backend)."""
     try:
-        import httpx
-        port = os.getenv("PORT", "8000")
-        response = httpx.post(
-            f"http://localhost:{port}/api/medical/intake",
-            json={
-                "full_name": args.get("full_name", "Chat Patient"),
-                "phone": args.get("phone", "+0000000000"),
-                "language": args.get("language", "en"),
-                "procedure_interest": args.get("procedure_interest", ""),
-                "urgency": args.get("urgency", "routine"),
-                "budget_usd": args.get("budget_usd"),
-                "notes": args.get("notes", "Submitted via AI chat"),
-                "referral_source": "chatbot",
-            },
-            timeout=10.0,
-        )
-        if response.status_code == 200:
-            data = response.json()
-            return json.dumps({
-                "success": True,
-                "reference_id": data.get("patient_id", f"INQ-{uuid.uuid4().hex[:8].upper()}"),
-                "patient_name": args.get("full_name"),
-                "procedure": args.get("procedure_interest"),
-                "matched_hospital": data.get("matched_hospital", {}).get("name") if data.get("matched_hospital") else None,
-                "message": f"Inquiry submitted successfully. Our WhatsApp coordinator will contact the patient within 5 minutes.",
-            })
-        else:
-            logger.warning(f"Intake API returned {response.status_code}: {response.text}")
-            raise Exception(f"API error {response.status_code}")
+        data = get_intake_transport().submit({
+            "full_name": args.get("full_name", "Chat Patient"),
+            "phone": args.get("phone", "+0000000000"),
+            "language": args.get("language", "en"),
+            "procedure_interest": args.get("procedure_interest", ""),
+            "urgency": args.get("urgency", "routine"),
+            "budget_usd": args.get("budget_usd"),
+            "notes": args.get("notes", "Submitted via AI chat"),
+            "referral_source": "chatbot",
+        })
+        return json.dumps({
+            "success": True,
+            "reference_id": data.get("patient_id", f"INQ-{uuid.uuid4().hex[:8].upper()}"),
+            "patient_name": args.get("full_name"),
+            "procedure": args.get("procedure_interest"),
+            "matched_hospital": data.get("matched_hospital", {}).get("name") if data.get("matched_hospital") else None,
+            "message": f"Inquiry submitted successfully. Our WhatsApp coordinator will contact the patient within 5 minutes.",
+        })
     except Exception as e:
         logger.warning(f"Backend intake call failed, using stub: {e}")
         ref_id = f"INQ-{uuid.uuid4().hex[:8].upper()}"
@@ -341,6 +368,9 @@ def _submit_patient_inquiry_to_backend(args: dict[str, Any]) -> str:
 
 def _execute_tool(name: str, args: dict[str, Any]) -> str:
     """Execute a tool call and return result as string."""
+    cached = tool_cache.get(name, args)
+    if cached is not None:
+        return cached
 
     if name == "search_hospitals":
         return _search_hospitals_from_db(args)
@@ -349,13 +379,13 @@ def _execute_tool(name: str, args: dict[str, Any]) -> str:
         proc = args.get("procedure", "").lower()
         if proc in PRICING:
             info = PRICING[proc]
-            return json.dumps({
+            return tool_cache.put(name, args, json.dumps({
                 "procedure": proc,
                 "turkey_price_range": info["turkey_range"],
                 "savings_vs_usa": info["savings"],
                 "includes": info["includes"],
                 "note": "Final pricing determined after free consultation. All-inclusive packages available.",
-            })
+            }))
         return json.dumps({"error": f"Unknown procedure '{proc}'. Available: {', '.join(PRICING.keys())}"})
 
     elif name == "submit_patient_inquiry":
@@ -390,6 +420,71 @@ def _execute_tool(name: str, args: dict[str, Any]) -> str:
     return json.dumps({"error": f"Unknown tool: {name}"})
 
 
+# ---------------------------------------------------------------------------
+# Parallel Tool Runner
+# ---------------------------------------------------------------------------
+
+# Tool başına süre sınırı (s) — havuz kuyruğunda bekleme dahil, blok gönderildiği andan itibaren
+TOOL_TIMEOUTS: dict[str, float] = {
+    "search_hospitals": 5.0,
+    "get_procedure_pricing": 1.0,
+    "submit_patient_inquiry": 12.0,
+    "get_travel_quote": 1.0,
+}
+DEFAULT_TOOL_TIMEOUT = 10.0
+
+# Yan etkili tool'lar: süre dolduğunda henüz başlamamışsa iptal edilir, başlamışsa sonucu
+# beklenir — modele "timed out" denirse tool'u tekrar çağırır ve çift hasta kaydı oluşur
+NON_IDEMPOTENT_TOOLS: frozenset[str] = frozenset({"submit_patient_inquiry"})
+
+# Aynı turdaki bağımsız tool_use blokları bu havuzda eşzamanlı çalışır
+_TOOL_POOL = ThreadPoolExecutor(
+    max_workers=int(os.getenv("CHAT_TOOL_WORKERS", "8")),
+    thread_name_prefix="chat-tool",
+)
+
+
+def _timed_tool(name: str, args: dict[str, Any]) -> tuple[str, float, str]:
+    """_execute_tool + süre ölçümü → (JSON sonuç, latency_ms, status)."""
+    started = time.perf_counter()
+    try:
+        result, status = _execute_tool(name, args), "ok"
+    except Exception as e:
+        logger.exception(f"Tool {name} failed: {e}")
+        result, status = json.dumps({"error": f"Tool '{name}' failed. Continue without it."}), "error"
+    return result, (time.perf_counter() - started) * 1000, status
+
+
+def _timed_out(name: str, timeout: float) -> tuple[str, float, str]:
+    # Başlamamış iş iptal edildi; çalışan thread iptal edilemez, arka planda bitip sonucu atılır
+    logger.warning(f"Tool {name} timed out after {timeout:g}s")
+    return json.dumps({"error": f"Tool '{name}' timed out. Continue without it."}), timeout * 1000, "timeout"
+
+
+def _tool_messages(
+    tool_use_blocks: list[Any],
+    outcomes: list[tuple[str, float, str]],
+) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+    """Sonuçları blok sırasıyla (tool_results entries, tool_result message contents) yapar."""
+    tool_results: list[dict[str, Any]] = []
+    tool_result_contents: list[dict[str, Any]] = []
+    for tool_block, (result, latency_ms, status) in zip(tool_use_blocks, outcomes):
+        tool_results.append({
+            "tool": tool_block.name,
+            "input": tool_block.input,
+            "output": json.loads(result),
+            "latency_ms": round(latency_ms, 1),
+            "status": status,
+        })
+        tool_result_contents.append({
+            "type": "tool_result",
+            "tool_use_id": tool_block.id,
+            "content": result,
+            **({"is_error": True} if status != "ok" else {}),
+        })
+    return tool_results, tool_result_contents
+
+
 # ---------------------------------------------------------------------------
 # Greeting Messages (multilingual)
 # ---------------------------------------------------------------------------
@@ -417,34 +512,69 @@ class MedicalSecretaryAgent:
 
     def __init__(self) -> None:
         self._client: Any = None
+        self._async_client: Any = None
         self._api_key = os.getenv("ANTHROPIC_API_KEY", "")
 
+    def _check_sdk(self) -> None:
+        if not anthropic:
+            raise RuntimeError("anthropic SDK not installed. Run: pip install anthropic")
+        if not self._api_key:
+            raise RuntimeError("ANTHROPIC_API_KEY environment variable not set")
+
     @property
     def client(self) -> Any:
         if self._client is None:
-            if not anthropic:
-                raise RuntimeError("anthropic SDK not installed. Run: pip install anthropic")
-            if not self._api_key:
-                raise RuntimeError("ANTHROPIC_API_KEY environment variable not set")
+            self._check_sdk()
             self._client = anthropic.Anthropic(api_key=self._api_key)
         return self._client
 
+    @property
+    def async_client(self) -> Any:
+        """AsyncAnthropic — model round-trips without holding a worker thread."""
+        if self._async_client is None:
+            self._check_sdk()
+            self._async_client = anthropic.AsyncAnthropic(api_key=self._api_key)
+        return self._async_client
+
     def get_greeting(self, language: str = "en") -> str:
         return GREETINGS.get(language, GREETINGS["en"])
 
-    def _build_system_prompt(self, language: str, user_name: str | None = None) -> str:
-        user_name_line = f"- User's name: {user_name}" if user_name else ""
-        return SYSTEM_PROMPT_TEMPLATE.format(
-            language=language,
-            current_date=date.today().isoformat(),
-            user_name_line=user_name_line,
-        )
+    def _build_system_prompt(
+        self,
+        language: str,
+        user_name: str | None = None,
+        summary: str | None = None,
+    ) -> list[dict[str, Any]]:
+        """System blokları: cache'lenen statik önek + (dil, tarih, ad, özet) soneki."""
+        context = _session_context(language, date.today().isoformat())
+        if user_name:
+            context += f"- User's name: {user_name}\n"
+        if summary:
+            context += f"\n## Earlier Conversation (summary)\n{summary}\n"
+        return [SYSTEM_PROMPT_STATIC_BLOCK, {"type": "text", "text": context}]
+
+    @staticmethod
+    def _empty_tokens() -> dict[str, int]:
+        return {"input": 0, "output": 0, "cache_creation_input": 0, "cache_read_input": 0}
+
+    @staticmethod
+    def _add_usage(tokens: dict[str, int], usage: Any) -> None:
+        """Bir yanıtın usage değerini toplamlara ekler.
+
+        "input" cache dışı (tam fiyatlı) input token'larıdır; cache'e yazılan ve
+        cache'ten okunan token'lar ayrı sayılır.
+        """
+        tokens["input"] += usage.input_tokens
+        tokens["output"] += usage.output_tokens
+        tokens["cache_creation_input"] += getattr(usage, "cache_creation_input_tokens", None) or 0
+        tokens["cache_read_input"] += getattr(usage, "cache_read_input_tokens", None) or 0
 
     def chat(
         self,
         messages: list[dict[str, Any]],
         language: str = "en",
         user_name: str | None = None,
+        summary: str | None = None,
     ) -> dict[str, Any]:
         """
         Send conversation to Claude and return response.
@@ -454,13 +584,17 @@ class MedicalSecretaryAgent:
                       [{"role": "user", "content": "..."}, {"role": "assistant", "content": "..."}, ...]
             language: User's preferred language code
             user_name: Optional user name for personalization
+            summary: Rolling summary of turns no longer in `messages` (chat_context)
 
         Returns:
-            {"response": str, "tool_results": list, "tokens": {"input": int, "output": int}}
+            {"response": str, "tool_results": list,
+             "tokens": {"input": int, "output": int, "cache_creation_input": int, "cache_read_input": int}}
+            Token sayıları tüm tool round'larının toplamıdır.
         """
-        system = self._build_system_prompt(language, user_name)
+        system = self._build_system_prompt(language, user_name, summary)
         tool_results: list[dict[str, Any]] = []
         current_messages = list(messages)
+        tokens = self._empty_tokens()
 
         for _round in range(self.MAX_TOOL_ROUNDS):
             try:
@@ -468,7 +602,7 @@ class MedicalSecretaryAgent:
                     model=self.MODEL,
                     max_tokens=self.MAX_TOKENS,
                     system=system,
-                    tools=TOOLS,
+                    tools=CACHED_TOOLS,
                     messages=current_messages,
                 )
             except Exception as e:
@@ -476,27 +610,17 @@ class MedicalSecretaryAgent:
                 return {
                     "response": self._fallback_response(language),
                     "tool_results": [],
-                    "tokens": {"input": 0, "output": 0},
+                    "tokens": tokens,
                 }
 
+            self._add_usage(tokens, response.usage)
+
             # Check if response has tool use
             if response.stop_reason == "tool_use":
                 # Process tool calls
                 tool_use_blocks = [b for b in response.content if b.type == "tool_use"]
-                tool_result_contents = []
-
-                for tool_block in tool_use_blocks:
-                    result = _execute_tool(tool_block.name, tool_block.input)
-                    tool_results.append({
-                        "tool": tool_block.name,
-                        "input": tool_block.input,
-                        "output": json.loads(result),
-                    })
-                    tool_result_contents.append({
-                        "type": "tool_result",
-                        "tool_use_id": tool_block.id,
-                        "content": result,
-                    })
+                round_results, tool_result_contents = self._run_tools(tool_use_blocks)
+                tool_results.extend(round_results)
 
                 # Add assistant response + tool results to continue conversation
                 current_messages.append({"role": "assistant", "content": response.content})
@@ -510,19 +634,238 @@ class MedicalSecretaryAgent:
             return {
                 "response": final_text,
                 "tool_results": tool_results,
-                "tokens": {
-                    "input": response.usage.input_tokens,
-                    "output": response.usage.output_tokens,
-                },
+                "tokens": tokens,
             }
 
         # Exhausted tool rounds
         return {
             "response": self._fallback_response(language),
             "tool_results": tool_results,
-            "tokens": {"input": 0, "output": 0},
+            "tokens": tokens,
+        }
+
+    async def achat(
+        self,
+        messages: list[dict[str, Any]],
+        language: str = "en",
+        user_name: str | None = None,
+        summary: str | None = None,
+    ) -> dict[str, Any]:
+        """
+        Async variant of chat() using AsyncAnthropic — same arguments and return value.
+
+        Model calls are awaited on the event loop; tool execution (sync DB / HTTP
+        helpers) runs in the shared tool pool without blocking the loop.
+        """
+        system = self._build_system_prompt(language, user_name, summary)
+        tool_results: list[dict[str, Any]] = []
+        current_messages = list(messages)
+        tokens = self._empty_tokens()
+
+        for _round in range(self.MAX_TOOL_ROUNDS):
+            try:
+                response = await self.async_client.messages.create(
+                    model=self.MODEL,
+                    max_tokens=self.MAX_TOKENS,
+                    system=system,
+                    tools=CACHED_TOOLS,
+                    messages=current_messages,
+                )
+            except Exception as e:
+                logger.error(f"Claude API error: {e}")
+                return {
+                    "response": self._fallback_response(language),
+                    "tool_results": [],
+                    "tokens": tokens,
+                }
+
+            self._add_usage(tokens, response.usage)
+            if response.stop_reason == "tool_use":
+                tool_use_blocks = [b for b in response.content if b.type == "tool_use"]
+                round_results, tool_result_contents = await self._arun_tools(tool_use_blocks)
+                tool_results.extend(round_results)
+                current_messages.append({"role": "assistant", "content": response.content})
+                current_messages.append({"role": "user", "content": tool_result_contents})
+                continue
+
+            text_parts = [b.text for b in response.content if hasattr(b, "text")]
+            return {
+                "response": "\n".join(text_parts) if text_parts else self._fallback_response(language),
+                "tool_results": tool_results,
+                "tokens": tokens,
+            }
+
+        return {
+            "response": self._fallback_response(language),
+            "tool_results": tool_results,
+            "tokens": tokens,
         }
 
+    def chat_stream(
+        self,
+        messages: list[dict[str, Any]],
+        language: str = "en",
+        user_name: str | None = None,
+        summary: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Streaming variant of chat(): yields events as the model produces them.
+
+        Events:
+            {"type": "token", "text": str}                      — text delta
+            {"type": "tool_call", "tool": str, "input": dict}   — model requested a tool
+            {"type": "tool_result", "tool": str, "output": Any, "latency_ms": float, "status": str}
+            {"type": "error", "message": str}                   — API failure (fallback follows)
+            {"type": "done", "response": str, "tool_results": list, "tokens": dict}
+
+        The "done" event is always last; its "response" is the full text shown
+        to the user (all rounds) and is what callers should persist.
+        """
+        system = self._build_system_prompt(language, user_name, summary)
+        tool_results: list[dict[str, Any]] = []
+        current_messages = list(messages)
+        text_parts: list[str] = []
+        tokens = self._empty_tokens()
+
+        for _round in range(self.MAX_TOOL_ROUNDS):
+            round_text: list[str] = []
+            try:
+                with self.client.messages.stream(
+                    model=self.MODEL,
+                    max_tokens=self.MAX_TOKENS,
+                    system=system,
+                    tools=CACHED_TOOLS,
+                    messages=current_messages,
+                ) as stream:
+                    for event in stream:
+                        if event.type == "text":
+                            round_text.append(event.text)
+                            yield {"type": "token", "text": event.text}
+                        elif event.type == "content_block_stop" and event.content_block.type == "tool_use":
+                            block = event.content_block
+                            yield {"type": "tool_call", "tool": block.name, "input": block.input}
+                    response = stream.get_final_message()
+            except Exception as e:
+                logger.error(f"Claude API streaming error: {e}")
+                yield {"type": "error", "message": "Model API unavailable"}
+                yield {
+                    "type": "done",
+                    "response": self._fallback_response(language),
+                    "tool_results": tool_results,
+                    "tokens": tokens,
+                }
+                return
+
+            self._add_usage(tokens, response.usage)
+            if round_text:
+                text_parts.append("".join(round_text))
+
+            if response.stop_reason != "tool_use":
+                yield {
+                    "type": "done",
+                    "response": "\n".join(text_parts) if text_parts else self._fallback_response(language),
+                    "tool_results": tool_results,
+                    "tokens": tokens,
+                }
+                return
+
+            tool_use_blocks = [b for b in response.content if b.type == "tool_use"]
+            round_results, tool_result_contents = self._run_tools(tool_use_blocks)
+            for entry in round_results:
+                yield {
+                    "type": "tool_result",
+                    "tool": entry["tool"],
+                    "output": entry["output"],
+                    "latency_ms": entry["latency_ms"],
+                    "status": entry["status"],
+                }
+            tool_results.extend(round_results)
+            current_messages.append({"role": "assistant", "content": response.content})
+            current_messages.append({"role": "user", "content": tool_result_contents})
+
+        # Exhausted tool rounds
+        yield {
+            "type": "done",
+            "response": self._fallback_response(language),
+            "tool_results": tool_results,
+            "tokens": tokens,
+        }
+
+    # -- Rolling summary (chat_context) ------------------------------------
+
+    SUMMARY_MAX_TOKENS = 400
+
+    def summarize(self, previous_summary: str | None, messages: list[dict[str, Any]]) -> str | None:
+        """Önceki özeti düşen turlarla günceller. API hatasında None (özet ilerlemez)."""
+        try:
+            response = self.client.messages.create(
+                model=self.MODEL,
+                max_tokens=self.SUMMARY_MAX_TOKENS,
+                system=SUMMARY_SYSTEM_PROMPT,
+                messages=[{"role": "user", "content": summary_request(previous_summary, messages)}],
+            )
+        except Exception as e:
+            logger.error(f"Claude API summary error: {e}")
+            return None
+        return "\n".join(b.text for b in response.content if hasattr(b, "text")).strip() or None
+
+    async def asummarize(self, previous_summary: str | None, messages: list[dict[str, Any]]) -> str | None:
+        """Async variant of summarize()."""
+        try:
+            response = await self.async_client.messages.create(
+                model=self.MODEL,
+                max_tokens=self.SUMMARY_MAX_TOKENS,
+                system=SUMMARY_SYSTEM_PROMPT,
+                messages=[{"role": "user", "content": summary_request(previous_summary, messages)}],
+            )
+        except Exception as e:
+            logger.error(f"Claude API summary error: {e}")
+            return None
+        return "\n".join(b.text for b in response.content if hasattr(b, "text")).strip() or None
+
+    @staticmethod
+    def _run_tools(tool_use_blocks: list[Any]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """
+        Execute tool_use blocks concurrently → (tool_results entries, tool_result message contents).
+
+        Her blok TOOL_TIMEOUTS'taki kendi süresini alır (hepsi aynı anda başlar);
+        sonuçlar blok sırasıyla döner, süre aşımı / hata modele is_error olarak gider.
+        Süresi dolan ve henüz başlamamış işler iptal edilir; NON_IDEMPOTENT_TOOLS
+        başlamışsa tamamlanması beklenir.
+        """
+        started = time.monotonic()
+        futures = [_TOOL_POOL.submit(_timed_tool, b.name, b.input) for b in tool_use_blocks]
+        outcomes: list[tuple[str, float, str]] = []
+        for tool_block, future in zip(tool_use_blocks, futures):
+            timeout = TOOL_TIMEOUTS.get(tool_block.name, DEFAULT_TOOL_TIMEOUT)
+            try:
+                outcomes.append(future.result(timeout=max(0.0, started + timeout - time.monotonic())))
+            except FutureTimeoutError:
+                if not future.cancel() and tool_block.name in NON_IDEMPOTENT_TOOLS:
+                    logger.warning(f"Tool {tool_block.name} exceeded {timeout:g}s — waiting for it to finish")
+                    outcomes.append(future.result())
+                else:
+                    outcomes.append(_timed_out(tool_block.name, timeout))
+        return _tool_messages(tool_use_blocks, outcomes)
+
+    @staticmethod
+    async def _arun_tools(tool_use_blocks: list[Any]) -> tuple[list[dict[str, Any]], list[dict[str, Any]]]:
+        """Async variant of _run_tools() — event loop'u bloklamadan aynı havuzu kullanır."""
+        async def run_one(tool_block: Any) -> tuple[str, float, str]:
+            timeout = TOOL_TIMEOUTS.get(tool_block.name, DEFAULT_TOOL_TIMEOUT)
+            future = _TOOL_POOL.submit(_timed_tool, tool_block.name, tool_block.input)
+            pending = asyncio.wrap_future(future)
+            try:
+                return await asyncio.wait_for(asyncio.shield(pending), timeout)
+            except asyncio.TimeoutError:
+                if not future.cancel() and tool_block.name in NON_IDEMPOTENT_TOOLS:
+                    logger.warning(f"Tool {tool_block.name} exceeded {timeout:g}s — waiting for it to finish")
+                    return await pending
+                return _timed_out(tool_block.name, timeout)
+
+        outcomes = await asyncio.gather(*(run_one(b) for b in tool_use_blocks))
+        return _tool_messages(tool_use_blocks, list(outcomes))
+
     def _fallback_response(self, language: str) -> str:
         fallbacks = {
             "ru": "Извините, произошла временная ошибка. Наш координатор свяжется с вами через WhatsApp. Напишите нам: +66 XX XXX XXXX",
@@ -0,0 +1,96 @@
+"""
+AntiGravity Ventures — Chat Context Window
+Token bütçeli konuşma penceresi + kalıcı, artımlı (rolling) özet.
+
+Model'e her turda tüm geçmiş yerine şu gider:
+  - ChatSession.summary   — eski turların özeti (system prompt'a eklenir)
+  - en yeni turlar        — bütçeye sığdığı kadar, kelimesi kelimesine
+
+Pencere bütçeyi aştığında en eski turlar özetlenir ve son özetlenen mesajın id'si
+ChatSession.summary_through_message_id'ye yazılır; sonraki turlar yalnızca bu
+keyset sınırından — (created_at, message_id) — sonraki mesajları yükler. Özet her seferinde sıfırdan değil, önceki
+özet + yeni düşen turlar üzerinden güncellenir.
+
+Histerezis: bütçe aşılınca pencere bütçenin `target_ratio` kadarına indirilir,
+böylece özetleme her turda değil, birkaç turda bir çalışır.
+"""
+from __future__ import annotations
+
+import os
+from dataclasses import dataclass, field
+from typing import Any
+
+DEFAULT_TOKEN_BUDGET = int(os.getenv("CHAT_CONTEXT_TOKEN_BUDGET", "6000"))
+DEFAULT_TARGET_RATIO = 0.6
+MESSAGE_OVERHEAD_TOKENS = 4
+
+
+def estimate_tokens(text: str) -> int:
+    """
+    Tokenizer'sız, temkinli tahmin: UTF-8 byte / 3.
+
+    Latin metinde gerçek değerin biraz üstünde kalır; RU/TH/AR/ZH'de karakter
+    başına byte arttığı için tahmin de orantılı büyür — bütçe aşılmaz.
+    """
+    return len(text.encode("utf-8")) // 3 + MESSAGE_OVERHEAD_TOKENS
+
+
+@dataclass
+class WindowPlan:
+    """split() sonucu: özete katlanacak eski mesajlar + model'e gidecek pencere."""
+    fold: list[dict[str, Any]] = field(default_factory=list)
+    keep: list[dict[str, Any]] = field(default_factory=list)
+    keep_tokens: int = 0
+
+
+class ConversationWindow:
+    """Mesaj listesini token bütçesine göre (fold, keep) olarak ikiye ayırır."""
+
+    def __init__(self, token_budget: int = DEFAULT_TOKEN_BUDGET, target_ratio: float = DEFAULT_TARGET_RATIO) -> None:
+        self.token_budget = token_budget
+        self.target_tokens = int(token_budget * target_ratio)
+
+    def split(self, messages: list[dict[str, Any]]) -> WindowPlan:
+        """
+        Args:
+            messages: Özetlenmemiş mesajlar, eskiden yeniye [{"role", "content"}, ...]
+
+        Returns:
+            Bütçe aşılmadıysa her şey `keep`'te. Aşıldıysa en yeni mesajlar hedef
+            bütçeye kadar tutulur; pencere her zaman bir user mesajıyla başlar
+            (API gereği) ve son mesaj bütçeyi tek başına aşsa bile tutulur.
+        """
+        costs = [estimate_tokens(m["content"]) for m in messages]
+        total = sum(costs)
+        if total <= self.token_budget:
+            return WindowPlan(keep=list(messages), keep_tokens=total)
+
+        start, used = len(messages), 0
+        while start > 0 and (used + costs[start - 1] <= self.target_tokens or start == len(messages)):
+            start -= 1
+            used += costs[start]
+        # Pencere assistant ile başlayamaz — baştaki assistant mesajlarını özete kaydır
+        while start < len(messages) - 1 and messages[start]["role"] != "user":
+            used -= costs[start]
+            start += 1
+        return WindowPlan(fold=list(messages[:start]), keep=list(messages[start:]), keep_tokens=used)
+
+
+SUMMARY_SYSTEM_PROMPT = """You maintain a running summary of a conversation between a patient and the AntiGravity Medical assistant (medical tourism, Turkey / Phuket).
+
+Update the existing summary with the new turns. Keep every fact the assistant needs to continue the conversation:
+- patient name, contact details, language, location
+- procedures of interest, urgency, budget, travel dates
+- hospitals, prices and quotes already given; inquiries already submitted (reference IDs)
+- open questions and what the assistant promised to do next
+
+Drop greetings and small talk. Write in English, as terse bullet points, at most 200 words. Output only the updated summary."""
+
+
+def summary_request(previous_summary: str | None, messages: list[dict[str, Any]]) -> str:
+    """Özetleyici model için tek user mesajı: önceki özet + yeni düşen turlar."""
+    transcript = "\n".join(f"{m['role'].upper()}: {m['content']}" for m in messages)
+    return (
+        f"## Existing summary\n{previous_summary or '(none yet)'}\n\n"
+        f"## New turns\n{transcript}"
+    )
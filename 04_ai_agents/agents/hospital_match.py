@@ -0,0 +1,88 @@
+"""
+AntiGravity Ventures — Hospital Match Index
+MedicalAgent._match_hospital için önceden hesaplanmış eşleştirme tablosu.
+
+Skor (değişmedi): rating + 0.5 (hasta dili konuşuluyorsa) - commission_rate.
+Bir kez hesaplanır, her intake'te tek dict lookup:
+
+  - specialty → en yüksek baz skorlu hastane (dil bonusu yok)
+  - (specialty, dil) → o dil için bonus dahil en iyi hastane
+  - uzmanlık eşleşmezse tüm hastaneler arasından aynı kural (None anahtarı)
+
+Eşitlikte ilk sıradaki hastane seçilir — eski max() davranışıyla birebir aynı.
+
+Tablo yalnızca hastaneler değişince yeniden kurulur: sürüm =
+tool_cache.hospitals_version() — search_hospitals önbelleğiyle aynı commit sayacı
+(watch_hospitals) + TTL dilimi. Intake başına DB sorgusu yok; bu process'teki ORM
+değişiklikleri hemen, başka process'lerin / ham SQL'in yazdıkları en geç
+CHAT_HOSPITAL_CACHE_TTL içinde görülür.
+"""
+from __future__ import annotations
+
+import threading
+from typing import Callable, Hashable, Optional
+
+LANGUAGE_BONUS = 0.5
+
+
+def base_score(hospital: dict) -> float:
+    return hospital.get("rating", 4.0) - hospital.get("commission_rate", 0.22)
+
+
+class HospitalMatchIndex:
+    """Değiştirilemez eşleştirme tablosu; build() bir hastane listesinden kurar."""
+
+    def __init__(self, hospitals: list[dict], version: Hashable = None) -> None:
+        self.version = version
+        self.size = len(hospitals)
+        self._best: dict[Optional[str], dict] = {}
+        self._best_by_language: dict[tuple[Optional[str], str], dict] = {}
+
+        groups: dict[Optional[str], list[dict]] = {None: list(hospitals)}
+        for hospital in hospitals:
+            for specialty in hospital.get("specialties", []):
+                groups.setdefault(specialty, []).append(hospital)
+        languages = {lang for hospital in hospitals for lang in hospital.get("languages", [])}
+
+        for specialty, candidates in groups.items():
+            if not candidates:
+                continue
+            base = {id(h): base_score(h) for h in candidates}
+            self._best[specialty] = max(candidates, key=lambda h: base[id(h)])
+            for language in languages:
+                self._best_by_language[(specialty, language)] = max(
+                    candidates,
+                    key=lambda h: base[id(h)] + (LANGUAGE_BONUS if language in h.get("languages", []) else 0.0),
+                )
+
+    def match(self, category: str, language: str) -> Optional[dict]:
+        """O(1): uzmanlığı olan en iyi hastane; uzmanlık hiç yoksa tüm hastaneler arasından."""
+        specialty = category if category in self._best else None
+        best = self._best_by_language.get((specialty, language)) or self._best.get(specialty)
+        return dict(best) if best is not None else None
+
+    @staticmethod
+    def score(hospital: dict, language: str) -> float:
+        return base_score(hospital) + (LANGUAGE_BONUS if language in hospital.get("languages", []) else 0.0)
+
+
+class HospitalMatchCache:
+    """
+    Son kurulan indeksi tutar; get(version, load) sürüm değişmişse load() ile yeniden kurar.
+    Kurulum kilit altında — eşzamanlı intake'ler tabloyu bir kez kurar.
+    """
+
+    def __init__(self) -> None:
+        self._index: Optional[HospitalMatchIndex] = None
+        self._lock = threading.Lock()
+        self.rebuilds = 0
+
+    def get(self, version: Hashable, load: Callable[[], list[dict]]) -> HospitalMatchIndex:
+        index = self._index
+        if index is not None and index.version == version:
+            return index
+        with self._lock:
+            if self._index is None or self._index.version != version:
+                self._index = HospitalMatchIndex(load(), version)
+                self.rebuilds += 1
+            return self._index
@@ -0,0 +1,91 @@
+"""
+AntiGravity Ventures — Intake Transport
+Chat agent'ın submit_patient_inquiry tool'unun hasta başvurusunu nasıl ilettiği.
+
+  - HttpIntakeTransport      — POST {base_url}/api/medical/intake (uzak backend)
+  - backend içinde çalışırken routers/medical.py kendi process içi transport'unu
+    set_intake_transport() ile kaydeder: aynı process'e TCP loopback, JSON
+    yeniden kodlama, rate-limit sayacı ve ikinci bir threadpool slotu yok.
+
+Bu modül bilerek hafiftir (anthropic vb. import etmez) — backend açılışta
+chat agent'ı yüklemeden transport kaydedebilsin.
+"""
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+logger = logging.getLogger("thaiturk.intake_transport")
+
+
+class IntakeError(Exception):
+    """Başvuru iletilemedi (doğrulama, HTTP veya işleme hatası)."""
+
+
+class IntakeTransport(ABC):
+    """submit(payload) → /api/medical/intake yanıtıyla aynı şekilde dict; hata → IntakeError."""
+
+    name = "base"
+
+    @abstractmethod
+    def submit(self, payload: dict[str, Any]) -> dict[str, Any]:
+        ...
+
+
+class HttpIntakeTransport(IntakeTransport):
+    """Intake endpoint'ine HTTP — bağlantılar paylaşılan httpx.Client ile yeniden kullanılır."""
+
+    name = "http"
+
+    def __init__(self, base_url: Optional[str] = None, timeout: float = 10.0) -> None:
+        self.base_url = (
+            base_url
+            or os.getenv("INTAKE_API_URL")
+            or f"http://localhost:{os.getenv('PORT', '8000')}"
+        ).rstrip("/")
+        self.timeout = timeout
+        self._client: Any = None
+        self._lock = threading.Lock()
+
+    @property
+    def client(self) -> Any:
+        if self._client is None:
+            with self._lock:
+                if self._client is None:
+                    import httpx
+                    self._client = httpx.Client(base_url=self.base_url, timeout=self.timeout)
+        return self._client
+
+    def submit(self, payload: dict[str, Any]) -> dict[str, Any]:
+        try:
+            response = self.client.post("/api/medical/intake", json=payload)
+        except Exception as e:
+            raise IntakeError(f"Intake API unreachable: {e}") from e
+        if response.status_code != 200:
+            logger.warning(f"Intake API returned {response.status_code}: {response.text}")
+            raise IntakeError(f"API error {response.status_code}")
+        return response.json()
+
+
+_transport: Optional[IntakeTransport] = None
+_transport_lock = threading.Lock()
+
+
+def get_intake_transport() -> IntakeTransport:
+    """Kayıtlı transport; kayıt yoksa HttpIntakeTransport (INTAKE_API_URL veya localhost:PORT)."""
+    global _transport
+    if _transport is None:
+        with _transport_lock:
+            if _transport is None:
+                _transport = HttpIntakeTransport()
+    return _transport
+
+
+def set_intake_transport(transport: IntakeTransport) -> None:
+    global _transport
+    with _transport_lock:
+        _transport = transport
+    logger.info(f"Intake transport: {transport.name}")
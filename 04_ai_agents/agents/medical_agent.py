@@ -14,10 +14,11 @@ from __future__ import annotations
 
 import asyncio
 import logging
+import threading
 import uuid
 from datetime import date, datetime
 from pathlib import Path
-from typing import Optional
+from typing import Optional, Sequence
 import sys
 
 # Backend path — needed for ORM model imports
@@ -29,9 +30,16 @@ logger = logging.getLogger("MedicalAgent")
 
 # Optional DB imports — graceful fallback when DB not available
 try:
-    from database.models import Hospital as HospitalModel, Patient as PatientModel
+    from database.models import (
+        PATIENT_FIELD_COLUMNS,
+        Hospital as HospitalModel,
+        NotificationOutbox as OutboxModel,
+        Patient as PatientModel,
+        patient_fields_dict,
+    )
     from sqlalchemy.orm import Session
-    from sqlalchemy import func as sa_func
+    from sqlalchemy import func as sa_func, insert as sa_insert, select as sa_select, tuple_ as sa_tuple
+    from sqlalchemy.exc import SQLAlchemyError
     _DB_AVAILABLE = True
 except ImportError:
     _DB_AVAILABLE = False
@@ -48,6 +56,15 @@ except ImportError:
     _NOTIFIER = None
     _NOTIFICATIONS_AVAILABLE = False
 
+# Keyword dictionary store (04_ai_agents/keyword_store.py)
+_agents_root = str(Path(__file__).parent.parent)
+if _agents_root not in sys.path:
+    sys.path.insert(0, _agents_root)
+import keyword_store  # noqa: E402
+from agents.hospital_match import HospitalMatchCache, HospitalMatchIndex  # noqa: E402
+from agents.procedure_matcher import matcher_for  # noqa: E402
+from agents.tool_cache import hospitals_version, watch_hospitals  # noqa: E402
+
 
 # ---------------------------------------------------------------------------
 # Partner Hospital Registry (gerçekte Firestore'dan gelecek)
@@ -116,43 +133,11 @@ PARTNER_HOSPITALS = [
     },
 ]
 
-# Prosedür → kategori mapping
-PROCEDURE_CATEGORY_MAP: dict[str, str] = {
-    # English
-    "rhinoplasty": "aesthetic", "liposuction": "aesthetic", "abdominoplasty": "aesthetic",
-    "breast": "aesthetic", "aesthetic": "aesthetic", "cosmetic": "aesthetic", "plastic": "aesthetic",
-    "hair transplant": "hair", "hair": "hair",
-    "dental": "dental", "implant": "dental", "veneer": "dental", "teeth": "dental",
-    "skin": "dermatology", "dermatology": "dermatology", "laser": "dermatology",
-    "checkup": "checkup", "check-up": "checkup", "health check": "checkup",
-    "eye": "ophthalmology", "lasik": "ophthalmology", "ophthalmology": "ophthalmology",
-    "bariatric": "bariatric", "gastric": "bariatric", "weight loss": "bariatric", "obesity": "bariatric",
-    "ivf": "ivf", "fertility": "ivf",
-    "cancer": "oncology", "oncology": "oncology", "tumor": "oncology",
-    # Turkish
-    "rinoplasti": "aesthetic", "burun": "aesthetic", "karın germe": "aesthetic",
-    "göğüs": "aesthetic", "estetik": "aesthetic",
-    "saç ekimi": "hair", "saç": "hair",
-    "diş": "dental", "kaplama": "dental", "zirkon": "dental",
-    "cilt": "dermatology", "lazer": "dermatology",
-    "tahlil": "checkup", "kontrol": "checkup",
-    "göz": "ophthalmology",
-    "obezite": "bariatric", "gastrik": "bariatric",
-    "tüp bebek": "ivf",
-    "kanser": "oncology", "tümör": "oncology",
-    # Russian (Cyrillic)
-    "ринопластика": "aesthetic", "пластика": "aesthetic", "нос": "aesthetic",
-    "липосакция": "aesthetic", "грудь": "aesthetic", "эстетика": "aesthetic",
-    "абдоминопластика": "aesthetic", "подтяжка": "aesthetic",
-    "пересадка волос": "hair", "волосы": "hair", "трансплантация": "hair",
-    "стоматология": "dental", "зубы": "dental", "виниры": "dental", "имплант": "dental",
-    "кожа": "dermatology", "дерматология": "dermatology", "лазер": "dermatology",
-    "осмотр": "checkup", "чекап": "checkup", "обследование": "checkup",
-    "глаза": "ophthalmology", "зрение": "ophthalmology", "лазик": "ophthalmology",
-    "бариатрия": "bariatric", "ожирение": "bariatric", "желудок": "bariatric",
-    "эко": "ivf", "бесплодие": "ivf",
-    "онкология": "oncology", "рак": "oncology", "опухоль": "oncology",
-}
+# DB yokken kullanılan eşleştirme tablosu — statik listeden bir kez kurulur
+_STATIC_MATCH_INDEX = HospitalMatchIndex(PARTNER_HOSPITALS, version="static")
+
+# Prosedür → kategori mapping: data/keywords.json → "procedure_categories"
+# (keyword_store üzerinden çalışma anında yeniden yüklenir; agents/procedure_matcher.py trie'si)
 
 # Prosedür → baz fiyat (USD)
 PROCEDURE_PRICES_USD: dict[str, float] = {
@@ -213,6 +198,9 @@ class MedicalAgent:
 
     def __init__(self) -> None:
         self._patient_db: dict[str, dict] = {}   # In-memory fallback (db=None)
+        self._match_index = HospitalMatchCache()  # hospitals commit'i / TTL → yeniden kurulur
+        if _DB_AVAILABLE:
+            watch_hospitals(HospitalModel)
         logger.info("MedicalAgent initialized — Phuket↔Turkey referral engine active.")
 
     # ----------------------------------------------------------------
@@ -241,40 +229,28 @@ class MedicalAgent:
         commission_rate = (hospital.get("commission_rate", 0.22) if hospital else 0.22)
         commission = round(cost * commission_rate, 2)
 
-        # 4. Hasta kaydı oluştur
+        # 4. Koordinatör mesajı üret
+        lang = intake_data.get("language", "ru")
+        coordinator_msg = self._generate_coordinator_message(
+            patient_id=patient_id,
+            hospital_name=hospital.get("name", "N/A") if hospital else "TBD",
+            cost=cost,
+            language=lang,
+        )
+
+        # 5. Hasta kaydı + bildirimler (coordinator + patient)
         hospital_id = hospital.get("hospital_id") if hospital else None
         hospital_name = hospital.get("name", "N/A") if hospital else "No match"
 
         if db and _DB_AVAILABLE:
-            # Persist to PostgreSQL
-            arrival = intake_data.get("phuket_arrival_date")
-            arrival_date = None
-            if arrival:
-                try:
-                    arrival_date = date.fromisoformat(arrival)
-                except (ValueError, TypeError):
-                    pass
-
-            patient = PatientModel(
-                patient_id=patient_id,
-                full_name=intake_data.get("full_name", ""),
-                phone=intake_data.get("phone", ""),
-                language=intake_data.get("language", "ru"),
-                procedure_interest=procedure_text,
-                procedure_category=category,
-                urgency=intake_data.get("urgency", "routine"),
-                budget_usd=budget,
-                notes=intake_data.get("notes"),
-                referral_source=intake_data.get("referral_source"),
-                phuket_arrival_date=arrival_date,
-                status="inquiry",
-                matched_hospital_id=hospital_id,
-                estimated_procedure_cost_usd=cost,
-                commission_rate=commission_rate,
-                commission_usd=commission,
-                tags=self._generate_tags(intake_data, category),
-            )
+            # Persist to PostgreSQL — bildirimler aynı transaction'da outbox'a yazılır;
+            # teslimatı services/notification_outbox.py worker'ı yapar (intake WhatsApp/Telegram/LINE beklemez)
+            patient = PatientModel(**self._patient_columns(
+                patient_id, intake_data, category, hospital_id, cost, commission_rate, commission,
+            ))
             db.add(patient)
+            db.flush()   # outbox.patient_id FK → hasta satırı önce yazılır
+            db.add_all(self._outbox_rows(intake_data, patient_id, coordinator_msg, lang))
             db.commit()
             db.refresh(patient)
             record = patient.to_dict()
@@ -292,37 +268,18 @@ class MedicalAgent:
                 "tags": self._generate_tags(intake_data, category),
             }
             self._patient_db[patient_id] = record
+            # Outbox yok (DB'siz çalışma) — ayrı daemon thread, çağıranı bloklamaz
+            if _NOTIFICATIONS_AVAILABLE and _NOTIFIER:
+                threading.Thread(
+                    target=asyncio.run,
+                    args=(self._send_notifications(intake_data, patient_id, coordinator_msg, lang),),
+                    name=f"notify-{patient_id}",
+                    daemon=True,
+                ).start()
 
         logger.info(f"[MedicalAgent] Patient {patient_id} registered → {category} → {hospital_name}")
 
-        # 5. Koordinatör mesajı üret
-        lang = intake_data.get("language", "ru")
-        coordinator_msg = self._generate_coordinator_message(
-            patient_id=patient_id,
-            hospital_name=hospital.get("name", "N/A") if hospital else "TBD",
-            cost=cost,
-            language=lang,
-        )
-
-        # 6. Fire-and-forget notifications (coordinator + patient)
-        if _NOTIFICATIONS_AVAILABLE and _NOTIFIER:
-            try:
-                loop = asyncio.get_event_loop()
-                if loop.is_running():
-                    # We're inside an async context (FastAPI) — schedule as task
-                    asyncio.ensure_future(self._send_notifications(intake_data, patient_id, coordinator_msg, lang))
-                else:
-                    loop.run_until_complete(self._send_notifications(intake_data, patient_id, coordinator_msg, lang))
-            except RuntimeError:
-                # No event loop — create one (standalone usage)
-                try:
-                    asyncio.run(self._send_notifications(intake_data, patient_id, coordinator_msg, lang))
-                except Exception as e:
-                    logger.warning(f"[MedicalAgent] Notification failed (no loop): {e}")
-            except Exception as e:
-                logger.warning(f"[MedicalAgent] Notification fire-and-forget failed: {e}")
-
-        # 7. Sonraki adımlar
+        # 6. Sonraki adımlar
         next_steps = self._build_next_steps(category, hospital, intake_data)
 
         return {
@@ -339,6 +296,116 @@ class MedicalAgent:
             "record": record,
         }
 
+    def process_intake_batch(
+        self, intakes: list[dict], db=None, index: Optional[HospitalMatchIndex] = None, notify: bool = True,
+    ) -> list[dict]:
+        """
+        Toplu intake (CSV/JSONL yükleme) — bir parça, tek transaction.
+        Sınıflandırma + eşleştirme tek hastane snapshot'ına (index) karşı; satırlar tek
+        multi-row INSERT ile yazılır. Parça başarısız olursa (ör. tek satırda DB kısıtı)
+        satır satır yeniden denenir — hatalı satır diğerlerini düşürmez.
+        notify=True: process_intake ile aynı bildirimler, hasta satırıyla aynı transaction'da
+        notification_outbox'a yazılır. notify=False yalnızca hastaları kaydeder.
+
+        Returns: her intake için sırayla {"patient_id", ...} veya {"error": ...}
+        """
+        if index is None:
+            index = self.hospital_snapshot(db)
+        results: list[dict] = []
+        rows: list[dict] = []
+        notifications: list[tuple[dict, str, str, str]] = []   # (intake, patient_id, mesaj, dil)
+        seen_ids: set[str] = set()
+        for intake_data in intakes:
+            patient_id = self._generate_patient_id()
+            while patient_id in seen_ids:
+                patient_id = self._generate_patient_id()
+            seen_ids.add(patient_id)
+
+            category = self._classify_procedure(intake_data.get("procedure_interest", ""))
+            intake_data["procedure_category"] = category
+            hospital = index.match(category, intake_data.get("language", "ru"))
+            cost = self._estimate_cost(category, intake_data.get("budget_usd"))
+            commission_rate = hospital.get("commission_rate", 0.22) if hospital else 0.22
+            commission = round(cost * commission_rate, 2)
+            hospital_id = hospital.get("hospital_id") if hospital else None
+
+            rows.append(self._patient_columns(
+                patient_id, intake_data, category, hospital_id, cost, commission_rate, commission,
+            ))
+            lang = intake_data.get("language", "ru")
+            notifications.append((intake_data, patient_id, self._generate_coordinator_message(
+                patient_id=patient_id,
+                hospital_name=hospital.get("name", "N/A") if hospital else "TBD",
+                cost=cost,
+                language=lang,
+            ), lang))
+            results.append({
+                "patient_id": patient_id,
+                "procedure_category": category,
+                "matched_hospital": hospital_id,
+                "estimated_procedure_cost_usd": cost,
+                "commission_usd": commission,
+            })
+
+        if not rows:
+            return results
+        outbox = [self._outbox_columns(*n) for n in notifications] if notify else [[] for _ in rows]
+        if db and _DB_AVAILABLE:
+            try:
+                db.execute(sa_insert(PatientModel), rows)
+                chunk_outbox = [r for per_patient in outbox for r in per_patient]
+                if chunk_outbox:
+                    db.execute(sa_insert(OutboxModel), chunk_outbox)
+                db.commit()
+            except SQLAlchemyError as e:
+                db.rollback()
+                logger.warning(f"[MedicalAgent] Bulk chunk insert failed ({type(e).__name__}) — retrying row by row")
+                for position, row in enumerate(rows):
+                    try:
+                        db.execute(sa_insert(PatientModel), [row])
+                        if outbox[position]:
+                            db.execute(sa_insert(OutboxModel), outbox[position])
+                        db.commit()
+                    except SQLAlchemyError as row_error:
+                        db.rollback()
+                        reason = str(getattr(row_error, "orig", None) or row_error).splitlines()[0]
+                        results[position] = {"error": f"{type(row_error).__name__}: {reason}"}
+        else:
+            now = datetime.utcnow().isoformat()
+            for intake_data, row, result in zip(intakes, rows, results):
+                self._patient_db[row["patient_id"]] = {
+                    "patient_id": row["patient_id"],
+                    "intake": intake_data,
+                    "status": "inquiry",
+                    "matched_hospital": row["matched_hospital_id"],
+                    "estimated_procedure_cost_usd": row["estimated_procedure_cost_usd"],
+                    "commission_rate": row["commission_rate"],
+                    "commission_usd": row["commission_usd"],
+                    "created_at": now,
+                    "tags": row["tags"],
+                }
+            # Outbox yok (DB'siz çalışma) — parçanın bildirimleri tek daemon thread'de sırayla
+            if notify and _NOTIFICATIONS_AVAILABLE and _NOTIFIER:
+                threading.Thread(
+                    target=asyncio.run,
+                    args=(self._send_batch_notifications(notifications),),
+                    name=f"notify-bulk-{notifications[0][1]}",
+                    daemon=True,
+                ).start()
+
+        stored = sum(1 for r in results if "error" not in r)
+        logger.info(f"[MedicalAgent] Bulk intake chunk: {stored}/{len(rows)} patients registered")
+        return results
+
+    def hospital_snapshot(self, db=None) -> HospitalMatchIndex:
+        """
+        Güncel eşleştirme tablosu — toplu intake'te tüm yükleme aynı snapshot'ı kullanır.
+        Sürüm tool_cache.hospitals_version() (search_hospitals ile ortak sayaç); intake başına DB sorgusu yok.
+        """
+        if db and _DB_AVAILABLE:
+            return self._match_index.get(hospitals_version(), lambda: self._load_hospitals(db))
+        return _STATIC_MATCH_INDEX
+
     def get_patient(self, patient_id: str, db=None) -> Optional[dict]:
         """Hasta kaydını getirir."""
         if db and _DB_AVAILABLE:
@@ -365,20 +432,79 @@ class MedicalAgent:
         logger.info(f"[MedicalAgent] {patient_id} status → {new_status}")
         return {"success": True, "patient_id": patient_id, "status": new_status}
 
-    def list_patients(self, status_filter: Optional[str] = None, db=None) -> list[dict]:
-        """Tüm hastaları listeler, isteğe bağlı status filtresiyle."""
+    def list_patients(
+        self,
+        status_filter: Optional[str] = None,
+        db=None,
+        *,
+        category: Optional[str] = None,
+        hospital_id: Optional[str] = None,
+        created_from: Optional[datetime] = None,
+        created_to: Optional[datetime] = None,
+        cursor: Optional[tuple] = None,
+        limit: Optional[int] = None,
+        fields: Optional[Sequence[str]] = None,
+    ) -> list[dict]:
+        """
+        Hastalar, en yeniden eskiye (created_at, patient_id) sırasında; filtreler AND ile birleşir.
+        cursor: patient_cursor() sonucu — yalnızca ondan önce oluşturulanlar (keyset, OFFSET yok).
+        fields: to_dict() anahtarlarının alt kümesi — DB'de yalnızca gereken kolonlar okunur.
+        created_from dahil, created_to hariç.
+        """
         if db and _DB_AVAILABLE:
-            q = db.query(PatientModel)
+            fields = tuple(fields or PATIENT_FIELD_COLUMNS)
+            names = dict.fromkeys(
+                ["patient_id", "created_at"] + [c for f in fields for c in PATIENT_FIELD_COLUMNS[f]]
+            )
+            stmt = sa_select(*(getattr(PatientModel, name) for name in names))
             if status_filter:
-                q = q.filter(PatientModel.status == status_filter)
-            return [p.to_dict() for p in q.all()]
+                stmt = stmt.where(PatientModel.status == status_filter)
+            if category:
+                stmt = stmt.where(PatientModel.procedure_category == category)
+            if hospital_id:
+                stmt = stmt.where(PatientModel.matched_hospital_id == hospital_id)
+            if created_from:
+                stmt = stmt.where(PatientModel.created_at >= created_from)
+            if created_to:
+                stmt = stmt.where(PatientModel.created_at < created_to)
+            if cursor:
+                stmt = stmt.where(sa_tuple(PatientModel.created_at, PatientModel.patient_id) < sa_tuple(*cursor))
+            stmt = stmt.order_by(PatientModel.created_at.desc(), PatientModel.patient_id.desc())
+            if limit:
+                stmt = stmt.limit(limit)
+            return [patient_fields_dict(row, fields) for row in db.execute(stmt)]
 
         # In-memory fallback
         patients = list(self._patient_db.values())
         if status_filter:
             patients = [p for p in patients if p.get("status") == status_filter]
+        if category:
+            patients = [p for p in patients if p.get("intake", {}).get("procedure_category") == category]
+        if hospital_id:
+            patients = [p for p in patients if p.get("matched_hospital") == hospital_id]
+        if created_from:
+            patients = [p for p in patients if p["created_at"] >= created_from.isoformat()]
+        if created_to:
+            patients = [p for p in patients if p["created_at"] < created_to.isoformat()]
+        patients.sort(key=lambda p: (p["created_at"], p["patient_id"]), reverse=True)
+        if cursor:
+            patients = [p for p in patients if (p["created_at"], p["patient_id"]) < tuple(cursor)]
+        if limit:
+            patients = patients[:limit]
+        if fields:
+            patients = [{f: p.get(f) for f in fields} for p in patients]
         return patients
 
+    def patient_cursor(self, patient_id: str, db=None) -> Optional[tuple]:
+        """patient_id → list_patients keyset anahtarı (created_at, patient_id); bilinmiyorsa None."""
+        if db and _DB_AVAILABLE:
+            row = db.execute(
+                sa_select(PatientModel.created_at, PatientModel.patient_id).where(PatientModel.patient_id == patient_id)
+            ).first()
+            return (row.created_at, row.patient_id) if row else None
+        record = self._patient_db.get(patient_id)
+        return (record["created_at"], patient_id) if record else None
+
     def get_commission_summary(self, db=None) -> dict:
         """Tüm komisyon özetini döndürür."""
         if db and _DB_AVAILABLE:
@@ -430,6 +556,36 @@ class MedicalAgent:
     # Private Helpers
     # ----------------------------------------------------------------
 
+    def _outbox_rows(self, intake_data: dict, patient_id: str, coordinator_msg: str, lang: str) -> list:
+        """Intake bildirimleri → notification_outbox ORM satırları (process_intake)."""
+        return [OutboxModel(**columns) for columns in self._outbox_columns(intake_data, patient_id, coordinator_msg, lang)]
+
+    def _outbox_columns(self, intake_data: dict, patient_id: str, coordinator_msg: str, lang: str) -> list[dict]:
+        """
+        notification_outbox satır kolonları — process_intake (ORM) ve process_intake_batch
+        (multi-row INSERT) ortak; dedupe_key aynı bildirimi ikinci kez kuyruğa almaz.
+        """
+        if not (_NOTIFICATIONS_AVAILABLE and _NOTIFIER):
+            return []
+        deliveries = [
+            {**delivery, "kind": "coordinator", "language": "en"}
+            for delivery in _NOTIFIER.plan_coordinator({**intake_data, "patient_id": patient_id})
+        ]
+        phone = intake_data.get("phone", "")
+        if phone:
+            deliveries.append({
+                "kind": "patient", "channel": _NOTIFIER.patient_channel(lang), "recipient": phone,
+                "message": coordinator_msg, "language": lang,
+            })
+        return [
+            {
+                "dedupe_key": f"{patient_id}:{d['kind']}:{d['channel']}:{d['recipient']}"[:150],
+                "patient_id": patient_id,
+                **d,
+            }
+            for d in deliveries
+        ]
+
     async def _send_notifications(self, intake_data: dict, patient_id: str, coordinator_msg: str, lang: str) -> None:
         """Fire-and-forget: send coordinator + patient notifications."""
         try:
@@ -447,42 +603,68 @@ class MedicalAgent:
         except Exception as e:
             logger.warning(f"[MedicalAgent] Patient notification failed: {e}")
 
+    async def _send_batch_notifications(self, notifications: list[tuple[dict, str, str, str]]) -> None:
+        """DB'siz toplu intake: parçadaki her hasta için _send_notifications, sırayla."""
+        for intake_data, patient_id, coordinator_msg, lang in notifications:
+            await self._send_notifications(intake_data, patient_id, coordinator_msg, lang)
+
     def _classify_procedure(self, text: str) -> str:
-        text_lower = text.lower()
-        for keyword, category in PROCEDURE_CATEGORY_MAP.items():
-            if keyword in text_lower:
-                return category
-        return "other"
+        """En uzun prosedür anahtar kelimesinin kategorisi (kelime başı + kök eşleşmesi); yoksa "other"."""
+        # Tek referans okuması — eşzamanlı sözlük yenilemesi bu çağrıyı etkilemez
+        hit = matcher_for(keyword_store.current()).match(text)
+        return hit[0] if hit else "other"
 
     def _match_hospital(self, category: str, language: str, db=None) -> Optional[dict]:
-        """Kategoriye ve dile göre en iyi hastaneyi seç."""
-        if db and _DB_AVAILABLE:
-            # Query from DB
-            all_hospitals = db.query(HospitalModel).filter(HospitalModel.active.is_(True)).all()
-            hospital_dicts = [h.to_dict() for h in all_hospitals] if all_hospitals else PARTNER_HOSPITALS
-        else:
-            hospital_dicts = PARTNER_HOSPITALS
-
-        if not hospital_dicts:
+        """
+        Kategoriye ve dile göre en iyi hastaneyi seç (skor: rating + dil bonusu - commission_rate).
+        Eşleştirme tablosu önceden kurulu; intake başına yalnızca dict lookup.
+        """
+        index = self.hospital_snapshot(db)
+        best = index.match(category, language)
+        if best is None:
             logger.warning("[MedicalAgent] No partner hospitals configured!")
             return None
-
-        candidates = [
-            h for h in hospital_dicts
-            if category in h.get("specialties", [])
-        ]
-        if not candidates:
-            candidates = list(hospital_dicts)  # Fallback: tümünü değerlendir
-
-        # Skorlama: dil uyumu + rating - commission_rate
-        def score(h: dict) -> float:
-            lang_bonus = 0.5 if language in h.get("languages", []) else 0.0
-            return h.get("rating", 4.0) + lang_bonus - h.get("commission_rate", 0.22)
-
-        best = max(candidates, key=score)
-        logger.info(f"[MedicalAgent] Hospital matched: {best['name']} (score={score(best):.2f})")
+        logger.info(f"[MedicalAgent] Hospital matched: {best['name']} (score={index.score(best, language):.2f})")
         return best
 
+    def _load_hospitals(self, db) -> list[dict]:
+        """Aktif hastaneler; tablo boşsa statik PARTNER_HOSPITALS."""
+        all_hospitals = db.query(HospitalModel).filter(HospitalModel.active.is_(True)).all()
+        logger.info(f"[MedicalAgent] Hospital match index rebuilt ({len(all_hospitals)} active hospitals)")
+        return [h.to_dict() for h in all_hospitals] if all_hospitals else PARTNER_HOSPITALS
+
+    def _patient_columns(
+        self, patient_id: str, intake_data: dict, category: str, hospital_id: Optional[str],
+        cost: float, commission_rate: float, commission: float,
+    ) -> dict:
+        """patients satırı — process_intake (ORM) ve process_intake_batch (multi-row INSERT) ortak."""
+        arrival = intake_data.get("phuket_arrival_date")
+        arrival_date = None
+        if arrival:
+            try:
+                arrival_date = date.fromisoformat(arrival)
+            except (ValueError, TypeError):
+                pass
+        return {
+            "patient_id": patient_id,
+            "full_name": intake_data.get("full_name", ""),
+            "phone": intake_data.get("phone", ""),
+            "language": intake_data.get("language", "ru"),
+            "procedure_interest": intake_data.get("procedure_interest", ""),
+            "procedure_category": category,
+            "urgency": intake_data.get("urgency", "routine"),
+            "budget_usd": intake_data.get("budget_usd"),
+            "notes": intake_data.get("notes"),
+            "referral_source": intake_data.get("referral_source"),
+            "phuket_arrival_date": arrival_date,
+            "status": "inquiry",
+            "matched_hospital_id": hospital_id,
+            "estimated_procedure_cost_usd": cost,
+            "commission_rate": commission_rate,
+            "commission_usd": commission,
+            "tags": self._generate_tags(intake_data, category),
+        }
+
     def _estimate_cost(self, category: str, budget: Optional[float]) -> float:
         base = PROCEDURE_PRICES_USD.get(category, 3_000)
         if budget and budget > 0:
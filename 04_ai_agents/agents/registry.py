@@ -0,0 +1,137 @@
+"""
+AntiGravity Ventures — Shared Agent Registry
+Orchestrator ve backend router'larının ortak kullandığı, tembel (lazy) agent havuzu.
+
+Her agent process başına tek örnektir; modül importu ve constructor ilk kullanımda,
+thread-safe olarak yapılır. Başarısız kurulum kaydedilir; geri çekilme süresi
+(REGISTRY_RETRY_BACKOFF, ardışık hatalarda ikiye katlanır) dolana kadar get() import'u
+tekrar denemeden None döner — bozuk bir agent her istekte kilit altında yeniden kurulmaz.
+"""
+from __future__ import annotations
+
+import importlib
+import logging
+import os
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+logger = logging.getLogger("AgentRegistry")
+
+RETRY_BACKOFF_SECONDS = float(os.getenv("REGISTRY_RETRY_BACKOFF", "5"))
+RETRY_BACKOFF_MAX_SECONDS = float(os.getenv("REGISTRY_RETRY_BACKOFF_MAX", "300"))
+
+# name → (module path, class name)
+AGENT_SPECS: dict[str, tuple[str, str]] = {
+    "medical": ("agents.medical_agent", "MedicalAgent"),
+    "travel": ("agents.travel_agent", "TravelAgent"),
+    "factory": ("agents.factory_agent", "FactoryAgent"),
+    "marketing": ("agents.marketing_agent", "MarketingAgent"),
+    "chat": ("agents.chat_agent", "MedicalSecretaryAgent"),
+}
+
+
+class AgentRegistry:
+    """Lazy, thread-safe agent singleton havuzu + kurulum metrikleri."""
+
+    def __init__(self, specs: dict[str, tuple[str, str]] | None = None) -> None:
+        self._specs = dict(specs or AGENT_SPECS)
+        self._instances: dict[str, Any] = {}
+        self._locks: dict[str, threading.Lock] = {name: threading.Lock() for name in self._specs}
+        self._metrics: dict[str, dict[str, Any]] = {}
+        self._retry_at: dict[str, float] = {}   # name → perf_counter; başarısız kurulumun geri çekilmesi
+        self._created_at = time.perf_counter()
+
+    def get(self, name: str) -> Optional[Any]:
+        """
+        Agent örneğini döndürür; ilk çağrıda import edip oluşturur.
+
+        Returns:
+            Agent örneği veya kurulum başarısızsa (geri çekilme süresince) None.
+        """
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+        if name not in self._specs:
+            raise KeyError(f"Unknown agent: {name}")
+        if self._backing_off(name):
+            return None
+
+        with self._locks[name]:
+            instance = self._instances.get(name)
+            if instance is None and not self._backing_off(name):
+                instance = self._build(name)
+            return instance
+
+    def is_built(self, name: str) -> bool:
+        return name in self._instances
+
+    def warm_up(self, names: list[str] | None = None) -> dict[str, bool]:
+        """Verilen (varsayılan: tüm) agent'ları önceden kurar."""
+        return {name: self.get(name) is not None for name in (names or list(self._specs))}
+
+    def stats(self) -> dict[str, Any]:
+        """Agent başına import/constructor süreleri, kurulum zamanı ve hata bilgisi."""
+        now = time.perf_counter()
+        agents: dict[str, Any] = {}
+        for name in self._specs:
+            metrics = dict(self._metrics.get(name, {"built": False}))
+            retry_at = self._retry_at.get(name)
+            if retry_at is not None:
+                metrics["retry_in_s"] = round(max(retry_at - now, 0.0), 3)
+            agents[name] = metrics
+        return {
+            "uptime_s": round(now - self._created_at, 3),
+            "built": sorted(self._instances),
+            "failed": sorted(name for name in self._retry_at if name not in self._instances),
+            "agents": agents,
+        }
+
+    def _backing_off(self, name: str) -> bool:
+        retry_at = self._retry_at.get(name)
+        return retry_at is not None and time.perf_counter() < retry_at
+
+    def _build(self, name: str) -> Optional[Any]:
+        module_path, class_name = self._specs[name]
+        metrics = self._metrics.setdefault(name, {"built": False, "attempts": 0, "consecutive_failures": 0})
+        metrics["attempts"] += 1
+        started = time.perf_counter()
+        try:
+            module = importlib.import_module(module_path)
+            imported = time.perf_counter()
+            instance = getattr(module, class_name)()
+        except Exception as e:
+            metrics["consecutive_failures"] += 1
+            backoff = min(RETRY_BACKOFF_MAX_SECONDS, RETRY_BACKOFF_SECONDS * 2 ** (metrics["consecutive_failures"] - 1))
+            self._retry_at[name] = time.perf_counter() + backoff
+            metrics["last_error"] = f"{type(e).__name__}: {e}"
+            metrics["failed_at"] = datetime.now(timezone.utc).isoformat()
+            logger.warning(f"{class_name} init failed (retry in {backoff:g}s): {e}")
+            return None
+
+        finished = time.perf_counter()
+        metrics.update({
+            "built": True,
+            "class": class_name,
+            "import_ms": round((imported - started) * 1000, 2),
+            "init_ms": round((finished - imported) * 1000, 2),
+            "built_at": datetime.now(timezone.utc).isoformat(),
+            "since_boot_s": round(finished - self._created_at, 3),
+        })
+        metrics["consecutive_failures"] = 0
+        metrics.pop("last_error", None)
+        metrics.pop("failed_at", None)
+        self._retry_at.pop(name, None)
+        self._instances[name] = instance
+        logger.info(f"{class_name} ready in {metrics['import_ms'] + metrics['init_ms']:.1f} ms (lazy)")
+        return instance
+
+
+# Process-wide shared registry
+registry = AgentRegistry()
+
+
+def get_agent(name: str) -> Optional[Any]:
+    """Paylaşılan registry'den agent döndürür (bkz. AgentRegistry.get)."""
+    return registry.get(name)
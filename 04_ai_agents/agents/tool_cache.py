@@ -0,0 +1,190 @@
+"""
+AntiGravity Ventures — Chat Tool Result Cache
+Deterministik chat tool'larının JSON sonuçları için tool başına TTL'li LRU önbellek.
+
+  - get_procedure_pricing — statik PRICING tablosu (uzun TTL)
+  - search_hospitals      — Postgres sorgusu; yalnızca DB'den gelen sonuç saklanır,
+                            statik fallback saklanmaz. `hospitals` tablosunda commit
+                            edilen her ORM değişikliği bu tool'un kayıtlarını siler.
+
+hospitals_version() aynı sayaçtan türetilir; MedicalAgent'ın eşleştirme indeksi de
+(agents/hospital_match.py) bununla geçersizlenir — tablo için tek değişiklik tespiti.
+
+Argümanlar normalize edilir (küçük harf, boşluk kırpma, boş değerler atılır), böylece
+{"specialty": "Dental "} ile {"specialty": "dental", "country": ""} aynı kayda düşer.
+
+Bu modül bilerek hafiftir — admin endpoint'i chat agent'ı yüklemeden istatistik okuyabilsin.
+"""
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any
+
+# tool → TTL (s); listede olmayan tool'lar hiç önbelleğe alınmaz
+TOOL_CACHE_TTLS: dict[str, float] = {
+    "get_procedure_pricing": 3600.0,
+    "search_hospitals": float(os.getenv("CHAT_HOSPITAL_CACHE_TTL", "300")),
+}
+DEFAULT_MAX_ENTRIES = 512
+
+# İsabeti bir DB sorgusunu atlatan tool'lar
+_DB_BACKED_TOOLS = {"search_hospitals"}
+
+ToolKey = tuple[str, tuple[tuple[str, str], ...]]
+
+
+def normalize_args(args: dict[str, Any]) -> tuple[tuple[str, str], ...]:
+    """Tool argümanları → sıralı, küçük harfli, boşları atılmış anahtar."""
+    return tuple(sorted(
+        (name, str(value).strip().lower())
+        for name, value in args.items()
+        if value is not None and str(value).strip()
+    ))
+
+
+class ToolResultCache:
+    """Thread-safe LRU; kayıt başına tool'unun TTL'i uygulanır, sayaçlar tool başına tutulur."""
+
+    def __init__(self, ttls: dict[str, float] | None = None, max_entries: int = DEFAULT_MAX_ENTRIES) -> None:
+        self.ttls = dict(TOOL_CACHE_TTLS if ttls is None else ttls)
+        self.max_entries = max_entries
+        self._entries: OrderedDict[ToolKey, tuple[float, str]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters: dict[str, dict[str, int]] = {
+            tool: {"hits": 0, "misses": 0, "expirations": 0, "invalidations": 0} for tool in self.ttls
+        }
+        self._generations: dict[str, int] = {tool: 0 for tool in self.ttls}
+        self.evictions = 0
+
+    def cacheable(self, tool: str) -> bool:
+        return self.ttls.get(tool, 0) > 0 and self.max_entries > 0
+
+    def get(self, tool: str, args: dict[str, Any]) -> str | None:
+        if not self.cacheable(tool):
+            return None
+        key = (tool, normalize_args(args))
+        now = time.monotonic()
+        with self._lock:
+            counters = self._counters[tool]
+            entry = self._entries.get(key)
+            if entry is None:
+                counters["misses"] += 1
+                return None
+            expires_at, result = entry
+            if expires_at <= now:
+                del self._entries[key]
+                counters["expirations"] += 1
+                counters["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            counters["hits"] += 1
+            return result
+
+    def generation(self, tool: str) -> int:
+        """Sorgudan önce okunur; arada invalidate olduysa put() sonucu saklamaz."""
+        return self._generations.get(tool, 0)
+
+    def put(self, tool: str, args: dict[str, Any], result: str, generation: int | None = None) -> str:
+        """Sonucu saklar ve aynen döndürür (return tool_cache.put(...) için)."""
+        if not self.cacheable(tool):
+            return result
+        key = (tool, normalize_args(args))
+        with self._lock:
+            if generation is not None and generation != self._generations[tool]:
+                return result   # sorgu sürerken tablo değişti — eski sonucu saklama
+            self._entries[key] = (time.monotonic() + self.ttls[tool], result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+        return result
+
+    def invalidate(self, tool: str) -> None:
+        with self._lock:
+            stale = [key for key in self._entries if key[0] == tool]
+            for key in stale:
+                del self._entries[key]
+            if tool in self._counters:
+                self._generations[tool] += 1
+                self._counters[tool]["invalidations"] += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            sizes: dict[str, int] = {}
+            for tool, _ in self._entries:
+                sizes[tool] = sizes.get(tool, 0) + 1
+            tools = {}
+            for tool, counters in self._counters.items():
+                lookups = counters["hits"] + counters["misses"]
+                tools[tool] = {
+                    "ttl_seconds": self.ttls[tool],
+                    "size": sizes.get(tool, 0),
+                    **counters,
+                    "hit_rate": round(counters["hits"] / lookups, 4) if lookups else 0.0,
+                }
+            return {
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+                "evictions": self.evictions,
+                "db_queries_saved": sum(self._counters[t]["hits"] for t in _DB_BACKED_TOOLS if t in self._counters),
+                "tools": tools,
+            }
+
+
+tool_cache = ToolResultCache()
+
+
+# ---------------------------------------------------------------------------
+# hospitals tablosu değişince search_hospitals kayıtlarını düşür
+# ---------------------------------------------------------------------------
+_watch_lock = threading.Lock()
+_watching = False
+
+
+def watch_hospitals(hospital_model: Any) -> None:
+    """
+    Session flush'ında Hospital ekleme/güncelleme/silme görülürse commit sonrası
+    search_hospitals kayıtlarını siler. İdempotent; ilk DB araması öncesinde çağrılır.
+
+    Yalnızca bu process'teki ORM değişikliklerini görür — bulk UPDATE / başka
+    process'ler için TTL (CHAT_HOSPITAL_CACHE_TTL) üst sınırdır.
+    """
+    global _watching
+    if _watching:
+        return
+    with _watch_lock:
+        if _watching:
+            return
+        from sqlalchemy import event
+        from sqlalchemy.orm import Session
+
+        @event.listens_for(Session, "after_flush")
+        def _mark_hospital_changes(session: Any, _flush_context: Any) -> None:
+            changed = (*session.new, *session.dirty, *session.deleted)
+            if any(isinstance(obj, hospital_model) for obj in changed):
+                session.info["hospitals_changed"] = True
+
+        @event.listens_for(Session, "after_commit")
+        def _invalidate_on_commit(session: Any) -> None:
+            if session.info.pop("hospitals_changed", False):
+                tool_cache.invalidate("search_hospitals")
+
+        @event.listens_for(Session, "after_rollback")
+        def _clear_mark(session: Any) -> None:
+            session.info.pop("hospitals_changed", None)
+
+        _watching = True
+
+
+def hospitals_version() -> tuple[int, int]:
+    """
+    hospitals tablosu için süreç içi sürüm: (commit sayacı, TTL dilimi).
+
+    Bu process'teki commit'ler sayacı hemen artırır; başka process'lerin değişiklikleri
+    search_hospitals ile aynı üst sınırla (CHAT_HOSPITAL_CACHE_TTL) görülür. DB sorgusu yok.
+    """
+    ttl = TOOL_CACHE_TTLS["search_hospitals"]
+    return tool_cache.generation("search_hospitals"), int(time.time() // ttl) if ttl > 0 else 0
@@ -0,0 +1,210 @@
+"""
+AntiGravity Ventures — Streaming Classification Backfill
+Geçmiş mesajları (JSONL/CSV, dosya veya stdin) process havuzunda yeniden sınıflandırır.
+
+KEYWORD_MAPS her değiştiğinde aylarca birikmiş mesajı yeniden sınıflandırmak için:
+  - Girdi satır satır okunur, sonuçlar JSONL olarak sırayla akıtılır
+  - Havuzda en fazla workers × 2 parça bekler — bellek kullanımı girdi boyutundan bağımsız
+  - Sonda stderr'e throughput istatistiği yazılır (msg/s, p50/p99)
+
+Kullanım:
+    python master_orchestrator.py --input messages.jsonl --output results.jsonl
+    cat export.csv | python master_orchestrator.py --input - --format csv --workers 8
+"""
+from __future__ import annotations
+
+import csv
+import json
+import logging
+import math
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Iterable, Iterator, TextIO
+
+logger = logging.getLogger("MasterOrchestrator.backfill")
+
+DEFAULT_CHUNK_SIZE = 256
+
+# Worker process başına tek sınıflandırıcı (initializer ile kurulur)
+_worker_classifier = None
+
+
+# ---------------------------------------------------------------------------
+# Input
+# ---------------------------------------------------------------------------
+
+def read_records(stream: TextIO, fmt: str, text_field: str = "message") -> Iterator[dict[str, Any]]:
+    """JSONL veya CSV girdisini kayıt kayıt okur; mesajı olmayan satırlar atlanır."""
+    if fmt == "csv":
+        for row in csv.DictReader(stream):
+            if row.get(text_field):
+                yield row
+        return
+
+    for line_no, line in enumerate(stream, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            record = json.loads(line)
+        except json.JSONDecodeError:
+            logger.warning(f"Line {line_no}: invalid JSON — skipped")
+            continue
+        if isinstance(record, str):
+            record = {text_field: record}
+        if isinstance(record, dict) and (record.get(text_field) or record.get("text")):
+            yield record
+        else:
+            logger.warning(f"Line {line_no}: no '{text_field}' field — skipped")
+
+
+def _chunks(records: Iterable[dict[str, Any]], size: int) -> Iterator[list[dict[str, Any]]]:
+    chunk: list[dict[str, Any]] = []
+    for record in records:
+        chunk.append(record)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+# ---------------------------------------------------------------------------
+# Worker
+# ---------------------------------------------------------------------------
+
+def _init_worker() -> None:
+    global _worker_classifier
+    logging.getLogger().setLevel(logging.WARNING)
+    from master_orchestrator import RequestClassifier
+    _worker_classifier = RequestClassifier()
+
+
+def _classify_chunk(chunk: list[dict[str, Any]], text_field: str) -> list[tuple[dict[str, Any], float]]:
+    """Bir parçayı sınıflandırır: [(çıktı kaydı, mesaj başına süre µs), ...]"""
+    if _worker_classifier is None:
+        _init_worker()
+    results = []
+    for record in chunk:
+        text = str(record.get(text_field) or record.get("text") or "")
+        started = time.perf_counter()
+        classification = _worker_classifier.classify(text)
+        elapsed_us = (time.perf_counter() - started) * 1e6
+        results.append(({**record, "classification": classification.to_dict()}, elapsed_us))
+    return results
+
+
+# ---------------------------------------------------------------------------
+# Stats
+# ---------------------------------------------------------------------------
+
+class LatencyHistogram:
+    """Log ölçekli kovalarla sabit bellekli yüzdelik hesabı (±%2.5 hassasiyet)."""
+
+    _BASE = 1.05
+
+    def __init__(self) -> None:
+        self._buckets: dict[int, int] = {}
+        self.count = 0
+
+    def add(self, value_us: float) -> None:
+        bucket = int(math.log(max(value_us, 1.0), self._BASE))
+        self._buckets[bucket] = self._buckets.get(bucket, 0) + 1
+        self.count += 1
+
+    def percentile(self, pct: float) -> float:
+        if not self.count:
+            return 0.0
+        target = math.ceil(self.count * pct / 100)
+        seen = 0
+        for bucket in sorted(self._buckets):
+            seen += self._buckets[bucket]
+            if seen >= target:
+                return self._BASE ** (bucket + 0.5)
+        return 0.0
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+
+def run_backfill(
+    source: TextIO,
+    sink: TextIO,
+    fmt: str = "jsonl",
+    text_field: str = "message",
+    workers: int | None = None,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> dict[str, Any]:
+    """
+    Girdiyi akış halinde sınıflandırır ve sonuçları girdi sırasıyla sink'e yazar.
+
+    Returns:
+        Throughput istatistikleri (messages, seconds, msgs_per_sec, p50_us, p99_us).
+    """
+    workers = workers or os.cpu_count() or 1
+    histogram = LatencyHistogram()
+    started = time.perf_counter()
+    chunks = _chunks(read_records(source, fmt, text_field), chunk_size)
+
+    def emit(results: list[tuple[dict[str, Any], float]]) -> None:
+        for record, elapsed_us in results:
+            sink.write(json.dumps(record, ensure_ascii=False) + "\n")
+            histogram.add(elapsed_us)
+        sink.flush()
+
+    if workers == 1:
+        for chunk in chunks:
+            emit(_classify_chunk(chunk, text_field))
+    else:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+            in_flight: deque[Future] = deque()
+            for chunk in chunks:
+                in_flight.append(pool.submit(_classify_chunk, chunk, text_field))
+                # Sıra korunur; en eski parça bitmeden yeni parça okunmaz → sabit bellek
+                if len(in_flight) >= workers * 2:
+                    emit(in_flight.popleft().result())
+            while in_flight:
+                emit(in_flight.popleft().result())
+
+    seconds = time.perf_counter() - started
+    return {
+        "messages": histogram.count,
+        "seconds": round(seconds, 3),
+        "msgs_per_sec": round(histogram.count / seconds, 1) if seconds else 0.0,
+        "p50_us": round(histogram.percentile(50), 1),
+        "p99_us": round(histogram.percentile(99), 1),
+        "workers": workers,
+    }
+
+
+def main(args) -> None:
+    """master_orchestrator CLI'ından çağrılır (--input verildiğinde)."""
+    logging.getLogger().setLevel(logging.WARNING)
+    source = sys.stdin if args.input == "-" else open(args.input, encoding="utf-8", newline="")
+    sink = sys.stdout if args.output == "-" else open(args.output, "w", encoding="utf-8")
+    fmt = args.format or ("csv" if args.input.endswith(".csv") else "jsonl")
+    try:
+        stats = run_backfill(
+            source,
+            sink,
+            fmt=fmt,
+            text_field=args.text_field,
+            workers=args.workers,
+            chunk_size=args.chunk_size,
+        )
+    finally:
+        if source is not sys.stdin:
+            source.close()
+        if sink is not sys.stdout:
+            sink.close()
+
+    print(
+        f"Classified {stats['messages']} messages in {stats['seconds']}s "
+        f"({stats['msgs_per_sec']} msg/s, {stats['workers']} workers) — "
+        f"p50={stats['p50_us']}µs p99={stats['p99_us']}µs",
+        file=sys.stderr,
+    )
@@ -0,0 +1 @@
+# AntiGravity ThaiTurk — Benchmarks package
@@ -0,0 +1,129 @@
+"""
+AntiGravity Ventures — Chat History Query Plan Check
+/api/chat/history sorgularının (routers/chat.py::_history_page_query) Postgres
+planını EXPLAIN (ANALYZE) ile doğrular: her sayfa ix_chat_messages_session_created
+üzerinde Index Scan olmalı, Sort / Seq Scan olmamalı.
+
+Veri tek bir transaction içinde üretilir (uzun bir thread + çok sayıda kısa oturum),
+ANALYZE edilir, planlar alınır ve ROLLBACK ile geri alınır — tablo değişmez.
+
+Kullanım (migration 004 uygulanmış yerel Postgres):
+    cd 02_backend && alembic upgrade head
+    cd 04_ai_agents
+    DATABASE_URL=postgresql://localhost/thaiturk python -m benchmarks.chat_history_plan
+
+Çıkış kodu 1 → en az bir sorgu beklenen planı kullanmıyor. Aynı kontrol pytest olarak:
+02_backend/tests/test_chat_history_plan.py (make test).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent.parent / "02_backend"))
+
+from sqlalchemy import select, text  # noqa: E402
+
+from database.connection import engine  # noqa: E402
+from database.models import ChatMessage  # noqa: E402
+from routers.chat import HISTORY_PAGE_DEFAULT, EXPORT_BATCH_SIZE, _history_page_query  # noqa: E402
+
+INDEX_NAME = "ix_chat_messages_session_created"
+LONG_SESSION = "plan-check-long"
+
+SEED_SQL = """
+INSERT INTO chat_sessions (session_id, language)
+SELECT 'plan-check-' || s, 'en' FROM generate_series(1, :sessions) AS s
+UNION ALL SELECT :long_session, 'en';
+
+INSERT INTO chat_messages (message_id, session_id, role, content, created_at)
+SELECT 'plan-' || s || '-' || m, 'plan-check-' || s, 'user', 'short thread message',
+       now() - interval '1 day' + m * interval '1 second'
+FROM generate_series(1, :sessions) AS s, generate_series(1, :per_session) AS m
+UNION ALL
+SELECT 'plan-long-' || m, :long_session, CASE WHEN m % 2 = 0 THEN 'assistant' ELSE 'user' END,
+       'long thread message', now() - interval '1 day' + (m / 3) * interval '1 second'
+FROM generate_series(1, :long_messages) AS m;
+
+ANALYZE chat_messages;
+"""
+
+
+def _nodes(plan: dict[str, Any]) -> list[dict[str, Any]]:
+    found = [plan]
+    for child in plan.get("Plans", []):
+        found.extend(_nodes(child))
+    return found
+
+
+def _explain(connection: Any, stmt: Any) -> dict[str, Any]:
+    compiled = stmt.compile(dialect=connection.dialect)
+    rows = connection.exec_driver_sql(
+        "EXPLAIN (ANALYZE, BUFFERS, FORMAT JSON) " + str(compiled), compiled.params
+    ).scalar()
+    plan = (rows if isinstance(rows, list) else json.loads(rows))[0]
+    nodes = _nodes(plan["Plan"])
+    node_types = [n["Node Type"] for n in nodes]
+    uses_index = any(n.get("Index Name") == INDEX_NAME for n in nodes)
+    return {
+        "nodes": node_types,
+        "index": uses_index,
+        "ok": uses_index and "Sort" not in node_types and "Seq Scan" not in node_types,
+        "execution_ms": plan["Execution Time"],
+        "shared_buffers_hit": plan["Plan"].get("Shared Hit Blocks", 0),
+    }
+
+
+def run(sessions: int, per_session: int, long_messages: int) -> dict[str, Any]:
+    with engine.connect() as connection:
+        transaction = connection.begin()
+        try:
+            for statement in filter(None, (s.strip() for s in SEED_SQL.split(";"))):
+                connection.execute(text(statement), {
+                    "sessions": sessions, "per_session": per_session,
+                    "long_session": LONG_SESSION, "long_messages": long_messages,
+                })
+
+            def cursor_at(position: int) -> tuple[Any, str]:
+                row = connection.execute(
+                    select(ChatMessage.created_at, ChatMessage.message_id)
+                    .where(ChatMessage.message_id == f"plan-long-{position}")
+                ).one()
+                return row.created_at, row.message_id
+
+            middle = cursor_at(long_messages // 2)
+            page = HISTORY_PAGE_DEFAULT + 1
+            queries = {
+                "newest_page": _history_page_query(LONG_SESSION, page),
+                "before_cursor": _history_page_query(LONG_SESSION, page, middle),
+                "after_cursor": _history_page_query(LONG_SESSION, page, middle, forward=True),
+                "export_batch": _history_page_query(LONG_SESSION, EXPORT_BATCH_SIZE, middle, forward=True),
+            }
+            return {name: _explain(connection, stmt) for name, stmt in queries.items()}
+        finally:
+            transaction.rollback()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Chat history EXPLAIN check")
+    parser.add_argument("--sessions", type=int, default=2000)
+    parser.add_argument("--per-session", type=int, default=20)
+    parser.add_argument("--long-messages", type=int, default=50000)
+    args = parser.parse_args()
+
+    if engine.dialect.name != "postgresql":
+        sys.exit(f"Postgres required (DATABASE_URL dialect: {engine.dialect.name})")
+    result = run(args.sessions, args.per_session, args.long_messages)
+    print(json.dumps(result, indent=2))
+    failed = [name for name, plan in result.items() if not plan["ok"]]
+    if failed:
+        print(f"FAIL: {', '.join(failed)} not served by {INDEX_NAME} without Sort")
+        sys.exit(1)
+    print(f"OK: all history queries use {INDEX_NAME}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,96 @@
+"""
+AntiGravity Ventures — Chat Concurrency Load Test
+/api/chat/message'a artan eşzamanlılıkla istek gönderir; tamamlanan sohbet/s ve
+gecikme yüzdeliklerini raporlar.
+
+Sync route her sohbet için model yanıtı boyunca bir threadpool thread'i tutar
+(Starlette varsayılanı 40); async pipeline'da sınır model API'sinin kendisidir.
+
+Kullanım (model yerine yerel stub — ücretsiz ve deterministik):
+    cd 04_ai_agents
+    python -m benchmarks.stub_anthropic --port 8999 --ttft-ms 1000 &
+
+    cd 02_backend
+    export ANTHROPIC_BASE_URL=http://127.0.0.1:8999 ANTHROPIC_API_KEY=stub RATELIMIT_ENABLED=false
+    CHAT_ASYNC_PIPELINE=0 uvicorn main:app --port 8000     # önce: sync route
+    CHAT_ASYNC_PIPELINE=1 uvicorn main:app --port 8000     # sonra: async pipeline
+
+    cd 04_ai_agents
+    python -m benchmarks.chat_load --base-url http://127.0.0.1:8000 --concurrency 10 50 100 200
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import statistics
+import time
+from typing import Any
+
+import httpx
+
+
+async def _run_level(client: httpx.AsyncClient, concurrency: int, message: str) -> dict[str, Any]:
+    """`concurrency` oturum açar ve her birinden aynı anda bir mesaj gönderir."""
+    sessions = await asyncio.gather(*(
+        client.post("/api/chat/session", json={"language": "en"}) for _ in range(concurrency)
+    ))
+    session_ids = [r.json()["session_id"] for r in sessions if r.status_code == 200]
+    if len(session_ids) < concurrency:
+        raise RuntimeError(f"Could not open {concurrency} sessions (got {len(session_ids)}) — is the DB up?")
+
+    latencies: list[float] = []
+    errors: dict[str, int] = {}
+
+    async def one(session_id: str) -> None:
+        started = time.perf_counter()
+        try:
+            response = await client.post("/api/chat/message", json={"session_id": session_id, "message": message})
+        except httpx.HTTPError as e:
+            errors[type(e).__name__] = errors.get(type(e).__name__, 0) + 1
+            return
+        if response.status_code != 200:
+            errors[str(response.status_code)] = errors.get(str(response.status_code), 0) + 1
+            return
+        latencies.append(time.perf_counter() - started)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(sid) for sid in session_ids))
+    wall = time.perf_counter() - started
+
+    latencies.sort()
+    return {
+        "concurrency": concurrency,
+        "completed": len(latencies),
+        "errors": errors,
+        "wall_s": round(wall, 2),
+        "chats_per_s": round(len(latencies) / wall, 1) if wall else 0.0,
+        "p50_ms": round(statistics.median(latencies) * 1000) if latencies else None,
+        "p99_ms": round(latencies[max(int(len(latencies) * 0.99) - 1, 0)] * 1000) if latencies else None,
+    }
+
+
+async def run(base_url: str, levels: list[int], message: str, timeout: float) -> list[dict[str, Any]]:
+    limits = httpx.Limits(max_connections=max(levels) * 2, max_keepalive_connections=max(levels))
+    async with httpx.AsyncClient(base_url=base_url, timeout=timeout, limits=limits) as client:
+        return [await _run_level(client, level, message) for level in levels]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Concurrent chat load test")
+    parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[10, 50, 100, 200])
+    parser.add_argument("--message", default="Hello, I am interested in a hair transplant.")
+    parser.add_argument("--timeout", type=float, default=120.0)
+    args = parser.parse_args()
+
+    rows = asyncio.run(run(args.base_url, args.concurrency, args.message, args.timeout))
+    print(f"{'conc':>5} {'done':>5} {'wall s':>7} {'chats/s':>8} {'p50 ms':>7} {'p99 ms':>7}  errors")
+    for row in rows:
+        print(
+            f"{row['concurrency']:>5} {row['completed']:>5} {row['wall_s']:>7} {row['chats_per_s']:>8} "
+            f"{row['p50_ms']!s:>7} {row['p99_ms']!s:>7}  {row['errors'] or '-'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,244 @@
+"""
+AntiGravity Ventures — Classifier Accuracy & Latency Benchmark
+RequestClassifier ve MedicalAgent._classify_procedure için doğruluk + hız ölçümü.
+
+Ölçülenler (benchmarks/corpus.py'deki etiketli TR/EN/RU/AR/TH/ZH korpusu üzerinde):
+  - Sektör / kategori başına precision, recall, F1; dil başına accuracy
+  - Çağrı başına gecikme p50/p95/p99 (µs, önbellek kapalı)
+  - Çağrı başına bellek ayırma (tracemalloc peak, byte)
+
+Sonuçlar JSON olarak yazılır. Kayıtlı baseline'a göre doğruluk veya gecikme eşiği
+aşılırsa çıkış kodu 1 olur (CI'da kullanılabilir). Gecikme değerleri makineye
+bağlıdır — baseline'ı CI'ın çalıştığı makinede --write-baseline ile üretin.
+
+Kullanım:
+    cd 04_ai_agents
+    python -m benchmarks.classifier_accuracy                 # ölç + baseline ile karşılaştır
+    python -m benchmarks.classifier_accuracy --write-baseline
+    python -m benchmarks.classifier_accuracy --output results.json --rounds 20
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from benchmarks.corpus import Sample, procedure_corpus, sector_corpus  # noqa: E402
+from master_orchestrator import RequestClassifier  # noqa: E402
+from agents.medical_agent import MedicalAgent  # noqa: E402
+
+BASELINE_FILE = Path(__file__).parent / "baselines" / "classifier_accuracy.json"
+
+# Varsayılan regresyon eşikleri
+MAX_ACCURACY_DROP = 0.01        # mutlak (ör. recall 0.80 → 0.79 sınırda)
+MAX_LATENCY_REGRESSION = 0.25   # göreli (p50/p95 %25'ten fazla yavaşlarsa)
+MAX_ALLOC_REGRESSION = 0.25     # göreli (çağrı başına peak bellek)
+
+
+# ---------------------------------------------------------------------------
+# Metrics
+# ---------------------------------------------------------------------------
+def accuracy_report(samples: list[Sample], predictions: list[str]) -> dict[str, Any]:
+    """Etiket başına precision/recall/F1, makro F1 ve dil başına accuracy."""
+    labels = sorted({s.label for s in samples} | set(predictions))
+    per_label: dict[str, dict[str, float]] = {}
+    for label in labels:
+        tp = sum(1 for s, p in zip(samples, predictions) if p == label and s.label == label)
+        fp = sum(1 for s, p in zip(samples, predictions) if p == label and s.label != label)
+        fn = sum(1 for s, p in zip(samples, predictions) if p != label and s.label == label)
+        precision = tp / (tp + fp) if tp + fp else 0.0
+        recall = tp / (tp + fn) if tp + fn else 0.0
+        f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+        per_label[label] = {
+            "precision": round(precision, 4),
+            "recall": round(recall, 4),
+            "f1": round(f1, 4),
+            "support": tp + fn,
+        }
+
+    per_language: dict[str, float] = {}
+    for lang in sorted({s.language for s in samples}):
+        pairs = [(s, p) for s, p in zip(samples, predictions) if s.language == lang]
+        per_language[lang] = round(sum(1 for s, p in pairs if s.label == p) / len(pairs), 4)
+
+    supported = [m for m in per_label.values() if m["support"]]
+    return {
+        "samples": len(samples),
+        "accuracy": round(sum(1 for s, p in zip(samples, predictions) if s.label == p) / len(samples), 4),
+        "macro_f1": round(sum(m["f1"] for m in supported) / len(supported), 4),
+        "per_label": per_label,
+        "per_language": per_language,
+    }
+
+
+def latency_report(fn: Callable[[str], Any], texts: list[str], rounds: int) -> dict[str, float]:
+    """Çağrı başına gecikme yüzdelikleri (µs)."""
+    for text in texts:   # ısınma
+        fn(text)
+    samples: list[float] = []
+    for _ in range(rounds):
+        for text in texts:
+            started = time.perf_counter()
+            fn(text)
+            samples.append((time.perf_counter() - started) * 1e6)
+    samples.sort()
+    return {
+        "calls": len(samples),
+        "p50_us": round(statistics.median(samples), 2),
+        "p95_us": round(samples[int(len(samples) * 0.95) - 1], 2),
+        "p99_us": round(samples[int(len(samples) * 0.99) - 1], 2),
+    }
+
+
+def allocation_report(fn: Callable[[str], Any], texts: list[str]) -> dict[str, float]:
+    """Çağrı başına tracemalloc peak (byte) — ortalama ve en kötü durum."""
+    peaks: list[int] = []
+    tracemalloc.start()
+    try:
+        for text in texts:
+            tracemalloc.reset_peak()
+            baseline, _ = tracemalloc.get_traced_memory()
+            fn(text)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - baseline)
+    finally:
+        tracemalloc.stop()
+    return {
+        "peak_bytes_mean": round(statistics.fmean(peaks), 1),
+        "peak_bytes_max": max(peaks),
+    }
+
+
+# ---------------------------------------------------------------------------
+# Runner
+# ---------------------------------------------------------------------------
+def run(rounds: int = 20) -> dict[str, Any]:
+    classifier = RequestClassifier(cache_size=0)   # her çağrı gerçek sınıflandırma
+    agent = MedicalAgent()
+
+    def classify(text: str) -> str:
+        return classifier.classify(text).sector.value
+
+    sectors = sector_corpus()
+    procedures = procedure_corpus()
+    sector_texts = [s.text for s in sectors]
+    procedure_texts = [s.text for s in procedures]
+
+    return {
+        "keywords_version": classifier.keywords_version,
+        "backend": classifier.backend,
+        "classifier": {
+            "accuracy": accuracy_report(sectors, [classify(t) for t in sector_texts]),
+            "latency": latency_report(classifier.classify, sector_texts, rounds),
+            "allocations": allocation_report(classifier.classify, sector_texts),
+        },
+        "procedure": {
+            "accuracy": accuracy_report(procedures, [agent._classify_procedure(t) for t in procedure_texts]),
+            "latency": latency_report(agent._classify_procedure, procedure_texts, rounds),
+            "allocations": allocation_report(agent._classify_procedure, procedure_texts),
+        },
+    }
+
+
+def compare(
+    current: dict[str, Any],
+    baseline: dict[str, Any],
+    max_accuracy_drop: float = MAX_ACCURACY_DROP,
+    max_latency_regression: float = MAX_LATENCY_REGRESSION,
+    max_alloc_regression: float = MAX_ALLOC_REGRESSION,
+) -> list[str]:
+    """Baseline'a göre regresyonları döndürür (boş liste = geçti)."""
+    failures: list[str] = []
+    for target in ("classifier", "procedure"):
+        cur, base = current[target], baseline.get(target)
+        if not base:
+            continue
+
+        accuracy_checks = [("macro_f1", cur["accuracy"]["macro_f1"], base["accuracy"]["macro_f1"])]
+        for label, metrics in base["accuracy"]["per_label"].items():
+            now = cur["accuracy"]["per_label"].get(label, {"precision": 0.0, "recall": 0.0})
+            accuracy_checks.append((f"{label}.precision", now["precision"], metrics["precision"]))
+            accuracy_checks.append((f"{label}.recall", now["recall"], metrics["recall"]))
+        for name, now, before in accuracy_checks:
+            if now < before - max_accuracy_drop:
+                failures.append(f"{target} {name}: {before:.4f} → {now:.4f}")
+
+        for key in ("p50_us", "p95_us"):
+            now, before = cur["latency"][key], base["latency"][key]
+            if now > before * (1 + max_latency_regression):
+                failures.append(f"{target} latency {key}: {before} → {now} (+{now / before - 1:.0%})")
+
+        now, before = cur["allocations"]["peak_bytes_mean"], base["allocations"]["peak_bytes_mean"]
+        if now > before * (1 + max_alloc_regression):
+            failures.append(f"{target} allocations peak_bytes_mean: {before} → {now} (+{now / before - 1:.0%})")
+    return failures
+
+
+def _print_summary(results: dict[str, Any]) -> None:
+    for target in ("classifier", "procedure"):
+        report = results[target]
+        accuracy, latency, allocs = report["accuracy"], report["latency"], report["allocations"]
+        print(f"\n== {target} ({accuracy['samples']} samples) ==")
+        print(f"accuracy={accuracy['accuracy']:.3f}  macro_f1={accuracy['macro_f1']:.3f}")
+        print(f"{'label':>14} {'precision':>10} {'recall':>8} {'f1':>6} {'support':>8}")
+        for label, m in accuracy["per_label"].items():
+            print(f"{label:>14} {m['precision']:>10.3f} {m['recall']:>8.3f} {m['f1']:>6.3f} {m['support']:>8}")
+        print("per language: " + "  ".join(f"{lang}={acc:.2f}" for lang, acc in accuracy["per_language"].items()))
+        print(
+            f"latency p50={latency['p50_us']}µs p95={latency['p95_us']}µs p99={latency['p99_us']}µs  "
+            f"alloc peak mean={allocs['peak_bytes_mean']}B max={allocs['peak_bytes_max']}B"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Classifier accuracy & latency benchmark")
+    parser.add_argument("--rounds", type=int, default=20, help="Gecikme ölçümü için korpus tekrarı")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_FILE)
+    parser.add_argument("--write-baseline", action="store_true", help="Sonuçları baseline olarak kaydet")
+    parser.add_argument("--output", type=Path, help="Sonuçları JSON olarak bu dosyaya yaz")
+    parser.add_argument("--max-accuracy-drop", type=float, default=MAX_ACCURACY_DROP)
+    parser.add_argument("--max-latency-regression", type=float, default=MAX_LATENCY_REGRESSION)
+    parser.add_argument("--max-alloc-regression", type=float, default=MAX_ALLOC_REGRESSION)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    results = run(args.rounds)
+    _print_summary(results)
+
+    if args.output:
+        args.output.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    if args.write_baseline:
+        args.baseline.parent.mkdir(parents=True, exist_ok=True)
+        args.baseline.write_text(json.dumps(results, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+        print(f"\nBaseline written: {args.baseline}")
+        return
+
+    if not args.baseline.exists():
+        print(f"\nNo baseline at {args.baseline} — run with --write-baseline first.")
+        return
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    failures = compare(
+        results,
+        baseline,
+        max_accuracy_drop=args.max_accuracy_drop,
+        max_latency_regression=args.max_latency_regression,
+        max_alloc_regression=args.max_alloc_regression,
+    )
+    if failures:
+        print("\nREGRESSION vs baseline:")
+        for failure in failures:
+            print(f"  - {failure}")
+        sys.exit(1)
+    print("\nNo regression vs baseline.")
+
+
+if __name__ == "__main__":
+    main()
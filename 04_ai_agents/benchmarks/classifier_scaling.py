@@ -0,0 +1,118 @@
+"""
+AntiGravity Ventures — Classifier Scaling Benchmark
+KEYWORD_MAPS 1x / 10x / 100x büyüdükçe istek başına sınıflandırma gecikmesi.
+
+Eski yöntem (anahtar kelime başına bir regex) ile Aho-Corasick KeywordMatcher
+aynı mesaj seti üzerinde karşılaştırılır.
+
+Kullanım:
+    cd 04_ai_agents
+    python -m benchmarks.classifier_scaling --factors 1 10 100
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import re
+import statistics
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from master_orchestrator import KEYWORD_MAPS, KeywordMatcher, Sector  # noqa: E402
+
+SAMPLE_MESSAGES = [
+    "Hello, I need a hair transplant price for next month in Istanbul",
+    "Здравствуйте, нужна ринопластика и отель в Пхукете на 5 ночей",
+    "Merhaba, saç ekimi için klinik ve otel rezervasyonu istiyorum",
+    "We are a textile factory looking for a wholesale fabric supplier, MOQ 500",
+    "Need a google ads campaign and SEO content for our dental clinic",
+    "сколько стоит пересадка волос",
+    "Booking a deluxe room with breakfast, check-in on Friday",
+    "Can you send the quotation for garment production and shipment?",
+]
+
+
+class _RegexBaseline:
+    """Eski RequestClassifier eşleştirmesi: her anahtar kelime için ayrı regex."""
+
+    def __init__(self, keyword_maps: dict[Sector, list[str]]) -> None:
+        self._keyword_maps = keyword_maps
+        self._patterns = {
+            sector: [re.compile(rf"\b{re.escape(kw)}\b", re.IGNORECASE | re.UNICODE) for kw in keywords]
+            for sector, keywords in keyword_maps.items()
+        }
+
+    def match(self, text: str) -> dict[Sector, list[str]]:
+        found: dict[Sector, list[str]] = {}
+        for sector, patterns in self._patterns.items():
+            hits = [self._keyword_maps[sector][i] for i, p in enumerate(patterns) if p.search(text)]
+            if hits:
+                found[sector] = hits
+        return found
+
+
+def grow_keyword_maps(factor: int) -> dict[Sector, list[str]]:
+    """Her sektörün sözlüğünü `factor` katına çıkarır (türetilmiş sentetik terimlerle)."""
+    grown: dict[Sector, list[str]] = {}
+    for sector, keywords in KEYWORD_MAPS.items():
+        extended = list(keywords)
+        for n in range(1, factor):
+            extended.extend(f"{kw} {sector.value.lower()}{n}" for kw in keywords)
+        grown[sector] = extended
+    return grown
+
+
+def _per_request_us(matcher, messages: list[str], rounds: int) -> tuple[float, float]:
+    samples: list[float] = []
+    for _ in range(rounds):
+        for text in messages:
+            start = time.perf_counter()
+            matcher.match(text)
+            samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def run(factors: list[int], rounds: int) -> list[dict]:
+    rows = []
+    for factor in factors:
+        keyword_maps = grow_keyword_maps(factor)
+        total = sum(len(v) for v in keyword_maps.values())
+        baseline = _RegexBaseline(keyword_maps)
+        automaton = KeywordMatcher(keyword_maps)
+        for text in SAMPLE_MESSAGES:
+            assert baseline.match(text) == automaton.match(text), text
+        regex_p50, regex_p99 = _per_request_us(baseline, SAMPLE_MESSAGES, rounds)
+        ac_p50, ac_p99 = _per_request_us(automaton, SAMPLE_MESSAGES, rounds)
+        rows.append({
+            "factor": factor,
+            "keywords": total,
+            "regex_p50_us": regex_p50,
+            "regex_p99_us": regex_p99,
+            "automaton_p50_us": ac_p50,
+            "automaton_p99_us": ac_p99,
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Classifier scaling benchmark")
+    parser.add_argument("--factors", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    print(f"{'factor':>6} {'keywords':>9} {'regex p50':>11} {'regex p99':>11} {'AC p50':>9} {'AC p99':>9}  (µs/request)")
+    for row in run(args.factors, args.rounds):
+        print(
+            f"{row['factor']:>5}x {row['keywords']:>9} "
+            f"{row['regex_p50_us']:>11.1f} {row['regex_p99_us']:>11.1f} "
+            f"{row['automaton_p50_us']:>9.1f} {row['automaton_p99_us']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,156 @@
+"""
+AntiGravity Ventures — Labeled Benchmark Corpus
+Sınıflandırıcı doğruluk ölçümü için etiketli, çok dilli (TR/EN/RU/AR/TH/ZH) mesaj seti.
+
+Kaynaklar:
+  - data/keywords.json   : dil gruplarındaki anahtar kelimeler şablon cümlelere yerleştirilir
+                           (TR/EN/RU sektör + prosedür örnekleri)
+  - skills/blog_seed_data: 10 yazı × 6 dil başlık/özet → Medical + prosedür kategorisi
+  - sohbet cümleleri      : her dilde sektörsüz mesajlar → Unknown
+
+Üretim deterministiktir (sabit seed); aynı sözlük sürümü aynı korpusu verir.
+"""
+from __future__ import annotations
+
+import json
+import random
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import keyword_store  # noqa: E402
+from skills.blog_seed_data import BLOG_POSTS  # noqa: E402
+
+LANGUAGES = ("tr", "en", "ru", "ar", "th", "zh")
+UNKNOWN = "Unknown"
+OTHER = "other"
+
+
+@dataclass(frozen=True)
+class Sample:
+    text: str
+    label: str        # sektör adı veya prosedür kategorisi
+    language: str
+    source: str       # keywords | blog | chitchat
+
+
+SECTOR_TEMPLATES: dict[str, list[str]] = {
+    "tr": [
+        "Merhaba, {kw} hakkında bilgi almak istiyorum.",
+        "{kw} ve {kw2} için fiyat alabilir miyim?",
+        "Gelecek ay {kw} konusunda yardıma ihtiyacımız var.",
+    ],
+    "en": [
+        "Hello, I would like some information about {kw}.",
+        "Could you send details on {kw} and {kw2}?",
+        "We need help with {kw} next month.",
+    ],
+    "ru": [
+        "Здравствуйте, хочу узнать подробнее про {kw}.",
+        "Пришлите, пожалуйста, информацию: {kw} и {kw2}.",
+        "В следующем месяце нам нужна помощь: {kw}.",
+    ],
+}
+
+PROCEDURE_TEMPLATES: dict[str, list[str]] = {
+    "tr": ["Antalya'da {kw} yaptırmak istiyorum.", "{kw} için randevu alabilir miyim?"],
+    "en": ["I would like to book {kw} in Istanbul.", "Do you offer {kw} at partner hospitals?"],
+    "ru": ["Хочу сделать {kw} в Стамбуле.", "Интересует {kw}, пришлите цены."],
+}
+
+CHITCHAT: dict[str, list[str]] = {
+    "tr": ["Merhaba, nasılsınız?", "Çok teşekkürler, iyi günler!", "Yarın size tekrar yazacağım."],
+    "en": ["Hello, how are you today?", "Thanks a lot, have a nice day!", "I will write to you again tomorrow."],
+    "ru": ["Привет, как дела?", "Спасибо большое, хорошего дня!", "Напишу вам завтра ещё раз."],
+    "ar": ["مرحبا، كيف حالك؟", "شكرا جزيلا، يوم سعيد!", "سأكتب لك مرة أخرى غدا."],
+    "th": ["สวัสดีครับ สบายดีไหม", "ขอบคุณมากครับ ขอให้เป็นวันที่ดี", "พรุ่งนี้ผมจะเขียนมาอีกครั้ง"],
+    "zh": ["你好，最近怎么样？", "非常感谢，祝你愉快！", "我明天再给你写信。"],
+}
+
+# Blog kategorisi → medical_agent prosedür kategorisi (rehber yazısı prosedür içermez)
+BLOG_PROCEDURE_CATEGORIES: dict[str, str] = {
+    "hair_transplant": "hair",
+    "rhinoplasty": "aesthetic",
+    "dental": "dental",
+    "ivf": "ivf",
+    "eye_surgery": "ophthalmology",
+    "bbl": "aesthetic",
+    "breast": "aesthetic",
+    "bariatric": "bariatric",
+    "facelift": "aesthetic",
+}
+
+
+def _load_groups(path: Path | None = None) -> dict:
+    with open(path or keyword_store.KEYWORDS_FILE, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _unambiguous(sectors: dict[str, dict[str, list[str]]]) -> dict[str, dict[str, list[str]]]:
+    """Birden çok sektörde geçen anahtar kelimeler etiketi belirsizleştirir — çıkarılır."""
+    owners: dict[str, set[str]] = {}
+    for sector, groups in sectors.items():
+        for keywords in groups.values():
+            for kw in keywords:
+                owners.setdefault(kw.casefold(), set()).add(sector)
+    return {
+        sector: {
+            lang: [kw for kw in keywords if len(owners[kw.casefold()]) == 1]
+            for lang, keywords in groups.items()
+        }
+        for sector, groups in sectors.items()
+    }
+
+
+def sector_corpus(seed: int = 7, path: Path | None = None) -> list[Sample]:
+    """RequestClassifier için etiketli örnekler (sektör adı veya Unknown)."""
+    rng = random.Random(seed)
+    document = _load_groups(path)
+    samples: list[Sample] = []
+
+    for sector, groups in _unambiguous(document["sectors"]).items():
+        for lang, keywords in groups.items():
+            templates = SECTOR_TEMPLATES.get(lang)
+            if not templates:
+                continue
+            for kw in keywords:
+                template = rng.choice(templates)
+                kw2 = rng.choice(keywords)
+                samples.append(Sample(template.format(kw=kw, kw2=kw2), sector, lang, "keywords"))
+
+    for post in BLOG_POSTS:
+        for lang, translation in post["translations"].items():
+            for text in (translation["title"], translation["excerpt"]):
+                samples.append(Sample(text, "Medical", lang, "blog"))
+
+    for lang, sentences in CHITCHAT.items():
+        samples.extend(Sample(text, UNKNOWN, lang, "chitchat") for text in sentences)
+    return samples
+
+
+def procedure_corpus(seed: int = 7, path: Path | None = None) -> list[Sample]:
+    """MedicalAgent._classify_procedure için etiketli örnekler (kategori veya 'other')."""
+    rng = random.Random(seed)
+    document = _load_groups(path)
+    samples: list[Sample] = []
+
+    for lang, mapping in document.get("procedure_categories", {}).items():
+        templates = PROCEDURE_TEMPLATES.get(lang)
+        if not templates:
+            continue
+        for kw, category in mapping.items():
+            samples.append(Sample(rng.choice(templates).format(kw=kw), category, lang, "keywords"))
+
+    for post in BLOG_POSTS:
+        category = BLOG_PROCEDURE_CATEGORIES.get(post["category"])
+        if category is None:
+            continue
+        for lang, translation in post["translations"].items():
+            samples.append(Sample(translation["title"], category, lang, "blog"))
+
+    for lang, sentences in CHITCHAT.items():
+        samples.extend(Sample(text, OTHER, lang, "chitchat") for text in sentences)
+    return samples
+
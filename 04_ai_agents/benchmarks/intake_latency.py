@@ -0,0 +1,105 @@
+"""
+AntiGravity Ventures — Chat Intake Latency Benchmark
+Chat agent'ın submit_patient_inquiry tool'unun uçtan uca gecikmesi: HTTP loopback
+(HttpIntakeTransport) ile process içi çağrı (routers.medical.InProcessIntakeTransport).
+
+Ölçülen: _submit_patient_inquiry_to_backend() — tool'un kendisi, fallback dahil.
+Fallback'e düşen çağrılar ayrıca sayılır (ölçüm hatalı servise karşı yapılmasın).
+
+Kullanım:
+    # HTTP (önce): backend ayrı process'te çalışıyor olmalı
+    cd 02_backend && RATELIMIT_ENABLED=false uvicorn main:app --port 8000
+    cd 04_ai_agents
+    python -m benchmarks.intake_latency --transport http --base-url http://127.0.0.1:8000
+
+    # Process içi (sonra): backend modülleri bu process'e yüklenir, DATABASE_URL kullanılır
+    python -m benchmarks.intake_latency --transport inprocess
+
+    --concurrency N: N çağrı aynı anda (chat tool havuzundaki gibi)
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import logging
+import statistics
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from agents import chat_agent  # noqa: E402
+from agents.intake_transport import HttpIntakeTransport, IntakeTransport, set_intake_transport  # noqa: E402
+
+SAMPLE_ARGS = {
+    "full_name": "Benchmark Patient",
+    "phone": "+66 81 234 5678",
+    "language": "en",
+    "procedure_interest": "hair transplant FUE",
+    "urgency": "soon",
+    "budget_usd": 3000,
+    "notes": "intake_latency benchmark",
+}
+
+
+def _inprocess_transport() -> IntakeTransport:
+    backend = Path(__file__).parent.parent.parent / "02_backend"
+    sys.path.insert(0, str(backend))
+    from routers.medical import InProcessIntakeTransport
+    return InProcessIntakeTransport()
+
+
+def _call() -> tuple[float, bool]:
+    """→ (gecikme ms, gerçek intake mi — fallback stub değil)"""
+    started = time.perf_counter()
+    result = json.loads(chat_agent._submit_patient_inquiry_to_backend(SAMPLE_ARGS))
+    return (time.perf_counter() - started) * 1000, "matched_hospital" in result
+
+
+def run(transport: IntakeTransport, calls: int, concurrency: int, warmup: int = 5) -> dict[str, Any]:
+    set_intake_transport(transport)
+    for _ in range(warmup):
+        _call()
+
+    started = time.perf_counter()
+    if concurrency <= 1:
+        samples = [_call() for _ in range(calls)]
+    else:
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            samples = list(pool.map(lambda _: _call(), range(calls)))
+    wall = time.perf_counter() - started
+
+    latencies = sorted(ms for ms, _ in samples)
+    return {
+        "transport": transport.name,
+        "calls": calls,
+        "concurrency": concurrency,
+        "fallbacks": sum(1 for _, ok in samples if not ok),
+        "calls_per_s": round(calls / wall, 1),
+        "p50_ms": round(statistics.median(latencies), 2),
+        "p95_ms": round(latencies[int(len(latencies) * 0.95) - 1], 2),
+        "p99_ms": round(latencies[int(len(latencies) * 0.99) - 1], 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Chat intake latency benchmark")
+    parser.add_argument("--transport", choices=["http", "inprocess"], required=True)
+    parser.add_argument("--base-url", help="http: backend URL (varsayılan INTAKE_API_URL / localhost:PORT)")
+    parser.add_argument("--calls", type=int, default=200)
+    parser.add_argument("--concurrency", type=int, default=1)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    transport = HttpIntakeTransport(args.base_url) if args.transport == "http" else _inprocess_transport()
+    result = run(transport, args.calls, args.concurrency)
+    print(json.dumps(result, indent=2))
+    if result["fallbacks"]:
+        print(f"WARNING: {result['fallbacks']} calls fell back to the stub — is the backend / DB up?")
+
+
+if __name__ == "__main__":
+    main()
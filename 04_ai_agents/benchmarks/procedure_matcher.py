@@ -0,0 +1,115 @@
+"""
+AntiGravity Ventures — Procedure Matcher Benchmark
+MedicalAgent._classify_procedure: eski alt-dize taraması (sözlük sırasıyla ilk `in`
+eşleşmesi) ile derlenmiş trie (agents/procedure_matcher.py) karşılaştırması.
+
+  - gecikme: procedure_categories 1x / 10x / 100x büyüdükçe istek başına süre
+
+Doğruluk (TR/EN/RU regresyon örnekleri) pytest'te: 02_backend/tests/test_procedure_matcher.py.
+
+Kullanım:
+    cd 04_ai_agents
+    python -m benchmarks.procedure_matcher --factors 1 10 100
+"""
+from __future__ import annotations
+
+import argparse
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import keyword_store  # noqa: E402
+from agents.procedure_matcher import ProcedureMatcher  # noqa: E402
+from benchmarks.corpus import OTHER  # noqa: E402
+
+SAMPLE_MESSAGES = [
+    "Hello, I need a hair transplant price for next month in Istanbul",
+    "Здравствуйте, нужна ринопластика и отель в Пхукете на 5 ночей",
+    "Merhaba, saç ekimi için klinik ve otel rezervasyonu istiyorum",
+    "Hi, what documents do I need for the visa and airport transfer?",
+    "Нужна консультация по переносу даты, спасибо",
+    "Diş implantı ve zirkonyum kaplama fiyatı nedir?",
+    "Looking for laser eye surgery with a short recovery period",
+    "Şehir dışında olduğum için randevuyu erteleyebilir miyiz?",
+]
+
+
+def substring_classify(categories: dict[str, str]) -> Callable[[str], str]:
+    """Eski _classify_procedure: sözlük sırasıyla ilk alt-dize eşleşmesi."""
+    def classify(text: str) -> str:
+        text_lower = text.lower()
+        for keyword, category in categories.items():
+            if keyword in text_lower:
+                return category
+        return OTHER
+    return classify
+
+
+def trie_classify(categories: dict[str, str]) -> Callable[[str], str]:
+    matcher = ProcedureMatcher(categories)
+
+    def classify(text: str) -> str:
+        hit = matcher.match(text)
+        return hit[0] if hit else OTHER
+    return classify
+
+
+def grow_categories(categories: dict[str, str], factor: int) -> dict[str, str]:
+    """Sözlüğü `factor` katına çıkarır; sentetik terimler gerçek metinlerde geçmez."""
+    grown = dict(categories)
+    for n in range(1, factor):
+        grown.update({f"{keyword} variant{n}": category for keyword, category in categories.items()})
+    return grown
+
+
+def _per_request_us(classify: Callable[[str], str], messages: list[str], rounds: int) -> tuple[float, float]:
+    samples: list[float] = []
+    for _ in range(rounds):
+        for text in messages:
+            start = time.perf_counter()
+            classify(text)
+            samples.append((time.perf_counter() - start) * 1e6)
+    samples.sort()
+    return statistics.median(samples), samples[int(len(samples) * 0.99) - 1]
+
+
+def run_scaling(categories: dict[str, str], factors: list[int], rounds: int) -> list[dict]:
+    rows = []
+    for factor in factors:
+        grown = grow_categories(categories, factor)
+        substring_p50, substring_p99 = _per_request_us(substring_classify(grown), SAMPLE_MESSAGES, rounds)
+        trie_p50, trie_p99 = _per_request_us(trie_classify(grown), SAMPLE_MESSAGES, rounds)
+        rows.append({
+            "factor": factor,
+            "keywords": len(grown),
+            "substring_p50_us": substring_p50,
+            "substring_p99_us": substring_p99,
+            "trie_p50_us": trie_p50,
+            "trie_p99_us": trie_p99,
+        })
+    return rows
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Procedure matcher benchmark")
+    parser.add_argument("--factors", type=int, nargs="+", default=[1, 10, 100])
+    parser.add_argument("--rounds", type=int, default=50)
+    args = parser.parse_args()
+
+    categories = keyword_store.current().procedure_categories
+
+    print(f"{'factor':>6} {'keywords':>9} {'substr p50':>11} {'substr p99':>11} {'trie p50':>9} {'trie p99':>9}  (µs/request)")
+    for row in run_scaling(categories, args.factors, args.rounds):
+        print(
+            f"{row['factor']:>5}x {row['keywords']:>9} "
+            f"{row['substring_p50_us']:>11.1f} {row['substring_p99_us']:>11.1f} "
+            f"{row['trie_p50_us']:>9.1f} {row['trie_p99_us']:>9.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,170 @@
+"""
+AntiGravity Ventures — Local Anthropic Messages API Stub
+MedicalSecretaryAgent'ı gerçek API'ye gitmeden (ücretsiz, deterministik) çalıştırmak için.
+
+/v1/messages endpoint'inin kullandığımız alt kümesini taklit eder:
+  - stream=false → tek JSON mesaj
+  - stream=true  → SSE (message_start … content_block_delta … message_stop)
+  - usage'da prompt cache alanları: cache_control işaretli önek ilk istekte
+    cache_creation_input_tokens, sonrakilerde cache_read_input_tokens olarak sayılır
+  - Son kullanıcı mesajı fiyat sorusuysa ("price", "fiyat", "цена", "cost") önce
+    get_procedure_pricing tool_use döner, tool_result gelince metin yanıt verir.
+
+Gecikmeler ayarlanabilir: --ttft-ms (ilk token öncesi) ve --token-ms (token başına).
+
+Kullanım:
+    cd 04_ai_agents
+    python -m benchmarks.stub_anthropic --port 8999 --ttft-ms 400 --token-ms 15
+    # backend'i stub'a yönlendir:
+    ANTHROPIC_BASE_URL=http://127.0.0.1:8999 ANTHROPIC_API_KEY=stub uvicorn main:app
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import uuid
+from typing import Any, AsyncIterator
+
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse, StreamingResponse
+
+PRICE_WORDS = ("price", "cost", "fiyat", "ücret", "цена", "стоимость")
+REPLY_WORDS = (
+    "Thank you for your message. Our coordinators arrange treatment at partner hospitals "
+    "in Istanbul and Antalya, with airport transfer and hotel included. "
+    "Could you share your preferred dates and a WhatsApp number?"
+).split(" ")
+
+app = FastAPI(title="Anthropic API stub")
+app.state.ttft_ms = 300.0
+app.state.token_ms = 10.0
+app.state.cache_prefixes = set()
+
+
+def _last_user_content(messages: list[dict[str, Any]]) -> Any:
+    for message in reversed(messages):
+        if message.get("role") == "user":
+            return message.get("content")
+    return ""
+
+
+def _plan_reply(body: dict[str, Any]) -> tuple[list[str], dict[str, Any] | None]:
+    """(metin token'ları, tool_use bloğu veya None)"""
+    content = _last_user_content(body.get("messages", []))
+    if isinstance(content, list):
+        # tool_result geldi → sonucu özetleyen metin
+        results = [c.get("content", "") for c in content if isinstance(c, dict) and c.get("type") == "tool_result"]
+        summary = json.loads(results[0]) if results else {}
+        price = summary.get("turkey_price_range", "on request")
+        return f"Hair transplant in Turkey costs {price}, all-inclusive. Shall I connect you with a coordinator?".split(" "), None
+    if body.get("tools") and any(word in str(content).lower() for word in PRICE_WORDS):
+        tool = {
+            "type": "tool_use",
+            "id": f"toolu_{uuid.uuid4().hex[:16]}",
+            "name": "get_procedure_pricing",
+            "input": {"procedure": "hair"},
+        }
+        return ["Let", "me", "check", "current", "pricing."], tool
+    return REPLY_WORDS, None
+
+
+def _cached_prefix(body: dict[str, Any]) -> str:
+    """tools → system sırasında son cache_control breakpoint'ine kadar olan önek."""
+    system = body.get("system", "")
+    blocks = [*body.get("tools", []), *(system if isinstance(system, list) else [])]
+    marked = [i for i, block in enumerate(blocks) if block.get("cache_control")]
+    return json.dumps(blocks[: marked[-1] + 1]) if marked else ""
+
+
+def _usage(body: dict[str, Any], output_tokens: int) -> dict[str, int]:
+    """Prompt cache taklidi: önek ilk görüldüğünde yazılır, sonra okunur (~4 karakter/token)."""
+    prompt_chars = (
+        len(json.dumps(body.get("tools", []))) + len(json.dumps(body.get("system", "")))
+        + len(json.dumps(body.get("messages", [])))
+    )
+    prefix = _cached_prefix(body)
+    cached_tokens = len(prefix) // 4
+    seen = prefix in app.state.cache_prefixes
+    app.state.cache_prefixes.add(prefix)
+    return {
+        "input_tokens": prompt_chars // 4 - cached_tokens,
+        "output_tokens": output_tokens,
+        "cache_creation_input_tokens": 0 if seen else cached_tokens,
+        "cache_read_input_tokens": cached_tokens if seen else 0,
+    }
+
+
+def _message(body: dict[str, Any], words: list[str], tool: dict[str, Any] | None) -> dict[str, Any]:
+    content: list[dict[str, Any]] = [{"type": "text", "text": " ".join(words)}]
+    if tool:
+        content.append(tool)
+    return {
+        "id": f"msg_{uuid.uuid4().hex[:16]}",
+        "type": "message",
+        "role": "assistant",
+        "model": body.get("model", "stub"),
+        "content": content,
+        "stop_reason": "tool_use" if tool else "end_turn",
+        "stop_sequence": None,
+        "usage": _usage(body, len(words)),
+    }
+
+
+def _event(name: str, data: dict[str, Any]) -> str:
+    return f"event: {name}\ndata: {json.dumps({'type': name, **data})}\n\n"
+
+
+async def _stream(body: dict[str, Any], words: list[str], tool: dict[str, Any] | None) -> AsyncIterator[str]:
+    message = _message(body, words, tool)
+    start = {**message, "content": [], "stop_reason": None, "usage": {**message["usage"], "output_tokens": 0}}
+    yield _event("message_start", {"message": start})
+    await asyncio.sleep(app.state.ttft_ms / 1000)
+
+    yield _event("content_block_start", {"index": 0, "content_block": {"type": "text", "text": ""}})
+    for i, word in enumerate(words):
+        text = word if i == 0 else f" {word}"
+        yield _event("content_block_delta", {"index": 0, "delta": {"type": "text_delta", "text": text}})
+        await asyncio.sleep(app.state.token_ms / 1000)
+    yield _event("content_block_stop", {"index": 0})
+
+    if tool:
+        yield _event("content_block_start", {"index": 1, "content_block": {**tool, "input": {}}})
+        yield _event("content_block_delta", {
+            "index": 1, "delta": {"type": "input_json_delta", "partial_json": json.dumps(tool["input"])},
+        })
+        yield _event("content_block_stop", {"index": 1})
+
+    yield _event("message_delta", {
+        "delta": {"stop_reason": message["stop_reason"], "stop_sequence": None},
+        "usage": {"output_tokens": message["usage"]["output_tokens"]},
+    })
+    yield _event("message_stop", {})
+
+
+@app.post("/v1/messages")
+async def messages(request: Request):
+    body = await request.json()
+    words, tool = _plan_reply(body)
+    if body.get("stream"):
+        return StreamingResponse(_stream(body, words, tool), media_type="text/event-stream")
+    await asyncio.sleep((app.state.ttft_ms + app.state.token_ms * len(words)) / 1000)
+    return JSONResponse(_message(body, words, tool))
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Local Anthropic Messages API stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8999)
+    parser.add_argument("--ttft-ms", type=float, default=300.0, help="Delay before the first token")
+    parser.add_argument("--token-ms", type=float, default=10.0, help="Delay per streamed token")
+    args = parser.parse_args()
+    app.state.ttft_ms = args.ttft_ms
+    app.state.token_ms = args.token_ms
+    uvicorn.run(app, host=args.host, port=args.port, log_level="warning")
+
+
+if __name__ == "__main__":
+    main()
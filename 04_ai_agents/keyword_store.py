@@ -0,0 +1,220 @@
+"""
+AntiGravity Ventures — Keyword Dictionary Store
+Sektör anahtar kelimeleri ve prosedür kategorileri kodda değil, sürümlü bir veri
+dosyasında (data/keywords.json) tutulur; değişiklik için redeploy gerekmez.
+
+  - load()           : dosyayı okur, doğrular → değişmez KeywordDictionaries
+  - current()        : process'in aktif sözlükleri (kilitsiz tek referans okuması)
+  - reload()         : dosyayı yeniden okur ve referansı atomik olarak değiştirir
+                       (activate() ile önceden doğrulanmış sürüm de etkinleştirilebilir)
+  - load_snapshot()  : derlenmiş yapıları (ör. Aho-Corasick otomatı) içerik özetine
+                       göre data/snapshots/ altına yazar; diğer worker'lar derlemek
+                       yerine hazır snapshot'ı yükler
+
+Dosya formatı:
+    {"version": 3,
+     "sectors": {"Medical": {"tr": [...], "en": [...], "ru": [...]}, ...},
+     "procedure_categories": {"en": {"rhinoplasty": "aesthetic", ...}, ...}}
+Dil grupları yalnızca düzen içindir; yüklenirken sırası korunarak düzleştirilir.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import marshal
+import os
+import sys
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable
+
+logger = logging.getLogger("MasterOrchestrator.keyword_store")
+
+_DATA_DIR = Path(__file__).parent / "data"
+KEYWORDS_FILE = Path(os.getenv("KEYWORDS_FILE") or _DATA_DIR / "keywords.json")
+SNAPSHOT_DIR = Path(os.getenv("KEYWORDS_SNAPSHOT_DIR") or _DATA_DIR / "snapshots")
+SNAPSHOT_KEEP = 8   # tür başına saklanan en yeni snapshot sayısı
+
+# marshal formatı Python sürümüne bağlıdır — snapshot adına eklenir
+_SNAPSHOT_TAG = f"py{sys.version_info[0]}{sys.version_info[1]}"
+
+
+@dataclass(frozen=True)
+class KeywordDictionaries:
+    """Bir veri dosyası sürümünün değişmez görünümü."""
+
+    version: int
+    sectors: dict[str, list[str]]
+    procedure_categories: dict[str, str]
+    fingerprint: str
+    source: str
+    mtime: float = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "version": self.version,
+            "fingerprint": self.fingerprint,
+            "source": self.source,
+            "sectors": {sector: len(keywords) for sector, keywords in self.sectors.items()},
+            "procedure_categories": len(self.procedure_categories),
+        }
+
+
+def _flatten(groups: Any, field: str) -> Any:
+    """{"tr": [...], "en": [...]} → tek liste/sözlük (sıra korunur); düz değerler olduğu gibi kalır."""
+    if isinstance(groups, list):
+        return list(groups)
+    if not isinstance(groups, dict):
+        raise ValueError(f"'{field}' must be a list or an object of language groups")
+    if all(isinstance(v, list) for v in groups.values()):
+        return [item for values in groups.values() for item in values]
+    if all(isinstance(v, dict) for v in groups.values()):
+        return {k: v for values in groups.values() for k, v in values.items()}
+    return dict(groups)
+
+
+def parse(document: dict[str, Any], source: str = "<memory>", mtime: float = 0.0) -> KeywordDictionaries:
+    """Veri dosyası içeriğini doğrular ve KeywordDictionaries'e çevirir."""
+    version = document.get("version")
+    if not isinstance(version, int):
+        raise ValueError("keywords file: 'version' must be an integer")
+    raw_sectors = document.get("sectors")
+    if not isinstance(raw_sectors, dict) or not raw_sectors:
+        raise ValueError("keywords file: 'sectors' must be a non-empty object")
+
+    sectors: dict[str, list[str]] = {}
+    for sector, groups in raw_sectors.items():
+        keywords = _flatten(groups, f"sectors.{sector}")
+        if not isinstance(keywords, list) or not all(isinstance(k, str) for k in keywords):
+            raise ValueError(f"keywords file: 'sectors.{sector}' must contain strings")
+        sectors[sector] = keywords
+
+    procedures = _flatten(document.get("procedure_categories", {}), "procedure_categories")
+    if not isinstance(procedures, dict) or not all(
+        isinstance(k, str) and isinstance(v, str) for k, v in procedures.items()
+    ):
+        raise ValueError("keywords file: 'procedure_categories' must map strings to strings")
+
+    payload = json.dumps([sectors, procedures], ensure_ascii=False)
+    return KeywordDictionaries(
+        version=version,
+        sectors=sectors,
+        procedure_categories=procedures,
+        fingerprint=hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12],
+        source=source,
+        mtime=mtime,
+    )
+
+
+def load(path: Path | None = None) -> KeywordDictionaries:
+    """Veri dosyasını okur. Hatalı dosya ValueError / OSError fırlatır."""
+    path = Path(path or KEYWORDS_FILE)
+    mtime = path.stat().st_mtime
+    with open(path, encoding="utf-8") as f:
+        document = json.load(f)
+    return parse(document, source=str(path), mtime=mtime)
+
+
+# ---------------------------------------------------------------------------
+# Process-wide active dictionaries
+# ---------------------------------------------------------------------------
+# Okuyucular yalnızca _current referansını okur (kilitsiz); yazıcılar yeni nesneyi
+# tamamen kurduktan sonra tek atamayla değiştirir.
+_reload_lock = threading.Lock()
+_current: KeywordDictionaries | None = None
+
+
+def current() -> KeywordDictionaries:
+    """Aktif sözlükler; ilk çağrıda dosyadan yüklenir."""
+    dictionaries = _current
+    if dictionaries is None:
+        dictionaries = reload()
+    return dictionaries
+
+
+def reload(path: Path | None = None) -> KeywordDictionaries:
+    """Dosyayı yeniden okur ve aktif sözlükleri atomik olarak değiştirir."""
+    return activate(load(path))
+
+
+def activate(dictionaries: KeywordDictionaries) -> KeywordDictionaries:
+    """Önceden yüklenmiş (ve çağıran tarafından doğrulanmış) sözlükleri aktif yapar."""
+    global _current
+    with _reload_lock:
+        previous = _current
+        _current = dictionaries
+    if previous is None or previous.fingerprint != dictionaries.fingerprint:
+        logger.info(
+            f"Keyword dictionaries v{dictionaries.version} loaded "
+            f"(fingerprint={dictionaries.fingerprint}, source={dictionaries.source})"
+        )
+    return dictionaries
+
+
+def file_changed() -> bool:
+    """Veri dosyasının mtime'ı aktif sürümden farklıysa True (ucuz stat çağrısı)."""
+    dictionaries = _current
+    if dictionaries is None:
+        return True
+    try:
+        return Path(dictionaries.source).stat().st_mtime != dictionaries.mtime
+    except OSError:
+        return False
+
+
+# ---------------------------------------------------------------------------
+# Compiled snapshots
+# ---------------------------------------------------------------------------
+def snapshot_path(kind: str, fingerprint: str) -> Path:
+    return SNAPSHOT_DIR / f"{kind}-{fingerprint}.{_SNAPSHOT_TAG}.marshal"
+
+
+def load_snapshot(
+    kind: str,
+    fingerprint: str,
+    build: Callable[[], Any],
+    persist: bool = True,
+) -> tuple[Any, bool]:
+    """
+    Derlenmiş yapıyı snapshot dosyasından yükler; yoksa build() ile üretip yazar.
+
+    Snapshot yalnızca marshal ile serileştirilebilen temel tipleri (dict/list/
+    tuple/str/int) içermelidir — yükleme kod çalıştırmaz. persist=False ise
+    (ör. veri dosyasından gelmeyen, geçici sözlükler) diske dokunulmaz.
+
+    Returns:
+        (veri, snapshot'tan yüklendi mi)
+    """
+    if not persist:
+        return build(), False
+    path = snapshot_path(kind, fingerprint)
+    try:
+        with open(path, "rb") as f:
+            return marshal.load(f), True
+    except FileNotFoundError:
+        pass
+    except (OSError, EOFError, ValueError, TypeError) as e:
+        logger.warning(f"Snapshot {path.name} unreadable ({e}) — rebuilding")
+
+    data = build()
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        with open(tmp, "wb") as f:
+            marshal.dump(data, f)
+        os.replace(tmp, path)   # eşzamanlı worker'lar yarım dosya görmez
+        _prune_snapshots(kind)
+    except OSError as e:
+        logger.warning(f"Snapshot {path.name} could not be written: {e}")
+    return data, False
+
+
+def _prune_snapshots(kind: str) -> None:
+    snapshots = sorted(SNAPSHOT_DIR.glob(f"{kind}-*.marshal"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for old in snapshots[SNAPSHOT_KEEP:]:
+        try:
+            old.unlink()
+        except OSError:
+            pass
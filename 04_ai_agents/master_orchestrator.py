@@ -14,28 +14,40 @@ Tarih   : 2026-02-20
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
-import re
+import os
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 from datetime import datetime
 from enum import Enum
 from pathlib import Path
 from typing import Any
 
+try:
+    import numpy as np
+except ImportError:
+    np = None  # type: ignore[assignment]
+
+import keyword_store
+import session_log
+from agents.registry import get_agent, registry
+
 # ---------------------------------------------------------------------------
-# Logging — her çalışmaya ait log AGENT_SESSION.log'a eklenir
+# Logging — oturum kayıtları AGENT_SESSION.log'a NDJSON olarak, arka planda yazılır
 # ---------------------------------------------------------------------------
 LOG_FILE = Path(__file__).parent / "logs" / "AGENT_SESSION.log"
-LOG_FILE.parent.mkdir(parents=True, exist_ok=True)
 
 logging.basicConfig(
     level=logging.INFO,
     format="%(asctime)s [%(levelname)s] %(name)s — %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding="utf-8"),
-        logging.StreamHandler(),
-    ],
+    handlers=[logging.StreamHandler()],
 )
 logger = logging.getLogger("MasterOrchestrator")
 
@@ -74,89 +86,552 @@ class ClassificationResult:
 
 
 # ---------------------------------------------------------------------------
-# Anahtar Kelime Sözlükleri  (TR + EN + RU)
+# Anahtar Kelime Sözlükleri  (TR + EN + RU) — data/keywords.json
+# ---------------------------------------------------------------------------
+def sector_keyword_maps(dictionaries: keyword_store.KeywordDictionaries) -> dict[Sector, list[str]]:
+    """Veri dosyasındaki sektör adlarını Sector enum'una çevirir."""
+    return {Sector(name): list(keywords) for name, keywords in dictionaries.sectors.items()}
+
+
+KEYWORD_MAPS: dict[Sector, list[str]] = sector_keyword_maps(keyword_store.current())
+
+
+def reload_keyword_maps() -> keyword_store.KeywordDictionaries:
+    """
+    Veri dosyasını yeniden yükler ve KEYWORD_MAPS'i yeni bir sözlükle değiştirir.
+
+    Varsayılan sözlükleri izleyen sınıflandırıcılar değişikliği bir sonraki
+    kontrolde görür; medical_agent prosedür kategorileri keyword_store'dan okunur.
+    """
+    global KEYWORD_MAPS
+    dictionaries = keyword_store.load()
+    keyword_maps = sector_keyword_maps(dictionaries)   # bilinmeyen sektör → ValueError, swap yok
+    keyword_store.activate(dictionaries)
+    KEYWORD_MAPS = keyword_maps
+    return dictionaries
+
+
+# ---------------------------------------------------------------------------
+# Keyword Matcher  (Aho-Corasick — tek geçişte çoklu anahtar kelime arama)
+# ---------------------------------------------------------------------------
+# re.IGNORECASE'in TR için önemli eşdeğerlikleri: I/ı/İ/i aynı harf sayılır.
+# İ dışında hiçbir karakterin lower() karşılığı uzamaz; önce İ çevrilince
+# katlama uzunluğu korur ve eşleşme offset'leri orijinal metinle aynı kalır.
+_FOLD_FIXES = str.maketrans({"İ": "i", "ı": "i", "ſ": "s", "ς": "σ"})
+
+
+def _fold(text: str) -> str:
+    """Metni re.IGNORECASE | re.UNICODE ile uyumlu şekilde küçük harfe katlar."""
+    return text.translate(_FOLD_FIXES).lower()
+
+
+def _is_word_char(ch: str) -> bool:
+    """Regex \\w tanımı (Unicode): harf/rakam veya alt çizgi."""
+    return ch.isalnum() or ch == "_"
+
+
+class KeywordMatcher:
+    """
+    KEYWORD_MAPS'ten bir kez derlenen Aho-Corasick otomatı.
+
+    Metni tek geçişte tarar; her sektör için eşleşen anahtar kelimeleri
+    sözlükteki sırayla döndürür. Eşleşme kuralları eski `\\b{kw}\\b` +
+    IGNORECASE regex'leriyle aynıdır, maliyet ise anahtar kelime sayısından
+    bağımsız olarak metin uzunluğuyla orantılıdır.
+    """
+
+    def __init__(self, keyword_maps: dict[Sector, list[str]]) -> None:
+        self._goto: list[dict[str, int]] = [{}]
+        self._fail: list[int] = [0]
+        self._out: list[list[int]] = [[]]
+        self._term_lengths: list[int] = []
+        # term_id → [(sector, keyword index), ...] — aynı kelime birden çok yerde olabilir
+        self._term_entries: list[list[tuple[Sector, int]]] = []
+        self._keyword_maps = keyword_maps
+
+        term_ids: dict[str, int] = {}
+        for sector, keywords in keyword_maps.items():
+            for index, keyword in enumerate(keywords):
+                term = _fold(keyword)
+                if not term:
+                    continue
+                if term not in term_ids:
+                    term_ids[term] = len(self._term_lengths)
+                    self._term_lengths.append(len(term))
+                    self._term_entries.append([])
+                    self._insert(term, term_ids[term])
+                self._term_entries[term_ids[term]].append((sector, index))
+
+        self._build_failure_links()
+
+    def _insert(self, term: str, term_id: int) -> None:
+        state = 0
+        for ch in term:
+            nxt = self._goto[state].get(ch)
+            if nxt is None:
+                nxt = len(self._goto)
+                self._goto[state][ch] = nxt
+                self._goto.append({})
+                self._fail.append(0)
+                self._out.append([])
+            state = nxt
+        self._out[state].append(term_id)
+
+    def _build_failure_links(self) -> None:
+        queue = list(self._goto[0].values())
+        for state in queue:
+            for ch, nxt in self._goto[state].items():
+                queue.append(nxt)
+                fallback = self._fail[state]
+                while fallback and ch not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(ch, 0)
+                self._fail[nxt] = target if target != nxt else 0
+                self._out[nxt] = self._out[nxt] + self._out[self._fail[nxt]]
+
+    # --- Snapshot (keyword_store) -------------------------------------------
+    SNAPSHOT_KIND = "matcher-v1"   # otomat yapısı değişirse artırılır
+
+    def to_snapshot(self) -> tuple:
+        """Otomatı marshal ile yazılabilen temel tiplere çevirir."""
+        entries = [[(sector.value, index) for sector, index in e] for e in self._term_entries]
+        return self._goto, self._fail, self._out, self._term_lengths, entries
+
+    @classmethod
+    def from_snapshot(cls, snapshot: tuple, keyword_maps: dict[Sector, list[str]]) -> KeywordMatcher:
+        """to_snapshot() çıktısından otomatı yeniden kurar (derleme yapılmaz)."""
+        goto, fail, out, term_lengths, entries = snapshot
+        matcher = cls.__new__(cls)
+        matcher._goto, matcher._fail, matcher._out = goto, fail, out
+        matcher._term_lengths = term_lengths
+        sectors = {sector.value: sector for sector in Sector}
+        matcher._term_entries = [[(sectors[value], index) for value, index in e] for e in entries]
+        matcher._keyword_maps = keyword_maps
+        return matcher
+
+    @classmethod
+    def compiled(
+        cls,
+        keyword_maps: dict[Sector, list[str]],
+        fingerprint: str,
+        persist: bool = True,
+    ) -> tuple[KeywordMatcher, bool]:
+        """
+        Snapshot varsa yükler, yoksa derler (persist=True ise snapshot olarak yazar).
+
+        Returns:
+            (matcher, snapshot'tan yüklendi mi)
+        """
+        snapshot, loaded = keyword_store.load_snapshot(
+            cls.SNAPSHOT_KIND, fingerprint, lambda: cls(keyword_maps).to_snapshot(), persist=persist
+        )
+        return cls.from_snapshot(snapshot, keyword_maps), loaded
+
+    @property
+    def term_count(self) -> int:
+        return len(self._term_lengths)
+
+    @property
+    def term_entries(self) -> list[list[tuple[Sector, int]]]:
+        """term_id → [(sector, KEYWORD_MAPS index), ...]"""
+        return self._term_entries
+
+    def match_terms(self, text: str) -> set[int]:
+        """Metni bir kez tarar ve kelime sınırına uyan terim id'lerini döndürür."""
+        folded = _fold(text)
+        size = len(folded)
+        goto, fail, out = self._goto, self._fail, self._out
+        found: set[int] = set()
+
+        def boundary(pos: int) -> bool:
+            before = pos > 0 and _is_word_char(folded[pos - 1])
+            after = pos < size and _is_word_char(folded[pos])
+            return before != after
+
+        state = 0
+        for end, ch in enumerate(folded):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for term_id in out[state]:
+                if term_id in found:
+                    continue
+                start = end - self._term_lengths[term_id] + 1
+                if boundary(start) and boundary(end + 1):
+                    found.add(term_id)
+        return found
+
+    def keywords_for(self, term_ids: set[int]) -> dict[Sector, list[str]]:
+        """Terim id'lerini sektör başına anahtar kelime listelerine çevirir (KEYWORD_MAPS sırası)."""
+        hits: dict[Sector, list[int]] = {}
+        for term_id in term_ids:
+            for sector, index in self._term_entries[term_id]:
+                hits.setdefault(sector, []).append(index)
+        return {
+            sector: [self._keyword_maps[sector][i] for i in sorted(indexes)]
+            for sector, indexes in hits.items()
+        }
+
+    def match(self, text: str) -> dict[Sector, list[str]]:
+        """
+        Metni bir kez tarar.
+
+        Returns:
+            {sector: [eşleşen anahtar kelimeler]} — yalnızca eşleşen sektörler,
+            kelimeler KEYWORD_MAPS sırasında.
+        """
+        return self.keywords_for(self.match_terms(text))
+
+
+# ---------------------------------------------------------------------------
+# Sector Scorers  (CLASSIFIER_BACKEND=keyword | tfidf)
 # ---------------------------------------------------------------------------
-KEYWORD_MAPS: dict[Sector, list[str]] = {
-    Sector.MEDICAL: [
-        # Türkçe
-        "sağlık", "hasta", "doktor", "klinik", "ameliyat", "estetik",
-        "rinoplasti", "saç ekimi", "diş", "dermatoloji", "check-up",
-        "tedavi", "hastane", "cerrahi", "medikal", "tıp", "reçete",
-        "muayene", "konsültasyon", "ameliyathane", "anestezi",
-        # English
-        "medical", "doctor", "clinic", "surgery", "aesthetic", "rhinoplasty",
-        "hair transplant", "dental", "dermatology", "health", "treatment",
-        "hospital", "patient", "consultation", "procedure", "cosmetic",
-        "checkup", "check-up", "wellness", "recovery", "implant",
-        # Russian (transliterated)
-        "медицинский", "врач", "клиника", "операция", "эстетика",
-        "пластика", "зубы", "лечение", "больница", "пациент",
-        "процедура", "имплантация", "доктор",
-    ],
-    Sector.TRAVEL: [
-        # Türkçe
-        "otel", "rezervasyon", "konaklama", "restoran", "yemek", "menü",
-        "tur", "uçuş", "transfer", "oda", "giriş", "çıkış", "fiyat",
-        "tatil", "seyahat", "turizm", "plaj", "havuz", "spa",
-        "check-in", "check-out", "fatura", "misafir", "kahvaltı",
-        # English
-        "hotel", "reservation", "booking", "accommodation", "restaurant",
-        "food", "menu", "tour", "flight", "transfer", "room", "check-in",
-        "check-out", "price", "holiday", "travel", "tourism", "beach",
-        "pool", "breakfast", "guest", "reception", "suite", "villa",
-        # Russian
-        "отель", "бронирование", "проживание", "ресторан", "тур",
-        "перелет", "трансфер", "номер", "заезд", "выезд", "цена",
-        "отдых", "туризм", "пляж", "бассейн", "завтрак", "гость",
-    ],
-    Sector.FACTORY: [
-        # Türkçe
-        "fabrika", "tekstil", "üretim", "imalat", "ihracat", "ithalat",
-        "kumaş", "iplik", "dikiş", "konfeksiyon", "toptan", "sipariş",
-        "numune", "kalite kontrol", "tedarik", "kapasite", "moc",
-        "fob", "cif", "incoterms", "b2b", "teklif",
-        # English
-        "factory", "textile", "production", "manufacturing", "export",
-        "import", "fabric", "yarn", "sewing", "garment", "wholesale",
-        "order", "sample", "quality control", "supply chain", "capacity",
-        "fob", "cif", "b2b", "quotation", "shipment", "sourcing",
-        # Russian
-        "завод", "текстиль", "производство", "экспорт", "ткань",
-        "нить", "оптовый", "заказ", "образец", "поставка",
-    ],
-    Sector.MARKETING: [
-        # Türkçe
-        "reklam", "pazarlama", "seo", "kampanya", "sosyal medya", "içerik",
-        "google ads", "facebook ads", "instagram", "blog", "anahtar kelime",
-        "trafik", "dönüşüm", "lead", "hedefleme", "bütçe", "analiz",
-        "raporlama", "performans", "marka", "dijital", "yayın", "paylaşım",
-        # English
-        "marketing", "advertising", "campaign", "social media", "content",
-        "google ads", "facebook ads", "keyword", "traffic",
-        "conversion", "lead generation", "targeting", "budget", "analytics",
-        "reporting", "performance", "brand", "digital", "publish", "ad copy",
-        # Russian
-        "маркетинг", "реклама", "продвижение", "кампания", "соцсети", "контент",
-        "ключевые слова", "трафик", "конверсия", "лид", "таргетинг", "бюджет",
-        "аналитика", "отчет", "бренд", "публикация",
-    ],
+# (sector, confidence, matched_keywords, reasoning)
+_CachedClassification = tuple[Sector, float, tuple[str, ...], str]
+
+_NO_MATCH_REASONING = "Hiçbir sektör anahtar kelimesiyle eşleşme bulunamadı. Manuel sınıflandırma gerekebilir."
+
+
+def _build_outcome(sector: Sector | None, confidence: float, keywords: list[str]) -> _CachedClassification:
+    """Skorlayıcı çıktısını ClassificationResult alanlarına çevirir."""
+    if sector is None:
+        return Sector.UNKNOWN, 0.0, (), _NO_MATCH_REASONING
+    reasoning = (
+        f"{sector.value} sektörü için "
+        f"{len(keywords)} anahtar kelime eşleşti: "
+        f"{', '.join(keywords[:5])}."
+    )
+    return sector, confidence, tuple(keywords), reasoning
+
+
+class KeywordRatioScorer:
+    """Varsayılan skorlama: sektör skoru = eşleşen kelime sayısı / sözlük boyutu."""
+
+    name = "keyword"
+
+    def __init__(self, keyword_maps: dict[Sector, list[str]], matcher: KeywordMatcher) -> None:
+        self._keyword_maps = keyword_maps
+        self._matcher = matcher
+
+    def score_many(self, texts: list[str]) -> list[_CachedClassification]:
+        return [self._score(text) for text in texts]
+
+    def _score(self, text: str) -> _CachedClassification:
+        found = self._matcher.match(text)
+        scores = {
+            sector: len(found.get(sector, [])) / max(len(keywords), 1)
+            for sector, keywords in self._keyword_maps.items()
+        }
+        best_sector = max(scores, key=lambda s: scores[s])
+        best_score = scores[best_sector]
+        if best_score == 0.0:
+            return _build_outcome(None, 0.0, [])
+        confidence = min(best_score * 10, 1.0)   # normalize to [0,1]
+        return _build_outcome(best_sector, confidence, found[best_sector])
+
+
+class TfidfScorer:
+    """
+    NumPy ile vektörel skorlama.
+
+    KEYWORD_MAPS bir sektör×terim ağırlık matrisine çevrilir (ağırlık = sözlükteki
+    tekrar × IDF; birden çok sektörde geçen terimler daha az ağırlık alır).
+    Bir mesaj grubu seyrek mesaj×terim matrisi olarak tek seferde çarpılır, böylece
+    büyük sözlüklü sektörler cezalandırılmaz.
+    """
+
+    name = "tfidf"
+    SATURATION = 3.0   # bu toplam ağırlığa ulaşan sektör confidence=1.0 alır
+
+    def __init__(self, keyword_maps: dict[Sector, list[str]], matcher: KeywordMatcher) -> None:
+        if np is None:
+            raise RuntimeError("numpy not installed. Run: pip install numpy")
+        self._matcher = matcher
+        self._sectors = list(keyword_maps)
+        row_of = {sector: row for row, sector in enumerate(self._sectors)}
+
+        counts = np.zeros((len(self._sectors), matcher.term_count), dtype=np.float32)
+        for term_id, entries in enumerate(matcher.term_entries):
+            for sector, _index in entries:
+                counts[row_of[sector], term_id] += 1.0
+        doc_freq = (counts > 0).sum(axis=0)
+        idf = np.log((1.0 + len(self._sectors)) / (1.0 + doc_freq)) + 1.0
+        # terim-ana düzende (terim × sektör) tutulur — seyrek çarpımda satır toplama
+        self._term_weights = np.ascontiguousarray((counts * idf).T)
+
+    def score_many(self, texts: list[str]) -> list[_CachedClassification]:
+        if not texts:
+            return []
+        term_hits = [self._matcher.match_terms(text) for text in texts]
+        lengths = np.fromiter((len(h) for h in term_hits), dtype=np.intp, count=len(texts))
+        rows = np.repeat(np.arange(len(texts)), lengths)
+        cols = np.fromiter((t for hits in term_hits for t in hits), dtype=np.intp, count=int(lengths.sum()))
+
+        # scores = X (mesaj×terim, seyrek) @ W.T (terim×sektör)
+        contributions = self._term_weights[cols]
+        scores = np.column_stack([
+            np.bincount(rows, weights=contributions[:, j], minlength=len(texts))
+            for j in range(len(self._sectors))
+        ])
+        best = scores.argmax(axis=1)
+        best_scores = scores[np.arange(len(texts)), best]
+
+        outcomes: list[_CachedClassification] = []
+        for i, hits in enumerate(term_hits):
+            if best_scores[i] <= 0.0:
+                outcomes.append(_build_outcome(None, 0.0, []))
+                continue
+            sector = self._sectors[int(best[i])]
+            confidence = float(min(best_scores[i] / self.SATURATION, 1.0))
+            keywords = self._matcher.keywords_for(hits).get(sector, [])
+            outcomes.append(_build_outcome(sector, confidence, keywords))
+        return outcomes
+
+
+SCORER_BACKENDS: dict[str, type] = {
+    KeywordRatioScorer.name: KeywordRatioScorer,
+    TfidfScorer.name: TfidfScorer,
 }
 
 
+# ---------------------------------------------------------------------------
+# Classification Cache  (LRU + TTL, normalize edilmiş metin anahtarlı)
+# ---------------------------------------------------------------------------
+def normalize_text(text: str) -> str:
+    """Önbellek anahtarı: küçük harfe katlanmış, boşlukları tekilleştirilmiş metin."""
+    return " ".join(_fold(text).split())
+
+
+def keyword_fingerprint(keyword_maps: dict[Sector, list[str]]) -> str:
+    """Anahtar kelime sözlüklerinin içerik özeti — değişince önbellek geçersizleşir."""
+    payload = json.dumps(
+        {sector.value: keywords for sector, keywords in keyword_maps.items()},
+        ensure_ascii=False,
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()[:12]
+
+
+class ClassificationCache:
+    """Thread-safe, sınırlı boyutlu LRU önbellek; her kayıt TTL sonunda düşer."""
+
+    def __init__(self, max_size: int, ttl_seconds: float) -> None:
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[tuple[str, str], tuple[float, _CachedClassification]] = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self.invalidations = 0
+
+    def get(self, key: tuple[str, str]) -> _CachedClassification | None:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.expirations += 1
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: tuple[str, str], value: _CachedClassification) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "invalidations": self.invalidations,
+            }
+
+
 # ---------------------------------------------------------------------------
 # Classifier
 # ---------------------------------------------------------------------------
+@dataclass(frozen=True)
+class _CompiledKeywords:
+    """Tek sözlük sürümünün derlenmiş hali — tek referansla atomik olarak değiştirilir."""
+
+    keyword_maps: dict[Sector, list[str]]
+    matcher: KeywordMatcher
+    scorer: Any
+    version: str
+    from_snapshot: bool
+    compile_ms: float
+
+
 class RequestClassifier:
     """Kural tabanlı + skor ağırlıklı sektör sınıflandırıcı."""
 
-    def __init__(self) -> None:
-        # Compile regex patterns for speed
-        self._patterns: dict[Sector, list[re.Pattern[str]]] = {
-            sector: [
-                re.compile(rf"\b{re.escape(kw)}\b", re.IGNORECASE | re.UNICODE)
-                for kw in keywords
-            ]
-            for sector, keywords in KEYWORD_MAPS.items()
+    BACKEND = os.getenv("CLASSIFIER_BACKEND", "keyword")               # keyword | tfidf
+    CACHE_SIZE = int(os.getenv("CLASSIFY_CACHE_SIZE", "10000"))        # 0 → önbellek kapalı
+    CACHE_TTL_SECONDS = float(os.getenv("CLASSIFY_CACHE_TTL", "3600"))
+    KEYWORD_CHECK_INTERVAL_SECONDS = 5.0   # sözlük / veri dosyası değişikliği kontrol sıklığı
+
+    def __init__(
+        self,
+        keyword_maps: dict[Sector, list[str]] | None = None,
+        cache_size: int | None = None,
+        cache_ttl: float | None = None,
+        backend: str | None = None,
+    ) -> None:
+        # keyword_maps verilmezse modül seviyesindeki KEYWORD_MAPS (veri dosyası) izlenir
+        self._follows_default_maps = keyword_maps is None
+        self._backend = (backend or self.BACKEND).lower()
+        if self._backend not in SCORER_BACKENDS:
+            logger.warning(f"Unknown CLASSIFIER_BACKEND '{self._backend}' — using 'keyword'")
+            self._backend = KeywordRatioScorer.name
+        size = self.CACHE_SIZE if cache_size is None else cache_size
+        ttl = self.CACHE_TTL_SECONDS if cache_ttl is None else cache_ttl
+        self._cache = ClassificationCache(size, ttl) if size > 0 else None
+        self._reload_lock = threading.Lock()   # yalnızca yazıcılar; okuyucular kilit almaz
+        self._compiled = self._compile(keyword_maps if keyword_maps is not None else KEYWORD_MAPS)
+        self._watcher_stop = threading.Event()
+        if self._follows_default_maps:
+            self._start_keyword_watcher()
+
+    @property
+    def backend(self) -> str:
+        return self._backend
+
+    @property
+    def keywords_version(self) -> str:
+        return self._compiled.version
+
+    def _compile(self, keyword_maps: dict[Sector, list[str]]) -> _CompiledKeywords:
+        # Tüm anahtar kelimeler tek otomata derlenir — istek başına tek tarama.
+        # Aynı sözlük sürümünü daha önce derleyen bir worker varsa snapshot yüklenir.
+        started = time.perf_counter()
+        version = keyword_fingerprint(keyword_maps)
+        matcher, from_snapshot = KeywordMatcher.compiled(
+            keyword_maps, version, persist=keyword_maps is KEYWORD_MAPS
+        )
+        try:
+            scorer = SCORER_BACKENDS[self._backend](keyword_maps, matcher)
+        except RuntimeError as e:
+            logger.warning(f"{self._backend} scorer unavailable ({e}) — falling back to 'keyword'")
+            self._backend = KeywordRatioScorer.name
+            scorer = KeywordRatioScorer(keyword_maps, matcher)
+        return _CompiledKeywords(
+            keyword_maps=keyword_maps,
+            matcher=matcher,
+            scorer=scorer,
+            version=version,
+            from_snapshot=from_snapshot,
+            compile_ms=round((time.perf_counter() - started) * 1000, 2),
+        )
+
+    def reload(self, keyword_maps: dict[Sector, list[str]] | None = None) -> str:
+        """
+        Sözlükleri yeniden derler, derlenmiş hali atomik olarak değiştirir ve önbelleği temizler.
+
+        Devam eden sınıflandırmalar eski sürümle tamamlanır; hiçbiri beklemez.
+
+        Returns:
+            Yeni keywords_version.
+        """
+        with self._reload_lock:
+            if keyword_maps is not None:
+                self._follows_default_maps = False
+            elif self._follows_default_maps:
+                keyword_maps = KEYWORD_MAPS
+            else:
+                keyword_maps = self._compiled.keyword_maps
+            compiled = self._compile(keyword_maps)
+            self._compiled = compiled
+            if self._cache is not None:
+                self._cache.clear()
+        source = "snapshot" if compiled.from_snapshot else "compiled"
+        logger.info(
+            f"RequestClassifier reloaded — keywords_version={compiled.version} "
+            f"({source} in {compiled.compile_ms} ms)"
+        )
+        return compiled.version
+
+    def close(self) -> None:
+        """Sözlük izleme thread'ini durdurur."""
+        self._watcher_stop.set()
+
+    def _start_keyword_watcher(self) -> None:
+        # Değişiklik tespiti + yeniden derleme arka planda — istek yolu yalnızca self._compiled okur.
+        # Thread sınıflandırıcıyı weakref ile tutar; sınıflandırıcı toplanınca kendiliğinden biter.
+        stop, interval, ref = self._watcher_stop, self.KEYWORD_CHECK_INTERVAL_SECONDS, weakref.ref(self)
+
+        def watch() -> None:
+            while not stop.wait(interval):
+                classifier = ref()
+                if classifier is None:
+                    return
+                try:
+                    classifier._check_keyword_changes()
+                except Exception as e:
+                    logger.warning(f"Keyword change check failed: {type(e).__name__}: {e}")
+                del classifier
+
+        threading.Thread(target=watch, name="keyword-watcher", daemon=True).start()
+
+    def _check_keyword_changes(self) -> None:
+        """KEYWORD_MAPS veya veri dosyası değişmişse otomatı yeniden kur (izleme thread'inden)."""
+        if self._follows_default_maps and keyword_store.file_changed():
+            # Başka bir worker / admin endpoint'i dosyayı güncellemiş
+            try:
+                reload_keyword_maps()
+            except (OSError, ValueError) as e:
+                logger.warning(f"Keyword file reload failed — keeping current dictionaries: {e}")
+        compiled = self._compiled
+        current = KEYWORD_MAPS if self._follows_default_maps else compiled.keyword_maps
+        if current is not compiled.keyword_maps or keyword_fingerprint(current) != compiled.version:
+            self.reload()
+
+    def keyword_stats(self) -> dict[str, Any]:
+        """Aktif sözlük sürümü ve derleme bilgisi."""
+        compiled = self._compiled
+        stats: dict[str, Any] = {
+            "keywords_version": compiled.version,
+            "terms": compiled.matcher.term_count,
+            "from_snapshot": compiled.from_snapshot,
+            "compile_ms": compiled.compile_ms,
+        }
+        if self._follows_default_maps:
+            stats["file"] = keyword_store.current().to_dict()
+        return stats
+
+    def cache_stats(self) -> dict[str, Any]:
+        """Önbellek isabet/kaçırma sayaçları (önbellek kapalıysa enabled=False)."""
+        if self._cache is None:
+            return {"enabled": False, "backend": self._backend}
+        return {
+            "enabled": True,
+            "backend": self._backend,
+            "keywords_version": self.keywords_version,
+            **self._cache.stats(),
         }
 
     def classify(self, text: str) -> ClassificationResult:
@@ -169,42 +644,55 @@ class RequestClassifier:
         Returns:
             ClassificationResult with sector, confidence and reasoning.
         """
-        text_clean = text.strip()
-        scores: dict[Sector, float] = {}
-        matched: dict[Sector, list[str]] = {}
-
-        for sector, patterns in self._patterns.items():
-            hits: list[str] = []
-            for i, pattern in enumerate(patterns):
-                if pattern.search(text_clean):
-                    hits.append(KEYWORD_MAPS[sector][i])
-            score = len(hits) / max(len(patterns), 1)
-            scores[sector] = score
-            matched[sector] = hits
+        return self.classify_many([text])[0]
 
-        best_sector = max(scores, key=lambda s: scores[s])
-        best_score = scores[best_sector]
+    def classify_many(self, texts: list[str]) -> list[ClassificationResult]:
+        """
+        Birden çok metni tek çağrıda sınıflandırır.
 
-        if best_score == 0.0:
-            result_sector = Sector.UNKNOWN
-            confidence = 0.0
-            reasoning = "Hiçbir sektör anahtar kelimesiyle eşleşme bulunamadı. Manuel sınıflandırma gerekebilir."
-        else:
-            result_sector = best_sector
-            confidence = min(best_score * 10, 1.0)   # normalize to [0,1]
-            reasoning = (
-                f"{best_sector.value} sektörü için "
-                f"{len(matched[best_sector])} anahtar kelime eşleşti: "
-                f"{', '.join(matched[best_sector][:5])}."
-            )
-
-        return ClassificationResult(
-            sector=result_sector,
-            confidence=confidence,
-            matched_keywords=matched.get(result_sector, []),
-            reasoning=reasoning,
-            raw_input=text_clean,
-        )
+        Önbellekte olmayan tekil metinler skorlayıcıya tek grup halinde verilir
+        (tfidf backend'inde tek matris çarpımı).
+
+        Args:
+            texts: Ham kullanıcı girdileri.
+
+        Returns:
+            Girdi sırasıyla aynı sırada ClassificationResult listesi.
+        """
+        # Derlenmiş sürüm tek seferde okunur — eşzamanlı reload bu çağrıyı etkilemez
+        compiled, cache = self._compiled, self._cache
+        scorer, version = compiled.scorer, compiled.version
+
+        cleaned = [text.strip() for text in texts]
+        normalized = [normalize_text(text) for text in cleaned]
+        outcomes: dict[str, _CachedClassification] = {}
+        pending: dict[str, None] = {}   # sıralı küme — tekrar eden metin bir kez skorlanır
+        for key in normalized:
+            if key in outcomes or key in pending:
+                continue
+            cached = cache.get((version, key)) if cache is not None else None
+            if cached is None:
+                pending[key] = None
+            else:
+                outcomes[key] = cached
+
+        if pending:
+            for key, outcome in zip(pending, scorer.score_many(list(pending))):
+                outcomes[key] = outcome
+                if cache is not None:
+                    cache.put((version, key), outcome)
+
+        results: list[ClassificationResult] = []
+        for raw, key in zip(cleaned, normalized):
+            sector, confidence, keywords, reasoning = outcomes[key]
+            results.append(ClassificationResult(
+                sector=sector,
+                confidence=confidence,
+                matched_keywords=list(keywords),
+                reasoning=reasoning,
+                raw_input=raw,
+            ))
+        return results
 
 
 # ---------------------------------------------------------------------------
@@ -213,39 +701,37 @@ class RequestClassifier:
 class AgentRouter:
     """Sınıflandırma sonucuna göre ilgili agent'ı çağırır."""
 
-    def __init__(self) -> None:
-        self._classifier = RequestClassifier()
-
-        # Lazy-init real agents
-        self._medical_agent = None
-        self._travel_agent = None
-        self._factory_agent = None
-        self._marketing_agent = None
-
-        try:
-            from agents.medical_agent import MedicalAgent
-            self._medical_agent = MedicalAgent()
-        except Exception as e:
-            logger.warning(f"MedicalAgent init failed: {e}")
+    # route_many() tek çağrıda kabul edilen en fazla mesaj sayısı
+    MAX_BATCH_SIZE = int(os.getenv("CLASSIFY_BATCH_MAX_SIZE", "500"))
 
-        try:
-            from agents.travel_agent import TravelAgent
-            self._travel_agent = TravelAgent()
-        except Exception as e:
-            logger.warning(f"TravelAgent init failed: {e}")
+    # aroute(): sektör başına (eşzamanlı agent çağrısı, saniye cinsinden timeout)
+    SECTOR_LIMITS: dict[Sector, tuple[int, float]] = {
+        sector: (
+            int(os.getenv(f"{sector.name}_AGENT_CONCURRENCY", default_limit)),
+            float(os.getenv(f"{sector.name}_AGENT_TIMEOUT", default_timeout)),
+        )
+        for sector, default_limit, default_timeout in (
+            (Sector.MEDICAL, "4", "10"),
+            (Sector.TRAVEL, "8", "5"),
+            (Sector.FACTORY, "2", "5"),
+            (Sector.MARKETING, "4", "5"),
+        )
+    }
+    # Yan etkili sektörler (Medical: hasta kaydı + bildirim) timeout'ta iptal edilmiş sayılmaz —
+    # iş thread'de yine commit olur; "timeout" yanıtı istemcinin tekrar denemesine ve çift kayda yol açar
+    SIDE_EFFECT_SECTORS: frozenset[Sector] = frozenset({Sector.MEDICAL})
 
-        try:
-            from agents.factory_agent import FactoryAgent
-            self._factory_agent = FactoryAgent()
-        except Exception as e:
-            logger.warning(f"FactoryAgent init failed: {e}")
+    def __init__(self) -> None:
+        self._classifier = RequestClassifier()
+        self._session_logger = session_log.get_session_logger(LOG_FILE)
 
-        try:
-            from agents.marketing_agent import MarketingAgent
-            self._marketing_agent = MarketingAgent()
-        except Exception as e:
-            logger.warning(f"MarketingAgent init failed: {e}")
+        # Agent'lar paylaşılan registry'den ilk kullanımda kurulur (agents/registry.py)
 
+        # aroute(): her sektörün kendi thread havuzu + semaforu — yavaş bir sektör
+        # (ör. DB eşleştirmeli Medical) diğerlerinin worker'larını tüketemez
+        self._sector_executors: dict[Sector, ThreadPoolExecutor] = {}
+        self._sector_semaphores: dict[Sector, asyncio.Semaphore] = {}
+        self._executor_lock = threading.Lock()
         logger.info("AgentRouter initialized — Medical | Travel | Factory | Marketing routing active.")
 
     def route(self, user_input: str | dict[str, Any]) -> dict[str, Any]:
@@ -258,11 +744,7 @@ class AgentRouter:
         Returns:
             Yönlendirme raporu dict olarak.
         """
-        # Normalize input
-        if isinstance(user_input, dict):
-            text = user_input.get("message") or user_input.get("text") or json.dumps(user_input)
-        else:
-            text = str(user_input)
+        text = self._normalize_input(user_input)
 
         logger.info(f"Incoming request ({len(text)} chars): {text[:120]}...")
 
@@ -285,6 +767,199 @@ class AgentRouter:
             "agent_response": response,
         }
 
+    async def aroute(self, user_input: str | dict[str, Any]) -> dict[str, Any]:
+        """
+        route()'un asyncio-native karşılığı.
+
+        Sınıflandırma event loop üzerinde yapılır (CPU-hafif); senkron agent
+        çağrısı sektöre ait thread havuzunda, sektör semaforu ve timeout ile
+        çalışır. Slot sektör timeout'u kadar beklenir; bu sürede boşalmazsa agent
+        hiç çağrılmadan "busy" yanıtı döner. Çağrı da timeout'u aşarsa agent beklenmez ve
+        "timeout" yanıtı döner — yan etkili sektörler (SIDE_EFFECT_SECTORS) hariç:
+        onlarda başlamış iş sonuna kadar beklenir.
+
+        Args:
+            user_input: String metin veya {"message": "..."} formatında dict.
+
+        Returns:
+            route() ile aynı yapıda yönlendirme raporu.
+        """
+        text = self._normalize_input(user_input)
+        logger.info(f"Incoming async request ({len(text)} chars): {text[:120]}...")
+
+        result = self._classifier.classify(text)
+        logger.info(
+            f"Classification → {result.sector.value} "
+            f"(confidence={result.confidence:.2f}) | "
+            f"Keywords: {result.matched_keywords[:3]}"
+        )
+
+        if result.sector in self.SECTOR_LIMITS:
+            response = await self._adispatch(result)
+        else:
+            response = self._dispatch(result)
+
+        self._log_session(result, response)
+        return {
+            "classification": result.to_dict(),
+            "agent_response": response,
+        }
+
+    async def _adispatch(self, result: ClassificationResult) -> dict[str, Any]:
+        sector = result.sector
+        _limit, timeout = self.SECTOR_LIMITS[sector]
+        semaphore, executor = self._sector_resources(sector)
+        loop = asyncio.get_running_loop()
+        try:
+            # Ani yükte slot beklenir (executor kuyruğu değil) — süre dolarsa agent hiç çalışmaz
+            await asyncio.wait_for(semaphore.acquire(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"[{sector.value}] no agent slot within {timeout:.1f}s — returning busy response")
+            return {
+                "agent": f"{sector.value}Agent",
+                "status": "busy",
+                "sector": sector.value,
+                "message": "Şu anda yoğunluk nedeniyle talebinizi işleyemiyoruz, lütfen kısa süre sonra tekrar deneyin.",
+            }
+        # Slot, thread'deki iş bitene kadar tutulur (timeout'ta bile) — semafor gerçek uçuştaki işi sınırlar
+        future = loop.run_in_executor(executor, self._dispatch, result)
+        future.add_done_callback(lambda _f: semaphore.release())
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), timeout)
+        except asyncio.TimeoutError:
+            if sector in self.SIDE_EFFECT_SECTORS:
+                logger.warning(f"[{sector.value}] agent call exceeded {timeout:.1f}s — waiting for it to commit")
+                return await asyncio.shield(future)
+            logger.warning(f"[{sector.value}] agent call exceeded {timeout:.1f}s — returning timeout response")
+            return {
+                "agent": f"{sector.value}Agent",
+                "status": "timeout",
+                "sector": sector.value,
+                "message": (
+                    "Talebiniz alındı ancak işlenmesi beklenenden uzun sürüyor. "
+                    "Koordinatörümüz sizinle iletişime geçecek."
+                ),
+            }
+
+    def _sector_resources(self, sector: Sector) -> tuple[asyncio.Semaphore, ThreadPoolExecutor]:
+        """Sektörün semaforunu ve thread havuzunu ilk kullanımda oluşturur."""
+        with self._executor_lock:
+            if sector not in self._sector_executors:
+                limit, _timeout = self.SECTOR_LIMITS[sector]
+                self._sector_executors[sector] = ThreadPoolExecutor(
+                    max_workers=limit, thread_name_prefix=f"agent-{sector.value.lower()}"
+                )
+                self._sector_semaphores[sector] = asyncio.Semaphore(limit)
+            return self._sector_semaphores[sector], self._sector_executors[sector]
+
+    def route_many(
+        self,
+        user_inputs: list[str | dict[str, Any]],
+        max_batch_size: int | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Toplu yönlendirme — backfill ve toplu WhatsApp/Telegram içe aktarımı için.
+
+        Tüm mesajlar tek geçişte sınıflandırılır ve sonuçlar girdi sırasıyla döner.
+        Toplu API'si olan sektörün grubu agent'a tek çağrıda gider (Medical:
+        process_intake_batch — tek hastane snapshot'ı); diğer sektörler mesaj başına
+        _dispatch ile çağrılır (bkz. _dispatch_group).
+
+        Args:
+            user_inputs: route() ile aynı formatta girdiler.
+            max_batch_size: Üst sınır (varsayılan: MAX_BATCH_SIZE).
+
+        Returns:
+            Her girdi için route() çıktısıyla aynı yapıda rapor listesi.
+
+        Raises:
+            ValueError: Girdi sayısı üst sınırı aşarsa.
+        """
+        limit = self.MAX_BATCH_SIZE if max_batch_size is None else max_batch_size
+        if len(user_inputs) > limit:
+            raise ValueError(f"Batch size {len(user_inputs)} exceeds limit of {limit}")
+
+        texts = [self._normalize_input(item) for item in user_inputs]
+        results = self._classifier.classify_many(texts)
+
+        groups: dict[Sector, list[int]] = {}
+        for i, result in enumerate(results):
+            groups.setdefault(result.sector, []).append(i)
+
+        logger.info(
+            f"Batch of {len(texts)} classified → "
+            + ", ".join(f"{sector.value}={len(idx)}" for sector, idx in groups.items())
+        )
+
+        outputs: list[dict[str, Any]] = [{} for _ in texts]
+        for sector, indexes in groups.items():
+            group = [results[i] for i in indexes]
+            for i, result, response in zip(indexes, group, self._dispatch_group(sector, group)):
+                self._log_session(result, response)
+                outputs[i] = {
+                    "classification": result.to_dict(),
+                    "agent_response": response,
+                }
+        return outputs
+
+    def _dispatch_group(self, sector: Sector, group: list[ClassificationResult]) -> list[dict[str, Any]]:
+        """Aynı sektördeki sonuçlar → yanıtlar (aynı sıra). Toplu API'si olmayan agent'lar tek tek."""
+        if sector == Sector.MEDICAL:
+            agent = get_agent("medical")
+            if agent:
+                try:
+                    batch = agent.process_intake_batch([
+                        {"procedure_interest": result.raw_input, "language": "tr"} for result in group
+                    ])
+                except Exception as e:
+                    logger.error(f"MedicalAgent batch error: {e}")
+                else:
+                    return [
+                        self._medical_fallback() if "error" in intake else {
+                            **self._medical_header(),
+                            "classification": result.to_dict(),
+                            **intake,
+                        }
+                        for result, intake in zip(group, batch)
+                    ]
+        return [self._dispatch(result) for result in group]
+
+    def cache_stats(self) -> dict[str, Any]:
+        """Sınıflandırma önbelleği sayaçları — boyutlandırma için."""
+        return self._classifier.cache_stats()
+
+    def keyword_stats(self) -> dict[str, Any]:
+        """Aktif anahtar kelime sözlüğü sürümü ve derleme bilgisi."""
+        return self._classifier.keyword_stats()
+
+    def reload_keywords(self) -> dict[str, Any]:
+        """
+        data/keywords.json'ı yeniden yükler ve sınıflandırıcıyı atomik olarak günceller.
+
+        Hatalı dosyada mevcut sözlükler korunur ve ValueError / OSError yükseltilir.
+        Diğer worker process'ler değişikliği dosya mtime kontrolüyle görür.
+        """
+        previous = self._classifier.keywords_version
+        reload_keyword_maps()
+        self._classifier.reload()
+        return {"previous_version": previous, **self._classifier.keyword_stats()}
+
+    def agent_stats(self) -> dict[str, Any]:
+        """Lazy agent registry kurulum metrikleri."""
+        return registry.stats()
+
+    def session_log_stats(self) -> dict[str, Any]:
+        """Arka plan oturum logu: kuyruk, yazılan ve düşürülen kayıtlar."""
+        return session_log.stats()
+
+    @staticmethod
+    def _normalize_input(user_input: str | dict[str, Any]) -> str:
+        """String veya {"message": "..."} girdisini düz metne çevirir."""
+        if isinstance(user_input, dict):
+            return user_input.get("message") or user_input.get("text") or json.dumps(user_input)
+        return str(user_input)
+
     def _dispatch(self, result: ClassificationResult) -> dict[str, Any]:
         """Agent'a yönlendir."""
         sector = result.sector
@@ -313,26 +988,34 @@ class AgentRouter:
 
     def _call_medical_agent(self, result: ClassificationResult) -> dict[str, Any]:
         logger.info("[MedicalAgent] Handling patient/referral request.")
-        if self._medical_agent:
+        agent = get_agent("medical")
+        if agent:
             try:
                 return {
-                    "agent": "MedicalAgent",
-                    "status": "active",
-                    "sector": "Medical",
-                    "action": "referral_coordination",
+                    **self._medical_header(),
                     "classification": result.to_dict(),
-                    **self._medical_agent.process_intake({
+                    **agent.process_intake({
                         "procedure_interest": result.raw_input,
                         "language": "tr",
                     }),
                 }
             except Exception as e:
                 logger.error(f"MedicalAgent error: {e}")
+        return self._medical_fallback()
+
+    @staticmethod
+    def _medical_header() -> dict[str, Any]:
         return {
             "agent": "MedicalAgent",
             "status": "active",
             "sector": "Medical",
             "action": "referral_coordination",
+        }
+
+    @classmethod
+    def _medical_fallback(cls) -> dict[str, Any]:
+        return {
+            **cls._medical_header(),
             "message": (
                 "Tıbbi danışmanlık talebiniz alındı. "
                 "AntiGravity Phuket koordinatörünüz en geç 5 dakika içinde "
@@ -348,14 +1031,15 @@ class AgentRouter:
 
     def _call_travel_agent(self, result: ClassificationResult) -> dict[str, Any]:
         logger.info("[TravelAgent] Handling hotel/restaurant/booking request.")
-        if self._travel_agent:
+        agent = get_agent("travel")
+        if agent:
             try:
                 return {
                     "agent": "TravelAgent",
                     "status": "active",
                     "sector": "Travel",
                     "action": "booking_coordination",
-                    **self._travel_agent.handle({"message": result.raw_input}),
+                    **agent.handle({"message": result.raw_input}),
                 }
             except Exception as e:
                 logger.error(f"TravelAgent error: {e}")
@@ -378,14 +1062,15 @@ class AgentRouter:
 
     def _call_factory_agent(self, result: ClassificationResult) -> dict[str, Any]:
         logger.info("[FactoryAgent] Handling B2B manufacturing/textile request.")
-        if self._factory_agent:
+        agent = get_agent("factory")
+        if agent:
             try:
                 return {
                     "agent": "FactoryAgent",
                     "status": "active",
                     "sector": "Factory",
                     "action": "b2b_lead_qualification",
-                    **self._factory_agent.handle({"message": result.raw_input}),
+                    **agent.handle({"message": result.raw_input}),
                 }
             except Exception as e:
                 logger.error(f"FactoryAgent error: {e}")
@@ -404,14 +1089,15 @@ class AgentRouter:
 
     def _call_marketing_agent(self, result: ClassificationResult) -> dict[str, Any]:
         logger.info("[MarketingAgent] Handling marketing/SEO/campaign request.")
-        if self._marketing_agent:
+        agent = get_agent("marketing")
+        if agent:
             try:
                 return {
                     "agent": "MarketingAgent",
                     "status": "active",
                     "sector": "Marketing",
                     "action": "marketing_coordination",
-                    **self._marketing_agent.handle({"message": result.raw_input}),
+                    **agent.handle({"message": result.raw_input}),
                 }
             except Exception as e:
                 logger.error(f"MarketingAgent error: {e}")
@@ -436,24 +1122,45 @@ class AgentRouter:
         }
 
     def _log_session(self, result: ClassificationResult, response: dict[str, Any]) -> None:
-        """AGENT_SESSION.log'a yapılandırılmış kayıt yazar."""
-        log_entry = {
-            "timestamp": result.timestamp,
+        """
+        AGENT_SESSION.log'a kompakt NDJSON kaydı kuyruğa atar (bloklamaz).
+
+        Kayıt: ts, sector, conf, kw, agent, action — reasoning kw'den türetilebildiği için yazılmaz.
+        """
+        self._session_logger.info({
+            "ts": result.timestamp,
             "sector": result.sector.value,
-            "confidence": result.confidence,
-            "keywords_matched": result.matched_keywords,
-            "reasoning": result.reasoning,
-            "agent_dispatched": response.get("agent", "unknown"),
+            "conf": round(result.confidence, 3),
+            "kw": result.matched_keywords,
+            "agent": response.get("agent", "unknown"),
             "action": response.get("action", "unknown"),
-        }
-        logger.info(f"SESSION LOG: {json.dumps(log_entry, ensure_ascii=False)}")
+        })
 
 
 # ---------------------------------------------------------------------------
 # CLI Entrypoint
 # ---------------------------------------------------------------------------
-def main() -> None:
-    """İnteraktif mod — terminal üzerinden test için."""
+def main(argv: list[str] | None = None) -> None:
+    """
+    İnteraktif mod — terminal üzerinden test için.
+    --input verilirse toplu (backfill) moda geçer, bkz. backfill.py.
+    """
+    import argparse
+
+    parser = argparse.ArgumentParser(description="AntiGravity Ventures — Master Orchestrator")
+    parser.add_argument("--input", help="JSONL/CSV girdi dosyası ('-' = stdin); verilirse toplu mod")
+    parser.add_argument("--output", default="-", help="JSONL çıktı dosyası (varsayılan: stdout)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Girdi formatı (varsayılan: uzantıdan)")
+    parser.add_argument("--text-field", default="message", help="Mesaj alanının adı")
+    parser.add_argument("--workers", type=int, default=None, help="Process sayısı (varsayılan: CPU sayısı)")
+    parser.add_argument("--chunk-size", type=int, default=256, help="Worker'a gönderilen parça boyutu")
+    args = parser.parse_args(argv)
+
+    if args.input:
+        import backfill
+        backfill.main(args)
+        return
+
     router = AgentRouter()
 
     print("\n" + "=" * 60)
@@ -0,0 +1,235 @@
+"""
+AntiGravity Ventures — Non-blocking Session Log
+AgentRouter oturum kayıtlarını istek thread'ini bloklamadan AGENT_SESSION.log'a yazar.
+
+Akış:
+  AgentRouter._log_session → QueueHandler (put_nowait, sınırlı kuyruk)
+      → SessionLogWriter thread'i (toplu yazma + flush) → NDJSON dosyası
+
+Kuyruk doluysa kayıt düşürülür ve sayılır; yavaş disk /api/classify'a gecikme eklemez.
+Dosya boyut sınırına ulaşınca ya da zaman dilimi (varsayılan: UTC takvim günü) değişince
+döndürülür (AGENT_SESSION.log.<zaman, mikrosaniye>).
+"""
+from __future__ import annotations
+
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger("MasterOrchestrator.session_log")
+
+QUEUE_SIZE = int(os.getenv("SESSION_LOG_QUEUE_SIZE", "10000"))
+BATCH_SIZE = int(os.getenv("SESSION_LOG_BATCH_SIZE", "256"))
+FLUSH_INTERVAL_SECONDS = float(os.getenv("SESSION_LOG_FLUSH_INTERVAL", "1.0"))
+MAX_BYTES = int(os.getenv("SESSION_LOG_MAX_BYTES", str(10 * 1024 * 1024)))
+ROTATE_INTERVAL_SECONDS = float(os.getenv("SESSION_LOG_ROTATE_SECONDS", "86400"))
+BACKUP_COUNT = int(os.getenv("SESSION_LOG_BACKUPS", "7"))
+
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """Kuyruk doluysa beklemek yerine kaydı düşüren QueueHandler."""
+
+    def __init__(self, log_queue: queue.Queue) -> None:
+        super().__init__(log_queue)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # record.msg yapılandırılmış dict olarak kalır — formatlama writer thread'inde
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+
+class SessionLogWriter(threading.Thread):
+    """Kuyruktaki kayıtları toplu halde NDJSON olarak yazan arka plan thread'i."""
+
+    def __init__(
+        self,
+        log_queue: queue.Queue,
+        path: Path,
+        batch_size: int = BATCH_SIZE,
+        flush_interval: float = FLUSH_INTERVAL_SECONDS,
+        max_bytes: int = MAX_BYTES,
+        rotate_interval: float = ROTATE_INTERVAL_SECONDS,
+        backup_count: int = BACKUP_COUNT,
+    ) -> None:
+        super().__init__(name="session-log-writer", daemon=True)
+        self._queue = log_queue
+        self._path = path
+        self._batch_size = batch_size
+        self._flush_interval = flush_interval
+        self._max_bytes = max_bytes
+        self._rotate_interval = rotate_interval
+        self._backup_count = backup_count
+        self._stop_event = threading.Event()
+        self._stream = None
+        self._period = 0   # açık dosyanın zaman dilimi (bkz. _period_of)
+        self.written = 0
+        self.write_errors = 0
+
+    # ------------------------------------------------------------------
+    # Thread loop
+    # ------------------------------------------------------------------
+
+    def run(self) -> None:
+        while not self._stop_event.is_set() or not self._queue.empty():
+            batch = self._drain()
+            if batch:
+                self._write(batch)
+        self._close()
+
+    def stop(self, timeout: float = 5.0) -> None:
+        """Kalan kayıtları yazar ve thread'i durdurur."""
+        self._stop_event.set()
+        self.join(timeout)
+
+    def _drain(self) -> list[logging.LogRecord]:
+        """İlk kaydı flush_interval kadar bekler, sonra batch_size'a kadar bekletmeden toplar."""
+        try:
+            batch = [self._queue.get(timeout=self._flush_interval)]
+        except queue.Empty:
+            return []
+        while len(batch) < self._batch_size:
+            try:
+                batch.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    # ------------------------------------------------------------------
+    # File handling
+    # ------------------------------------------------------------------
+
+    def _write(self, batch: list[logging.LogRecord]) -> None:
+        lines = "".join(_to_ndjson(record) for record in batch)
+        try:
+            stream = self._open()
+            stream.write(lines)
+            stream.flush()
+            self.written += len(batch)
+        except OSError as e:
+            self.write_errors += 1
+            logger.warning(f"Session log write failed ({len(batch)} records lost): {e}")
+            self._close()
+
+    def _open(self):
+        if self._stream is not None and self._should_rotate():
+            self._rotate()
+        if self._stream is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            # Var olan dosyanın dilimi son yazma zamanından — process yeniden başlaması süreyi sıfırlamaz
+            started = time.time()
+            try:
+                st = self._path.stat()
+                if st.st_size:
+                    started = st.st_mtime
+            except FileNotFoundError:
+                pass
+            self._stream = open(self._path, "a", encoding="utf-8")
+            self._period = self._period_of(started)
+        return self._stream
+
+    def _period_of(self, timestamp: float) -> int:
+        """UTC epoch'tan itibaren rotate_interval'lık dilim no — günlükte takvim günü (UTC)."""
+        return int(timestamp // self._rotate_interval) if self._rotate_interval else 0
+
+    def _should_rotate(self) -> bool:
+        if self._max_bytes and self._stream.tell() >= self._max_bytes:
+            return True
+        return bool(self._rotate_interval) and self._period_of(time.time()) != self._period
+
+    def _rotate(self) -> None:
+        self._close()
+        # Mikrosaniye + çakışmada sayaç: aynı saniyedeki iki döndürme birbirinin üzerine yazmaz
+        suffix = datetime.now(timezone.utc).strftime("%Y%m%d-%H%M%S-%f")
+        target = self._path.with_name(f"{self._path.name}.{suffix}")
+        counter = 1
+        while target.exists():
+            target = self._path.with_name(f"{self._path.name}.{suffix}-{counter}")
+            counter += 1
+        try:
+            self._path.rename(target)
+        except OSError as e:
+            logger.warning(f"Session log rotation failed: {e}")
+            return
+        backups = sorted(self._path.parent.glob(f"{self._path.name}.*"))
+        for old in backups[: max(len(backups) - self._backup_count, 0)]:
+            try:
+                old.unlink()
+            except OSError:
+                pass
+
+    def _close(self) -> None:
+        if self._stream is not None:
+            try:
+                self._stream.close()
+            except OSError:
+                pass
+            self._stream = None
+
+
+def _to_ndjson(record: logging.LogRecord) -> str:
+    payload = record.msg if isinstance(record.msg, dict) else {"msg": record.getMessage()}
+    return json.dumps(payload, ensure_ascii=False, separators=(",", ":")) + "\n"
+
+
+# ---------------------------------------------------------------------------
+# Module-level pipeline (ilk kullanımda kurulur)
+# ---------------------------------------------------------------------------
+
+_lock = threading.Lock()
+_handler: DroppingQueueHandler | None = None
+_writer: SessionLogWriter | None = None
+
+
+def get_session_logger(path: Path) -> logging.Logger:
+    """
+    Oturum logger'ını döndürür; kuyruk + writer thread'i ilk çağrıda başlatılır.
+
+    Logger root'a propagate etmez — kayıtlar yalnızca NDJSON dosyasına gider.
+    """
+    global _handler, _writer
+    session_logger = logging.getLogger("MasterOrchestrator.session")
+    with _lock:
+        if _handler is None:
+            log_queue: queue.Queue = queue.Queue(maxsize=QUEUE_SIZE)
+            _handler = DroppingQueueHandler(log_queue)
+            _writer = SessionLogWriter(log_queue, path)
+            _writer.start()
+            session_logger.addHandler(_handler)
+            session_logger.setLevel(logging.INFO)
+            session_logger.propagate = False
+            atexit.register(shutdown)
+    return session_logger
+
+
+def shutdown() -> None:
+    """Kuyruktaki kayıtları diske yazar (process kapanışında atexit ile çağrılır)."""
+    if _writer is not None and _writer.is_alive():
+        _writer.stop()
+
+
+def stats() -> dict[str, Any]:
+    """Kuyruk doluluğu, yazılan ve düşürülen kayıt sayıları."""
+    if _handler is None or _writer is None:
+        return {"enabled": False}
+    return {
+        "enabled": True,
+        "queued": _handler.queue.qsize(),
+        "queue_capacity": QUEUE_SIZE,
+        "written": _writer.written,
+        "dropped": _handler.dropped,
+        "write_errors": _writer.write_errors,
+    }
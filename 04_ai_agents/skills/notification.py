@@ -181,14 +181,29 @@ class NotificationService:
             logger.error(f"LINE send failed: {e}")
             return {"sent": False, "channel": "line", "error": str(e)}
 
+    # ------------------------------------------------------------------
+    # Dispatch (outbox worker: tek kanal, tek alıcı)
+    # ------------------------------------------------------------------
+
+    async def send(self, channel: str, recipient: str, message: str, language: str = "en") -> dict:
+        """Send one message on a named channel."""
+        if channel == "whatsapp":
+            return await self.send_whatsapp(recipient, message, language)
+        elif channel == "telegram":
+            return await self.send_telegram(recipient, message)
+        elif channel == "line":
+            return await self.send_line(recipient, message)
+        else:
+            return {"sent": False, "channel": channel, "reason": "unknown_channel"}
+
     # ------------------------------------------------------------------
     # High-level: Coordinator notification
     # ------------------------------------------------------------------
 
-    async def notify_coordinator(self, patient_data: dict) -> dict:
+    def plan_coordinator(self, patient_data: dict) -> list[dict]:
         """
-        Send coordinator notification based on patient region/language.
-        Always sends to Telegram coordinator chat as backup.
+        Coordinator deliveries for a new intake: [{"channel", "recipient", "message"}].
+        Telegram coordinator chat always (backup) + region-preferred channel if configured.
         """
         language = patient_data.get("language", "en")
         region = LANGUAGE_REGION_MAP.get(language, "europe")
@@ -210,28 +225,51 @@ class NotificationService:
             f"Channel: {channel}"
         )
 
-        results = {}
+        deliveries = []
 
         # Always notify coordinator via Telegram
         if self.telegram_coordinator_chat_id:
-            results["telegram"] = await self.send_telegram(self.telegram_coordinator_chat_id, message)
+            deliveries.append({"channel": "telegram", "recipient": self.telegram_coordinator_chat_id, "message": message})
 
         # Also send via region-preferred channel if different
         if channel == "whatsapp" and self.whatsapp_token:
             coordinator_phone = os.getenv("COORDINATOR_WHATSAPP", "")
             if coordinator_phone:
-                results["whatsapp"] = await self.send_whatsapp(coordinator_phone, message)
+                deliveries.append({"channel": "whatsapp", "recipient": coordinator_phone, "message": message})
         elif channel == "line" and self.line_channel_token:
             coordinator_line = os.getenv("COORDINATOR_LINE_ID", "")
             if coordinator_line:
-                results["line"] = await self.send_line(coordinator_line, message)
+                deliveries.append({"channel": "line", "recipient": coordinator_line, "message": message})
+
+        return deliveries
+
+    async def notify_coordinator(self, patient_data: dict) -> dict:
+        """
+        Send coordinator notification based on patient region/language.
+        Always sends to Telegram coordinator chat as backup.
+        """
+        language = patient_data.get("language", "en")
+        region = LANGUAGE_REGION_MAP.get(language, "europe")
+        channel = REGION_CHANNEL_MAP.get(region, "whatsapp")
+
+        results = {}
+        for delivery in self.plan_coordinator(patient_data):
+            results[delivery["channel"]] = await self.send(delivery["channel"], delivery["recipient"], delivery["message"])
 
-        return {"patient_id": patient_id, "region": region, "channel": channel, "results": results}
+        return {"patient_id": patient_data.get("patient_id", "N/A"), "region": region, "channel": channel, "results": results}
 
     # ------------------------------------------------------------------
     # High-level: Patient notification
     # ------------------------------------------------------------------
 
+    @staticmethod
+    def patient_channel(language: str = "en", preferred_channel: Optional[str] = None) -> str:
+        """Patient's channel: explicit preference, else region default for the language."""
+        if preferred_channel:
+            return preferred_channel
+        region = LANGUAGE_REGION_MAP.get(language, "europe")
+        return REGION_CHANNEL_MAP.get(region, "whatsapp")
+
     async def notify_patient(
         self,
         phone: str,
@@ -240,15 +278,4 @@ class NotificationService:
         language: str = "en",
     ) -> dict:
         """Send notification to patient on their preferred channel."""
-        if not preferred_channel:
-            region = LANGUAGE_REGION_MAP.get(language, "europe")
-            preferred_channel = REGION_CHANNEL_MAP.get(region, "whatsapp")
-
-        if preferred_channel == "whatsapp":
-            return await self.send_whatsapp(phone, message, language)
-        elif preferred_channel == "telegram":
-            return await self.send_telegram(phone, message)
-        elif preferred_channel == "line":
-            return await self.send_line(phone, message)
-        else:
-            return {"sent": False, "channel": preferred_channel, "reason": "unknown_channel"}
+        return await self.send(self.patient_channel(language, preferred_channel), phone, message, language)